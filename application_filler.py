@@ -12,6 +12,7 @@ import re
 from bs4 import BeautifulSoup
 import random
 from datetime import datetime
+from types import SimpleNamespace
 import google.generativeai as genai
 from trello import TrelloClient
 import cv2
@@ -20,7 +21,19 @@ from PIL import Image
 import io
 
 # Import shared functions
-from linkedin_scrapper import sign_in, find_scrollable_container, scroll_and_get_jobs, load_cv_text
+from linkedin_scrapper import sign_in, find_scrollable_container, load_cv_text, WebDriverCommandCounter
+from job_store import get_job_store
+from browser_session import LINKEDIN_SESSION, apply_profile, ensure_signed_in
+from lean_browser import create_lean_driver
+from form_snapshot import (
+    FORM_SNAPSHOT_ENABLED, FORM_SNAPSHOT_COMPARE, WORKDAY_SELECTORS, KNOWN_RADIO_QUESTIONS, KNOWN_RADIO_LABELS,
+    take_form_snapshot, collect_form_fields, is_privacy_checkbox
+)
+from fill_plan import apply_fill_plan, has_fill_errors, fill_plan_summary
+from ats_recipes import ELEMENT_LOCATOR_JS, RECIPE_WAIT_SECONDS, get_recipe_store
+from ats_fingerprint import detect_ats, site_domain
+from ats_adapters import get_adapter
+from consent_resolver import consent_locator, get_consent_resolver
 
 # Constants
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -586,151 +599,27 @@ def get_form_fields(driver):
     
     return form_fields
 
-def handle_cookies_popup(driver):
-    """Handle various types of cookie consent and privacy preference popups"""
-    try:
-        # Enhanced consent buttons with more patterns
-        consent_button_selectors = [
-            # Consent buttons
-            "button.fc-button-consent",
-            "button.fc-cta-consent",
-            "button[aria-label='Consentir']",
-            ".fc-button-label",
-            # Common patterns
-            "button[contains(text(), 'Consent')]",
-            "button[contains(text(), 'Consentir')]",
-            "button[contains(text(), 'Agree')]",
-            "button[contains(@class, 'consent')]",
-            
-            # Additional patterns from real sites
-            "button:contains('Accept All')",
-            "button:contains('Accept all')",
-            "button:contains('Aceptar todo')",
-            "button:contains('Aceptar todas')",
-            "button[class*='primary']",
-            "button[class*='accept']",
-            "button[id*='accept']",
-            "button[data-qa*='accept']",
-            "button[data-testid*='accept']",
-            "button[data-testid*='consent']",
-            
-            # Glovo and similar sites
-            ".consent-accept",
-            ".cookie-accept", 
-            ".gdpr-accept",
-            "#consent-accept",
-            "#cookie-accept",
-            "#gdpr-accept"
-        ]
-        
-        # Try consent buttons first
-        for selector in consent_button_selectors:
-            try:
-                button = WebDriverWait(driver, 3).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                print(f"✅ Clicking consent button: {button.text}")
-                button.click()
-                time.sleep(1)
-                return True
-            except:
-                continue
-                
-        # First check for OneTrust privacy center
-        if "OneTrust" in driver.page_source or "onetrust" in driver.page_source.lower():
-            print("🔍 Detected OneTrust privacy center")
-            
-            # Try to find and click "Allow All" or "Accept All" first
-            accept_buttons = [
-                "button#onetrust-accept-btn-handler",
-                "button[id*='accept-recommended']",
-                "button[contains(text(), 'Allow All')]",
-                "#accept-recommended-btn-handler"
-            ]
-            
-            for selector in accept_buttons:
-                try:
-                    button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"✅ Clicking accept all button: {button.text}")
-                    button.click()
-                    time.sleep(1)
-                    return True
-                except:
-                    continue
-            
-            # If accept all fails, try confirm choices
-            confirm_buttons = [
-                "button.save-preference-btn-handler",
-                "button.onetrust-close-btn-handler",
-                "button[contains(text(), 'Confirm')]"
-            ]
-            
-            for selector in confirm_buttons:
-                try:
-                    button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"✅ Clicking confirm choices button: {button.text}")
-                    button.click()
-                    time.sleep(1)
-                    return True
-                except:
-                    continue
-        
-        # Generic cookie/privacy buttons
-        cookie_button_selectors = [
-            # Previous selectors...
-            # Additional OneTrust selectors
-            "button.ot-pc-refuse-all-handler",  # Reject all
-            "button.ot-pc-refuse-all-handler ~ button",  # Allow all (sibling)
-            # iframes
-            "iframe[title*='Cookie']",
-            "iframe[id*='cookie']",
-            "iframe[title*='Privacy']",
-            # Additional language variations
-            "button[contains(text(), 'Aceptar todas')]",
-            "button[contains(text(), 'Accepter tout')]",
-            "button[contains(text(), 'Akzeptieren')]"
-        ]
-        
-        # Check for and switch to cookie iframe if present
-        iframes = driver.find_elements(By.CSS_SELECTOR, 
-            "iframe[title*='Cookie'], iframe[id*='cookie'], iframe[title*='Privacy']"
-        )
-        
-        if iframes:
-            print("🔍 Found cookie iframe, switching context...")
-            driver.switch_to.frame(iframes[0])
-        
-        for selector in cookie_button_selectors:
-            try:
-                button = WebDriverWait(driver, 3).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                print(f"🍪 Found cookie/privacy button: {button.text}")
-                button.click()
-                time.sleep(1)
-                
-                # Switch back to default content if we were in an iframe
-                if iframes:
-                    driver.switch_to.default_content()
-                return True
-            except:
-                continue
-        
-        # Switch back to default content if we were in an iframe
-        if iframes:
-            driver.switch_to.default_content()
-            
-        return False
-            
-    except Exception as e:
-        print(f"⚠️ Error handling cookie popup: {str(e)}")
-        # Make sure we're back in the main frame
-        driver.switch_to.default_content()
+def handle_cookies_popup(driver, clicked=None):
+    """Handle various types of cookie consent and privacy preference popups.
+    
+    One in-page probe (see consent_resolver) detects the consent platform and clicks its
+    control; the outcome is remembered per site for the rest of the run.
+    If clicked is a list, the locator of the button clicked in the main document is appended to it.
+    """
+    result = get_consent_resolver().resolve(driver)
+    if not result or not result.get("clicked"):
+        if result and result.get("platform") and not result.get("remembered"):
+            print(f"🔍 Detected {result['platform']} consent banner, but its buttons are not shown yet")
         return False
+    if result.get("remembered"):
+        return True
+    
+    print(f"🍪 Clicked {result['platform']} consent button ({result['action']}): {result['text']}")
+    time.sleep(1)
+    locator = consent_locator(result)
+    if clicked is not None and locator:
+        clicked.append(locator)
+    return True
 
 def find_saved_jobs_container(driver):
     """Find the container with saved jobs list"""
@@ -1629,12 +1518,25 @@ def find_and_click_matching_job(driver, job_title):
     print("🔍 No matching job found on this page")
     return False
 
-def upload_cv(driver):
-    """Finds a file input and uploads the CV resume PDF."""
+def upload_cv(driver, adapter=None):
+    """Finds a file input and uploads the CV resume PDF.
+    
+    With an ATS adapter the platform's resume input is used when the page has one.
+    """
     if not os.path.exists(RESUME_FILE_PATH):
         print(f"🟡 Resume PDF file not found at {RESUME_FILE_PATH}, skipping upload.")
         return False
     
+    upload_input = adapter.locate_controls(driver).get("upload") if adapter else None
+    if upload_input is not None:
+        try:
+            upload_input.send_keys(RESUME_FILE_PATH)
+            print(f"✅ Resume PDF uploaded through the {adapter.name} resume field.")
+            time.sleep(2)
+            return True
+        except Exception as e:
+            print(f"⚠️ Error uploading to the {adapter.name} resume field: {str(e)}")
+    
     try:
         # Look for file input fields
         file_inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
@@ -1674,8 +1576,109 @@ def upload_cv(driver):
         print(f"❌ Error during CV upload: {str(e)}")
         return False
 
-def click_next_or_submit_button(driver):
-    """Finds and clicks 'next', 'continue', or 'submit' buttons."""
+def element_locator(driver, element):
+    """Locator that finds element again on a later visit to the site, or None"""
+    try:
+        return driver.execute_script(ELEMENT_LOCATOR_JS, element)
+    except Exception:
+        return None
+
+
+def click_locator(driver, locator, timeout=RECIPE_WAIT_SECONDS):
+    """Click the element a recipe locator points at, if it shows up within timeout"""
+    try:
+        element = WebDriverWait(driver, timeout).until(
+            EC.element_to_be_clickable((locator["by"], locator["selector"]))
+        )
+    except Exception:
+        return False
+    try:
+        element.click()
+    except Exception:
+        try:
+            driver.execute_script("arguments[0].click();", element)
+        except Exception:
+            return False
+    return True
+
+
+def replay_recipe_step(driver, recipe, step_name):
+    """Click the locator the recipe recorded for step_name; True if it was there"""
+    locator = recipe.locator(step_name) if recipe else None
+    if locator and click_locator(driver, locator):
+        print(f"📒 Replayed {step_name} from the {recipe.key} recipe: {locator['selector']}")
+        recipe.record_success(step_name, locator)
+        return True
+    return False
+
+
+def learn_recipe_step(recipe, step_name, clicked, record_miss=True):
+    """Record what the heuristics clicked for step_name, or that they found nothing either"""
+    if not recipe:
+        return
+    if clicked:
+        recipe.record_success(step_name, clicked[-1])
+    elif record_miss:
+        recipe.record_failure(step_name)
+
+
+def run_recipe_step(driver, recipe, step_name, heuristic, after_replay=None, record_miss=True):
+    """Replay the recipe for step_name, falling back to heuristic(driver, clicked) and learning from it.
+    
+    after_replay(driver) gives the step's result after a successful replay (True by default).
+    """
+    if replay_recipe_step(driver, recipe, step_name):
+        return after_replay(driver) if after_replay else True
+    clicked = []
+    result = heuristic(driver, clicked)
+    # A success with no locator (remembered, or inside a frame) says nothing about the recorded step
+    if clicked or not result:
+        learn_recipe_step(recipe, step_name, clicked if result else [], record_miss)
+    return result
+
+
+def click_adapter_next_button(driver, adapter, clicked=None):
+    """Move a known platform's multi-step flow on with its own next/submit button.
+    
+    Falls back to click_next_or_submit_button when there is no adapter or the page has
+    neither button. clicked works as in click_next_or_submit_button.
+    """
+    kind, button = adapter.navigation(adapter.locate_controls(driver)) if adapter else (None, None)
+    if button is None:
+        return click_next_or_submit_button(driver, clicked)
+    if DRY_RUN:
+        print(f"🧪 DRY RUN: Would click the {adapter.name} {kind} button, but skipping")
+        detect_page_errors(driver)
+        return False
+    locator = element_locator(driver, button) if clicked is not None else None
+    try:
+        button.click()
+    except Exception:
+        try:
+            driver.execute_script("arguments[0].click();", button)
+        except Exception as e:
+            print(f"⚠️ Could not click the {adapter.name} {kind} button: {str(e)}")
+            return click_next_or_submit_button(driver, clicked)
+    print(f"✅ Clicked the {adapter.name} {kind} button")
+    if locator and clicked is not None:
+        clicked.append(locator)
+    return after_next_click(driver)
+
+
+def after_next_click(driver):
+    """Result of a replayed next/submit click, judged as click_next_or_submit_button judges its own"""
+    time.sleep(3)  # Wait for page to process/load
+    if detect_page_errors(driver):
+        print("❌ Form submission failed due to validation errors")
+        return False
+    return True
+
+
+def click_next_or_submit_button(driver, clicked=None):
+    """Finds and clicks 'next', 'continue', or 'submit' buttons.
+    
+    If clicked is a list, the locator of the button that moved the flow on is appended to it.
+    """
     if DRY_RUN:
         print("🧪 DRY RUN: Would click submit/next button, but skipping")
         # Even in dry run, let's check for validation errors
@@ -1716,6 +1719,7 @@ def click_next_or_submit_button(driver):
             
             button_text = button.text.strip()
             print(f"✅ Found and clicking '{button_text}' button...")
+            locator = {"by": By.XPATH, "selector": xpath_selector} if "contains" in selector else {"by": By.CSS_SELECTOR, "selector": selector}
             
             # Try multiple click methods
             try:
@@ -1731,6 +1735,8 @@ def click_next_or_submit_button(driver):
                 return False
             else:
                 print("✅ Form submitted successfully or moved to next page")
+                if clicked is not None:
+                    clicked.append(locator)
                 return True
             
         except TimeoutException:
@@ -1768,6 +1774,7 @@ def click_next_or_submit_button(driver):
                     button_text = button.text.strip()
                     if button_text and len(button_text) < 50:
                         print(f"🎯 Found Apply button: '{button_text}' - clicking to continue to application")
+                        locator = element_locator(driver, button) if clicked is not None else None
                         try:
                             button.click()
                         except:
@@ -1776,6 +1783,8 @@ def click_next_or_submit_button(driver):
                             except:
                                 ActionChains(driver).move_to_element(button).click().perform()
                         time.sleep(3)
+                        if locator:
+                            clicked.append(locator)
                         return True
         except:
             continue
@@ -2172,10 +2181,11 @@ def is_external_newsletter_form(driver):
         print(f"⚠️ Error analyzing external form type: {str(e)}")
         return False
 
-def skip_external_newsletter_form(driver):
+def skip_external_newsletter_form(driver, clicked=None):
     """
     Skip newsletter/notification form by clicking Apply/Continue button
     Returns True if successfully skipped, False otherwise
+    If clicked is a list, the skip button's locator is appended to it (unless a submenu was needed too)
     """
     try:
         print("⏭️ Attempting to skip newsletter/notification form...")
@@ -2254,6 +2264,7 @@ def skip_external_newsletter_form(driver):
                         
                         if button_text and len(button_text) < 50:  # Reasonable button text
                             print(f"✅ Clicking '{button_text}' to skip newsletter form")
+                            locator = element_locator(driver, button) if clicked is not None else None
                             
                             # Try different click methods
                             try:
@@ -2300,6 +2311,8 @@ def skip_external_newsletter_form(driver):
                                     continue
                             
                             time.sleep(3)  # Wait for page to load after submenu click
+                            if locator and not submenu_clicked:
+                                clicked.append(locator)
                             return True
             except:
                 continue
@@ -2311,41 +2324,8 @@ def skip_external_newsletter_form(driver):
         print(f"⚠️ Error skipping newsletter form: {str(e)}")
         return False
 
-def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
-    """Analyze form fields and attempt to fill with comprehensive data"""
-    # Wait for page to fully load
-    print("⏳ Waiting for form to load...")
-    time.sleep(3)
-    scroll_to_bottom(driver)
-    time.sleep(2)
-    
-    # Debug: Print page title and check if we're on the right page
-    try:
-        page_title = driver.title
-        current_url = driver.current_url
-        print(f"📄 Page title: {page_title}")
-        print(f"🔗 Current URL: {current_url}")
-    except:
-        pass
-    
-    # Handle cookies popup before any form analysis
-    handle_cookies_popup(driver)
-    time.sleep(1)
-    
-    # Check if this is a newsletter form that should be skipped
-    # BUT first check if this might be a job listing page that we need to navigate
-    page_source_lower = driver.page_source.lower()
-    
-    # Don't run newsletter detection if we're on a job listings page
-    job_listing_indicators = [
-        'job-title', 'job-card', 'job-listing', 'position', 'career', 'opening',
-        'apply now', 'job board', 'vacancies', 'opportunities', 'empleos',
-        'current vacancies', 'job openings', 'read more'
-    ]
-    
-    is_job_listing_page = any(indicator in page_source_lower for indicator in job_listing_indicators)
-    
-    # First, check if there's already an Apply button on this page (single job page)
+def find_page_apply_buttons(driver):
+    """Visible-text Apply/Submit buttons on a single job page, without save/bookmark buttons"""
     apply_buttons = driver.find_elements(By.CSS_SELECTOR, 
         "button[class*='apply'], a[class*='apply'], button[class*='submit'], a[class*='submit']"
     )
@@ -2388,27 +2368,95 @@ def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
             print(f"⚠️ Error filtering button: {str(e)}")
             continue
     
-    apply_buttons = filtered_apply_buttons
+    return filtered_apply_buttons
+
+
+def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title="", recipe=None, page=1, adapter=None,
+                          stop_on_site_change=False):
+    """Analyze form fields and attempt to fill with comprehensive data.
+    
+    With a site recipe (see ats_recipes), page is the application page number: recorded
+    Apply/newsletter buttons for that page are replayed first and what works is recorded.
+    With an ATS adapter (see ats_adapters), the platform's own Apply button and field ids
+    are used before the generic search and keyword matching.
+    With stop_on_site_change, a click that lands on another site returns ["site_changed"]
+    so the caller can pick that site's adapter and recipe before anything is filled.
+    """
+    start_site = site_domain(driver.current_url)
+    
+    # Wait for page to fully load
+    print("⏳ Waiting for form to load...")
+    time.sleep(3)
+    scroll_to_bottom(driver)
+    time.sleep(2)
+    
+    # Debug: Print page title and check if we're on the right page
+    try:
+        page_title = driver.title
+        current_url = driver.current_url
+        print(f"📄 Page title: {page_title}")
+        print(f"🔗 Current URL: {current_url}")
+    except:
+        pass
+    
+    # Handle cookies popup before any form analysis (callers with a recipe have
+    # already resolved the banner for this page through it)
+    if recipe is None:
+        handle_cookies_popup(driver)
+        time.sleep(1)
+    
+    # Check if this is a newsletter form that should be skipped
+    # BUT first check if this might be a job listing page that we need to navigate
+    page_source_lower = driver.page_source.lower()
+    
+    # Don't run newsletter detection if we're on a job listings page
+    job_listing_indicators = [
+        'job-title', 'job-card', 'job-listing', 'position', 'career', 'opening',
+        'apply now', 'job board', 'vacancies', 'opportunities', 'empleos',
+        'current vacancies', 'job openings', 'read more'
+    ]
+    
+    is_job_listing_page = any(indicator in page_source_lower for indicator in job_listing_indicators)
     
-    if apply_buttons:
+    # First, check if there's already an Apply button on this page (single job page),
+    # replaying the one the site's recipe recorded, then the platform's own, before searching for it
+    apply_step = f"apply_{page}"
+    apply_replayed = replay_recipe_step(driver, recipe, apply_step)
+    apply_buttons = []
+    if not apply_replayed:
+        adapter_apply = adapter.locate_controls(driver).get("apply") if adapter else None
+        apply_buttons = [adapter_apply] if adapter_apply else find_page_apply_buttons(driver)
+    if not apply_replayed and not apply_buttons:
+        learn_recipe_step(recipe, apply_step, [])
+    
+    if apply_replayed:
+        print("✅ Clicked apply button - proceeding to application form")
+        time.sleep(2)
+    
+    elif apply_buttons:
         print(f"🎯 Found {len(apply_buttons)} apply buttons on single job page")
+        apply_clicked = []
         for btn in apply_buttons:
             if btn.is_displayed():
                 print(f"✅ Found apply button: {btn.text}")
+                locator = element_locator(driver, btn) if recipe else None
                 try:
                     btn.click()
                     print("✅ Clicked apply button - proceeding to application form")
                     time.sleep(2)
                     # Continue to form filling after clicking apply
+                    apply_clicked.append(locator)
                     break
                 except:
                     try:
                         driver.execute_script("arguments[0].click();", btn)
                         print("✅ JavaScript clicked apply button - proceeding to application form")
                         time.sleep(2)
+                        apply_clicked.append(locator)
                         break
                     except:
                         continue
+        learn_recipe_step(recipe, apply_step, [locator for locator in apply_clicked if locator])
     
     # Check if this is a job board with multiple job listings that we need to navigate
     elif is_job_listing_page:
@@ -2531,8 +2579,13 @@ def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
         
         print("🔍 No specific job match found, proceeding with form filling")
     
+    if stop_on_site_change and site_domain(driver.current_url) != start_site:
+        print(f"🧭 Moved on to {site_domain(driver.current_url)}, handing back to pick its adapter and recipe")
+        return ["site_changed"]
+    
     if not is_job_listing_page and is_external_newsletter_form(driver):
-        if skip_external_newsletter_form(driver):
+        if run_recipe_step(driver, recipe, f"newsletter_{page}", skip_external_newsletter_form,
+                           after_replay=lambda d: time.sleep(3) or True):
             print("✅ Successfully skipped newsletter form, continuing to next page")
             return ["newsletter_skipped"]  # Return special marker to indicate we skipped this page
         else:
@@ -2587,180 +2640,86 @@ def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
     
     # Enhanced field detection and filling
     print("🔍 Analyzing form fields...")
+    collected = collect_page_form_fields(driver)
     
-    # 1. Handle text input fields
-    input_fields = driver.find_elements(By.CSS_SELECTOR, 
-        "input[type='text'], input[type='email'], input[type='tel'], input[type='number'], input[type='url'], textarea"
-    )
+    # Values are decided for every field first and applied in one batch further down,
+    # starting with the fields a known platform's adapter finds by their ids
+    fill_plan = adapter.fill_steps(adapter.locate_controls(driver), field_mappings) if adapter else []
+    adapter_elements = [step["element"] for step in fill_plan]
+    if adapter:
+        print(f"🧩 {adapter.name} adapter: {len(fill_plan)} fields found by id")
     
-    for field in input_fields:
-        try:
-            # Get field context (label, placeholder, etc.)
-            field_context = get_field_context(driver, field)
-            field_label = field_context.lower()
-            
-            # Skip hidden fields
-            if not field.is_displayed():
-                continue
-                
-            print(f"🔍 Analyzing field: {field_context}")
-            
-            # Try to match field with known types
-            filled = False
-            for field_type, mapping in field_mappings.items():
-                if any(keyword in field_label for keyword in mapping["keywords"]):
-                    print(f"📝 Found {field_type} field: {field_context}")
-                    
-                    success = fill_text_field(driver, field, mapping["value"])
-                    
-                    # Special handling for phone numbers - only for main phone field, not extension
-                    if field_type == "phone" and success and "extension" not in field_label:
-                        time.sleep(1)  # Wait for validation
-                        if has_validation_errors(driver, field):
-                            print("📞 Phone field has validation error, trying alternative formats...")
-                            phone_value = mapping["value"]
-                            success = try_multiple_phone_formats(driver, field, phone_value)
-                            if success:
-                                print("✅ Phone number filled with alternative format")
-                            else:
-                                print("❌ All phone formats failed validation")
-                    elif not success and field_type == "phone" and "extension" not in field_label:
-                        phone_value = mapping["value"]
-                        success = try_multiple_phone_formats(driver, field, phone_value)
-                    
-                    if success:
-                        forms_found.append({
-                            "type": field_type,
-                            "label": field_context,
-                            "value": mapping["value"]
-                        })
-                        filled = True
-                        break
-            
-            # If not matched, try keyword-based answer
-            if not filled:
-                answer = find_keyword_answer(field_context, form_data)
-                if answer:
-                    success = fill_text_field(driver, field, answer)
-                    if success:
-                        forms_found.append({
-                            "type": "keyword_match",
-                            "label": field_context,
-                            "value": answer
-                        })
-                        
-        except Exception as e:
-            print(f"⚠️ Error analyzing text field: {str(e)}")
+    # 1. Handle text input fields
+    for text_field in collected["text_fields"]:
+        # Skip hidden fields and the ones the adapter already covers
+        if not text_field["visible"] or text_field["element"] in adapter_elements:
             continue
+            
+        # Get field context (label, placeholder, etc.)
+        field_context = text_field["context"]
+        field_label = field_context.lower()
+        print(f"🔍 Analyzing field: {field_context}")
+        
+        # Try to match field with known types, starting with the type the site's recipe recorded
+        step = None
+        known_type = recipe.field_type(field_context) if recipe else None
+        if known_type in field_mappings:
+            print(f"📒 Recipe maps field to {known_type}: {field_context}")
+            step = {"type": known_type, "value": field_mappings[known_type]["value"]}
+        for field_type, mapping in ([] if step else field_mappings.items()):
+            if any(keyword in field_label for keyword in mapping["keywords"]):
+                print(f"📝 Found {field_type} field: {field_context}")
+                step = {"type": field_type, "value": mapping["value"]}
+                break
+        
+        # If not matched, try keyword-based answer
+        if step is None:
+            answer = find_keyword_answer(field_context, form_data)
+            if answer:
+                step = {"type": "keyword_match", "value": answer}
+        
+        if step:
+            step.update({"element": text_field["element"], "action": "text", "label": field_context})
+            fill_plan.append(step)
     
     # 2. Collect all radio button and dropdown questions for LLM analysis
     questions_data = []
     
     # Collect radio button questions
-    radio_groups = find_radio_groups(driver)
-    radio_group_mapping = {}  # Map question to radio elements
-    
-    for group_name, radio_buttons in radio_groups.items():
-        try:
-            print(f"🔘 Found radio group: {group_name}")
-            
-            # Get all options for this group and extract the question text
-            options = []
-            element_mapping = {}
-            question_text = None
-            
-            for radio in radio_buttons:
-                try:
-                    radio_id = radio.get_attribute("id")
-                    label_text = get_radio_label_text(driver, radio, radio_id)
-                    options.append(label_text)
-                    element_mapping[label_text] = radio
-                    
-                    # Try to extract the actual question text from the first radio button
-                    if question_text is None:
-                        question_text = extract_question_text_from_radio(driver, radio)
-                        
-                except Exception as e:
-                    print(f"⚠️ Error processing radio option: {str(e)}")
-                    continue
-                    
-            if options:
-                # Use extracted question text or fall back to group name
-                display_question = question_text if question_text else group_name
-                print(f"   Question: {display_question}")
-                
-                questions_data.append({
-                    "question": display_question,
-                    "options": options,
-                    "question_type": "radio"
-                })
-                radio_group_mapping[display_question] = element_mapping
-                print(f"   Added {len(options)} options to LLM analysis")
-                
-        except Exception as e:
-            print(f"⚠️ Error collecting radio group {group_name}: {str(e)}")
+    radio_group_mapping = {}  # Map question to radio entries
+    for radio_question in collected["radio_questions"]:
+        print(f"🔘 Radio question: {radio_question['question']}")
+        questions_data.append({
+            "question": radio_question["question"],
+            "options": radio_question["options"],
+            "question_type": "radio"
+        })
+        radio_group_mapping[radio_question["question"]] = radio_question
+        print(f"   Added {len(radio_question['options'])} options to LLM analysis")
     
     # Collect custom radio questions  
-    custom_radio_groups = find_custom_radio_elements(driver)
     custom_group_mapping = {}
-    
-    for group_name, elements in custom_radio_groups.items():
-        try:
-            print(f"🔘 Found custom radio group: {group_name}")
-            
-            options = []
-            element_mapping = {}
-            for element in elements:
-                try:
-                    element_text = element.text.strip()
-                    if element_text and len(element_text) < 200:  # Skip very long texts
-                        options.append(element_text)
-                        element_mapping[element_text] = element
-                except Exception as e:
-                    print(f"⚠️ Error processing custom radio option: {str(e)}")
-                    continue
-            
-            if options:
-                questions_data.append({
-                    "question": group_name,
-                    "options": options,
-                    "question_type": "custom_radio"
-                })
-                custom_group_mapping[group_name] = element_mapping
-                print(f"   Added {len(options)} custom options to LLM analysis")
-                
-        except Exception as e:
-            print(f"⚠️ Error collecting custom radio group {group_name}: {str(e)}")
+    for custom_question in collected["custom_radio_questions"]:
+        print(f"🔘 Custom radio group: {custom_question['question']}")
+        questions_data.append({
+            "question": custom_question["question"],
+            "options": custom_question["options"],
+            "question_type": "custom_radio"
+        })
+        custom_group_mapping[custom_question["question"]] = custom_question["elements"]
+        print(f"   Added {len(custom_question['options'])} custom options to LLM analysis")
     
     # Collect dropdown questions
-    dropdowns = driver.find_elements(By.CSS_SELECTOR, "select")
     dropdown_mapping = {}
-    
-    for dropdown in dropdowns:
-        try:
-            if not dropdown.is_displayed():
-                continue
-                
-            # Get dropdown context
-            context = get_field_context(driver, dropdown)
-            
-            # Get options
-            from selenium.webdriver.support.ui import Select
-            select = Select(dropdown)
-            options = [opt.text.strip() for opt in select.options if opt.text.strip()]
-            
-            if options and len(options) > 1:  # Skip dropdowns with no real options
-                questions_data.append({
-                    "question": context,
-                    "options": options,
-                    "question_type": "dropdown"
-                })
-                dropdown_mapping[context] = dropdown
-                print(f"🔽 Found dropdown '{context}' with {len(options)} options")
-                
-        except Exception as e:
-            print(f"⚠️ Error collecting dropdown: {str(e)}")
-            continue
+    for dropdown in collected["dropdowns"]:
+        if len(dropdown["options"]) > 1:  # Skip dropdowns with no real options
+            questions_data.append({
+                "question": dropdown["context"],
+                "options": dropdown["options"],
+                "question_type": "dropdown"
+            })
+            dropdown_mapping[dropdown["context"]] = dropdown["element"]
+            print(f"🔽 Found dropdown '{dropdown['context']}' with {len(dropdown['options'])} options")
     
     # Load CV content for LLM analysis
     cv_content = ""
@@ -2794,99 +2753,41 @@ def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
                 fallback_selections = apply_fallback_radio_selections(unanswered_questions, form_data)
                 llm_selections.update(fallback_selections)
         
-        # Apply LLM selections to radio buttons
+        # Queue LLM selections for radio buttons, custom radios and dropdowns
         for question, selected_option in llm_selections.items():
-            try:
-                # Handle regular radio buttons
-                if question in radio_group_mapping:
-                    element_mapping = radio_group_mapping[question]
-                    if selected_option in element_mapping:
-                        radio_element = element_mapping[selected_option]
-                        
-                        # Try to click the radio button
-                        success = False
-                        if not radio_element.is_displayed():
-                            success = try_click_radio_label(driver, radio_element)
-                        else:
-                            try:
-                                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", radio_element)
-                                time.sleep(0.5)
-                                radio_element.click()
-                                success = True
-                            except:
-                                try:
-                                    driver.execute_script("arguments[0].click();", radio_element)
-                                    success = True
-                                except:
-                                    success = try_click_radio_label(driver, radio_element)
-                        
-                        if success:
-                            print(f"✅ Selected radio option: {selected_option}")
-                            forms_found.append({
-                                "type": "radio",
-                                "label": question,
-                                "value": selected_option
-                            })
-                        else:
-                            print(f"❌ Failed to click radio option: {selected_option}")
-                
-                # Handle custom radio elements
-                elif question in custom_group_mapping:
-                    element_mapping = custom_group_mapping[question]
-                    if selected_option in element_mapping:
-                        custom_element = element_mapping[selected_option]
-                        
-                        try:
-                            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", custom_element)
-                            time.sleep(0.5)
-                            custom_element.click()
-                            print(f"✅ Selected custom radio option: {selected_option}")
-                            forms_found.append({
-                                "type": "custom_radio",
-                                "label": question,
-                                "value": selected_option
-                            })
-                        except Exception as e:
-                            print(f"❌ Failed to click custom radio option: {selected_option} - {str(e)}")
-                
-                # Handle dropdowns
-                elif question in dropdown_mapping:
-                    dropdown_element = dropdown_mapping[question]
-                    
-                    try:
-                        from selenium.webdriver.support.ui import Select
-                        select = Select(dropdown_element)
-                        
-                        # Try to select by visible text
-                        for option in select.options:
-                            if option.text.strip() == selected_option:
-                                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", dropdown_element)
-                                time.sleep(0.5)
-                                select.select_by_visible_text(option.text)
-                                print(f"✅ Selected dropdown option: {selected_option}")
-                                forms_found.append({
-                                    "type": "dropdown",
-                                    "label": question,
-                                    "value": selected_option
-                                })
-                                break
-                        else:
-                            print(f"❌ Could not find dropdown option: {selected_option}")
+            # Handle regular radio buttons
+            if question in radio_group_mapping:
+                radio_question = radio_group_mapping[question]
+                if selected_option in radio_question["elements"]:
+                    fill_plan.append({
+                        "type": "radio", "action": "check", "label": question, "value": selected_option,
+                        "element": radio_question["elements"][selected_option],
+                        "visible": radio_question["visible"][selected_option]
+                    })
             
-                    except Exception as e:
-                        print(f"❌ Failed to select dropdown option: {selected_option} - {str(e)}")
-                
-                else:
-                    print(f"⚠️ Could not map question to element: {question}")
-                    
-            except Exception as e:
-                print(f"⚠️ Error applying LLM selection for '{question}': {str(e)}")
+            # Handle custom radio elements
+            elif question in custom_group_mapping:
+                if selected_option in custom_group_mapping[question]:
+                    fill_plan.append({
+                        "type": "custom_radio", "action": "click", "label": question, "value": selected_option,
+                        "element": custom_group_mapping[question][selected_option]
+                    })
+            
+            # Handle dropdowns
+            elif question in dropdown_mapping:
+                fill_plan.append({
+                    "type": "dropdown", "action": "select", "label": question, "value": selected_option,
+                    "element": dropdown_mapping[question]
+                })
+            
+            else:
+                print(f"⚠️ Could not map question to element: {question}")
     
     else:
         print("ℹ️ No radio buttons or dropdowns found for LLM analysis")
     
     # 3. Handle checkboxes
-    checkboxes = driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
+    checkboxes = collected["checkboxes"]
     print(f"☑️ Found {len(checkboxes)} checkboxes on page")
     
     # Group checkboxes by name (like gender identity questions)
@@ -2894,83 +2795,25 @@ def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
     privacy_checkboxes = []
     
     for i, checkbox in enumerate(checkboxes):
-        try:
-            checkbox_name = checkbox.get_attribute("name") or ""
-            checkbox_id = checkbox.get_attribute("id") or ""
-            checkbox_context = get_field_context(driver, checkbox)
-            
-            print(f"   Checkbox {i+1}: name='{checkbox_name}', id='{checkbox_id}', context='{checkbox_context[:50]}...'")
-            
-            # Check if it's a privacy/terms checkbox (including by name)
-            if (any(term in checkbox_context.lower() for term in ["privacy", "terms", "data", "policy", "consent", "agree", "controller", "legal"]) or 
-                checkbox_name in ["new_legal_notice", "legal_notice", "privacy_policy"]):
-                privacy_checkboxes.append({
-                    "element": checkbox,
-                    "context": checkbox_context,
-                    "name": checkbox_name,
-                    "id": checkbox_id
-                })
-            # Group other checkboxes by name (for gender identity, etc.)
-            elif checkbox_name:
-                if checkbox_name not in checkbox_groups:
-                    checkbox_groups[checkbox_name] = []
-                checkbox_groups[checkbox_name].append({
-                    "element": checkbox,
-                    "context": checkbox_context,
-                    "id": checkbox_id
-                })
-                
-        except Exception as e:
-            print(f"⚠️ Error analyzing checkbox {i+1}: {str(e)}")
-    
-    # Handle privacy/terms checkboxes first
+        checkbox_name = checkbox["name"]
+        checkbox_context = checkbox["context"]
+        print(f"   Checkbox {i+1}: name='{checkbox_name}', id='{checkbox['id']}', context='{checkbox_context[:50]}...'")
+        
+        # Check if it's a privacy/terms checkbox (including by name)
+        if is_privacy_checkbox(checkbox_name, checkbox_context):
+            privacy_checkboxes.append(checkbox)
+        # Group other checkboxes by name (for gender identity, etc.)
+        elif checkbox_name:
+            checkbox_groups.setdefault(checkbox_name, []).append(checkbox)
+    
+    # Queue privacy/terms checkboxes
     for privacy_cb in privacy_checkboxes:
-        try:
-            checkbox = privacy_cb["element"]
-            if not checkbox.is_selected():
-                print(f"🔒 Found privacy checkbox: {privacy_cb['context'][:50]}...")
-                success = False
-                
-                # If checkbox is visible, try direct click first
-                if checkbox.is_displayed():
-                    try:
-                        checkbox.click()
-                        print("✅ Clicked privacy checkbox directly")
-                        success = True
-                    except Exception as e1:
-                        print(f"❌ Direct privacy click failed: {str(e1)}")
-                
-                # Try JavaScript click
-                if not success:
-                    try:
-                        driver.execute_script("arguments[0].click();", checkbox)
-                        print("✅ Clicked privacy checkbox via JavaScript")
-                        success = True
-                    except Exception as e2:
-                        print(f"❌ JavaScript privacy click failed: {str(e2)}")
-                
-                # Try clicking associated label (works for hidden elements)
-                if not success and privacy_cb["id"]:
-                    try:
-                        label = driver.find_element(By.CSS_SELECTOR, f"label[for='{privacy_cb['id']}']")
-                        label.click()
-                        print("✅ Clicked privacy checkbox via label (hidden)")
-                        success = True
-                    except Exception as e3:
-                        print(f"❌ Privacy label click failed: {str(e3)}")
-                
-                if success:
-                    print(f"✅ Checked privacy/terms: {privacy_cb['context'][:50]}...")
-                    forms_found.append({
-                        "type": "checkbox",
-                        "label": privacy_cb["context"],
-                        "value": "checked"
-                    })
-                else:
-                    print(f"❌ Failed to check privacy checkbox")
-                
-        except Exception as e:
-            print(f"⚠️ Error checking privacy checkbox: {str(e)}")
+        if not privacy_cb["checked"]:
+            print(f"🔒 Found privacy checkbox: {privacy_cb['context'][:50]}...")
+            fill_plan.append({
+                "type": "checkbox", "action": "check", "label": privacy_cb["context"], "value": "checked",
+                "element": privacy_cb["element"], "visible": privacy_cb["visible"]
+            })
     
     # Handle grouped checkboxes (like gender identity)
     for group_name, checkboxes_in_group in checkbox_groups.items():
@@ -3000,65 +2843,295 @@ def analyze_and_fill_form(driver, form_data, job_analysis=None, job_title=""):
             print(f"⚠️ Error handling checkbox group {group_name}: {str(e)}")
     
     # 4. Handle dropdowns/select fields
-    select_fields = driver.find_elements(By.CSS_SELECTOR, "select")
-    for select_field in select_fields:
+    for dropdown in collected["dropdowns"]:
+        select_context = dropdown["context"]
+        print(f"📋 Dropdown '{select_context}' has {len(dropdown['options'])} options:")
+        for i, option_text in enumerate(dropdown["options"]):
+            print(f"   {i+1}. {option_text}")
+        
+        selected_option = select_dropdown_option_intelligently(
+            select_context.lower(), [SimpleNamespace(text=option_text) for option_text in dropdown["options"]], form_data
+        )
+        if selected_option:
+            fill_plan.append({
+                "type": "select", "action": "select", "label": select_context, "value": selected_option.text,
+                "element": dropdown["element"]
+            })
+    
+    # Apply every queued value in one round trip; fields that reject it are filled one by one
+    for step in run_fill_plan(driver, fill_plan, form_data):
+        forms_found.append({
+            "type": step["type"],
+            "label": step["label"],
+            "value": step["value"]
+        })
+    
+    # 5. Handle Workday-style custom dropdowns (non-select elements)
+    for workday_field in collected["workday_fields"]:
         try:
-            if not select_field.is_displayed():
-                continue
-                
-            select_context = get_field_context(driver, select_field)
-            print(f"📋 Found dropdown: {select_context}")
+            field_context = workday_field["context"]
+            print(f"🔧 Found Workday-style field: {field_context}")
             
-            selected = handle_dropdown(driver, select_field, select_context, form_data)
+            # Handle this as a Workday dropdown
+            selected = handle_workday_dropdown(driver, workday_field["element"], field_context)
             if selected:
                 forms_found.append({
-                    "type": "select",
-                    "label": select_context,
+                    "type": "workday_dropdown",
+                    "label": field_context,
                     "value": selected
                 })
                 
         except Exception as e:
-            print(f"⚠️ Error handling dropdown: {str(e)}")
+            print(f"⚠️ Error handling Workday field: {str(e)}")
     
-    # 5. Handle Workday-style custom dropdowns (non-select elements)
-    workday_selectors = [
-        "[data-automation-id*='searchBox']",
-        "[data-automation-id*='selectinput']",
-        "[data-automation-id*='dropdown']",
-        "[data-automation-id*='combobox']"
-    ]
+    # Update form database
+    update_form_database(forms_found)
+    if recipe:
+        recipe.record_fields({field["label"]: field["type"] for field in forms_found if field["type"] in field_mappings})
+    
+    print(f"✅ Filled {len(forms_found)} form fields")
+    return forms_found
+
+
+def collect_form_fields_legacy(driver):
+    """Per-element collection of the fields analyze_and_fill_form works on (several WebDriver calls per field)"""
+    collected = {
+        "text_fields": [],
+        "radio_questions": [],
+        "custom_radio_questions": [],
+        "dropdowns": [],
+        "checkboxes": [],
+        "workday_fields": []
+    }
     
-    for selector in workday_selectors:
+    input_fields = driver.find_elements(By.CSS_SELECTOR, 
+        "input[type='text'], input[type='email'], input[type='tel'], input[type='number'], input[type='url'], textarea"
+    )
+    for field in input_fields:
+        try:
+            collected["text_fields"].append({
+                "element": field,
+                "context": get_field_context(driver, field),
+                "visible": field.is_displayed()
+            })
+        except Exception as e:
+            print(f"⚠️ Error analyzing text field: {str(e)}")
+    
+    for group_name, radio_buttons in find_radio_groups(driver).items():
         try:
-            workday_fields = driver.find_elements(By.CSS_SELECTOR, selector)
-            for field in workday_fields:
+            print(f"🔘 Found radio group: {group_name}")
+            
+            # Get all options for this group and extract the question text
+            options = []
+            element_mapping = {}
+            visible = {}
+            question_text = None
+            
+            for radio in radio_buttons:
                 try:
-                    if not field.is_displayed():
-                        continue
-                        
-                    field_context = get_field_context(driver, field)
-                    print(f"🔧 Found Workday-style field: {field_context}")
+                    radio_id = radio.get_attribute("id")
+                    label_text = get_radio_label_text(driver, radio, radio_id)
+                    options.append(label_text)
+                    element_mapping[label_text] = radio
+                    visible[label_text] = radio.is_displayed()
                     
-                    # Handle this as a Workday dropdown
-                    selected = handle_workday_dropdown(driver, field, field_context)
-                    if selected:
-                        forms_found.append({
-                            "type": "workday_dropdown",
-                            "label": field_context,
-                            "value": selected
-                        })
+                    # Try to extract the actual question text from the first radio button
+                    if question_text is None:
+                        question_text = extract_question_text_from_radio(driver, radio)
                         
                 except Exception as e:
-                    print(f"⚠️ Error handling Workday field: {str(e)}")
+                    print(f"⚠️ Error processing radio option: {str(e)}")
+                    continue
                     
+            if options:
+                # Use extracted question text or fall back to group name
+                collected["radio_questions"].append({
+                    "question": question_text if question_text else group_name,
+                    "options": options,
+                    "elements": element_mapping,
+                    "visible": visible
+                })
+                
+        except Exception as e:
+            print(f"⚠️ Error collecting radio group {group_name}: {str(e)}")
+    
+    for group_name, elements in find_custom_radio_elements(driver).items():
+        options = []
+        element_mapping = {}
+        for element in elements:
+            try:
+                element_text = element.text.strip()
+                if element_text and len(element_text) < 200:  # Skip very long texts
+                    options.append(element_text)
+                    element_mapping[element_text] = element
+            except Exception as e:
+                print(f"⚠️ Error processing custom radio option: {str(e)}")
+                continue
+        if options:
+            collected["custom_radio_questions"].append({
+                "question": group_name,
+                "options": options,
+                "elements": element_mapping
+            })
+    
+    from selenium.webdriver.support.ui import Select
+    for dropdown in driver.find_elements(By.CSS_SELECTOR, "select"):
+        try:
+            if not dropdown.is_displayed():
+                continue
+            collected["dropdowns"].append({
+                "element": dropdown,
+                "context": get_field_context(driver, dropdown),
+                "options": [opt.text.strip() for opt in Select(dropdown).options if opt.text.strip()]
+            })
+        except Exception as e:
+            print(f"⚠️ Error collecting dropdown: {str(e)}")
+    
+    for i, checkbox in enumerate(driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")):
+        try:
+            collected["checkboxes"].append({
+                "element": checkbox,
+                "context": get_field_context(driver, checkbox),
+                "name": checkbox.get_attribute("name") or "",
+                "id": checkbox.get_attribute("id") or "",
+                "checked": checkbox.is_selected(),
+                "visible": checkbox.is_displayed()
+            })
+        except Exception as e:
+            print(f"⚠️ Error analyzing checkbox {i+1}: {str(e)}")
+    
+    for selector in WORKDAY_SELECTORS:
+        try:
+            for field in driver.find_elements(By.CSS_SELECTOR, selector):
+                if field.is_displayed():
+                    collected["workday_fields"].append({
+                        "element": field,
+                        "context": get_field_context(driver, field)
+                    })
         except Exception as e:
             print(f"⚠️ Error finding Workday fields with selector {selector}: {str(e)}")
     
-    # Update form database
-    update_form_database(forms_found)
+    return collected
+
+
+def collect_page_form_fields(driver):
+    """Collect the page's form fields from one DOM snapshot, reporting the WebDriver round trips it took.
     
-    print(f"✅ Filled {len(forms_found)} form fields")
-    return forms_found
+    Falls back to the per-element collection when the snapshot is off (FORM_SNAPSHOT=0) or fails.
+    With FORM_SNAPSHOT_COMPARE=1 the per-element collection also runs first so both counts are reported.
+    """
+    if FORM_SNAPSHOT_COMPARE:
+        with WebDriverCommandCounter(driver) as counter:
+            collect_form_fields_legacy(driver)
+        print(f"📡 Form analysis, per element: {counter.summary()}")
+    
+    collected = snapshot = None
+    with WebDriverCommandCounter(driver) as counter:
+        if FORM_SNAPSHOT_ENABLED:
+            snapshot = take_form_snapshot(driver)
+            if snapshot:
+                collected = collect_form_fields(snapshot)
+                print(f"📸 Form snapshot: {len(snapshot.fields)} elements")
+        if collected is None:
+            collected = collect_form_fields_legacy(driver)
+    method = "snapshot" if snapshot else "per element"
+    print(f"📡 Form analysis, {method}: {counter.summary()}")
+    return collected
+
+
+def run_fill_plan(driver, fill_plan, form_data):
+    """Apply a page's fill plan in one batch, redo rejected steps one by one, and return the steps that took"""
+    if not fill_plan:
+        return []
+    
+    filled = []
+    with WebDriverCommandCounter(driver) as counter:
+        results = apply_fill_plan(driver, fill_plan)
+        print(f"⚡ Fill plan: {fill_plan_summary(fill_plan, results)}")
+        
+        for step, result in zip(fill_plan, results):
+            try:
+                success = result["ok"]
+                if not success:
+                    if result.get("problem"):
+                        print(f"⌨️ Filling '{step['label'][:50]}' directly ({result['problem']})")
+                    success = fill_step_with_webdriver(driver, step, form_data)
+                
+                # Special handling for phone numbers - only for main phone field, not extension
+                if step["type"] == "phone" and "extension" not in step["label"].lower():
+                    if result["ok"]:
+                        invalid = has_fill_errors(result)
+                    else:
+                        time.sleep(1)  # Wait for validation
+                        invalid = success and has_validation_errors(driver, step["element"])
+                    if not success or invalid:
+                        print("📞 Phone field has validation error, trying alternative formats...")
+                        success = try_multiple_phone_formats(driver, step["element"], step["value"])
+                        if success:
+                            print("✅ Phone number filled with alternative format")
+                        else:
+                            print("❌ All phone formats failed validation")
+                
+                if success:
+                    if step["action"] != "text":
+                        print(f"✅ Selected {step['type']} option: {step['value']}")
+                    filled.append(step)
+                else:
+                    print(f"❌ Failed to fill {step['type']}: {step['value']}")
+                    
+            except Exception as e:
+                print(f"⚠️ Error filling '{step['label'][:50]}': {str(e)}")
+    print(f"📡 Form filling: {counter.summary()}")
+    return filled
+
+
+def fill_step_with_webdriver(driver, step, form_data):
+    """Fill one fill-plan step with real keystrokes and clicks (for fields that reject programmatic input)"""
+    element = step["element"]
+    if step["action"] == "text":
+        return fill_text_field(driver, element, step["value"])
+    
+    if step["action"] == "check":
+        if step.get("visible"):
+            try:
+                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
+                time.sleep(0.5)
+                element.click()
+                return True
+            except Exception as e:
+                print(f"❌ Direct click failed: {str(e)}")
+        # Label, parent label or JavaScript click (works for hidden inputs)
+        return try_click_radio_label(driver, element)
+    
+    if step["action"] == "click":
+        try:
+            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
+            time.sleep(0.5)
+            element.click()
+            return True
+        except Exception as e:
+            print(f"❌ Failed to click custom radio option: {step['value']} - {str(e)}")
+            return False
+    
+    if step["action"] == "select":
+        # Heuristic dropdowns keep their full fallback chain, including the Workday one
+        if step["type"] == "select":
+            return bool(handle_dropdown(driver, element, step["label"], form_data))
+        from selenium.webdriver.support.ui import Select
+        try:
+            select = Select(element)
+            for option in select.options:
+                if option.text.strip() == step["value"]:
+                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
+                    time.sleep(0.5)
+                    select.select_by_visible_text(option.text)
+                    return True
+            print(f"❌ Could not find dropdown option: {step['value']}")
+        except Exception as e:
+            print(f"❌ Failed to select dropdown option: {step['value']} - {str(e)}")
+        return False
+    
+    return False
 
 
 def get_field_context(driver, field):
@@ -3845,20 +3918,9 @@ def extract_question_text_from_radio(driver, radio):
             pass
         
         # Method 5: Fallback to common patterns based on field name
-        if "30515459002" in radio_name:
-            return "Do you need, or will you need in the future, any immigration-related support or sponsorship from Glovo in order to begin the employment at the work location?"
-        elif "30515462002" in radio_name:
-            return "Glovo's hybrid ways of working mean 3 days in the office, and 2 days WFH, does this match your preferences or requirements?"
-        elif "30515463002" in radio_name:
-            return "Please indicate your English proficiency level"
-        elif "30515464002" in radio_name:
-            return "Please indicate your experience level"
-        elif "30515465002" in radio_name:
-            return "Please indicate your experience level"
-        elif "30515466002" in radio_name:
-            return "Please indicate your experience level"
-        elif "31264548002" in radio_name:
-            return "When would you be available to start?"
+        for name_part, question in KNOWN_RADIO_QUESTIONS.items():
+            if name_part in radio_name:
+                return question
             
     except Exception as e:
         print(f"⚠️ Error extracting question text: {str(e)}")
@@ -3962,12 +4024,9 @@ def get_radio_label_text(driver, radio, radio_id):
     radio_name = radio.get_attribute("name") or ""
     
     # Create more meaningful names based on common patterns
-    if "29495816002" in radio_name:
-        return "Do you need immigration sponsorship?" + (f" (Option {value})" if value else "")
-    elif "29495819002" in radio_name:
-        return "Would you be interested in hybrid/remote work?" + (f" (Option {value})" if value else "")
-    elif "31264560002" in radio_name:
-        return "When are you available to start?" + (f" (Option {value})" if value else "")
+    for name_part, label in KNOWN_RADIO_LABELS.items():
+        if name_part in radio_name:
+            return label + (f" (Option {value})" if value else "")
     
     return value or f"Radio option for {radio_name}"
 
@@ -4370,6 +4429,11 @@ def select_dropdown_option_intelligently(context_lower, options, form_data):
 def process_individual_job(driver, job_id):
     """Process a single job application"""
     try:
+        store = get_job_store()
+        if store.get_status("linkedin", job_id) == "applied":
+            print(f"⏭️ Already applied to job {job_id}, skipping")
+            return
+        
         job_url = f"https://www.linkedin.com/jobs/view/{job_id}/"
         print(f"\n🔍 Processing job: {job_url}")
         
@@ -4405,6 +4469,8 @@ def process_individual_job(driver, job_id):
             # Check if it was an Easy Apply that was successfully submitted
             if "easy apply" in driver.page_source.lower() and "submitt" in driver.page_source.lower():
                 # Successfully submitted Easy Apply
+                if not DRY_RUN:
+                    store.set_status("linkedin", job_id, "applied")
                 trello_key = os.getenv('TRELLO_KEY')
                 trello_token = os.getenv('TRELLO_TOKEN')
                 trello_list_id = os.getenv('TRELLO_APPLIED_LIST_ID')
@@ -4427,14 +4493,44 @@ def process_individual_job(driver, job_id):
                 previous_url = None
                 consecutive_skips = 0
                 
+                # The ATS, adapter and recipe are picked again whenever the flow moves to another
+                # site (a company careers page handing over to myworkdayjobs.com, say); recipe
+                # steps are numbered by page within that site
+                recipe_store = get_recipe_store()
+                recipe = None
+                site = ats = adapter = None
+                site_page = 0
+                cookies_resolved = False
+                
                 for i in range(5): # Max 5 pages to prevent infinite loops
                     print(f"➡️ On application page {i+1}")
-                    handle_cookies_popup(driver)
+                    page_site = site_domain(driver.current_url)
+                    if page_site != site:
+                        site, site_page = page_site, 0
+                        ats = detect_ats(driver)
+                        adapter = get_adapter(ats)
+                        cookies_resolved = False
+                        print(f"🧭 Application on {site} runs on: {ats}")
+                        if recipe_store:
+                            recipe = recipe_store.recipe_for_url(driver.current_url, ats)
+                            print(f"📒 Recipe {recipe.key}: {recipe.step_count()} known steps")
+                    site_page += 1
+                    # A banner only ever needs dismissing once per site, and not at all on a site
+                    # whose banner was already clicked this run; a miss is only held against the
+                    # recipe on the site's first page, where banners show
+                    if not cookies_resolved and get_consent_resolver().remembers(driver.current_url):
+                        cookies_resolved = True
+                    if not cookies_resolved:
+                        cookies_resolved = bool(run_recipe_step(driver, recipe, "cookies", handle_cookies_popup,
+                                                                record_miss=(site_page == 1)))
                     
                     current_url = driver.current_url
                     
                     # Fill forms and upload CV on the current page
-                    filled_forms = analyze_and_fill_form(driver, form_data, job_analysis, job_title)
+                    filled_forms = analyze_and_fill_form(driver, form_data, job_analysis, job_title, recipe, site_page, adapter,
+                                                         stop_on_site_change=True)
+                    if filled_forms == ["site_changed"]:
+                        continue
                     
                     # If newsletter form was skipped, continue to next iteration
                     if filled_forms == ["newsletter_skipped"]:
@@ -4461,20 +4557,32 @@ def process_individual_job(driver, job_id):
                     consecutive_skips = 0
                     previous_url = current_url
                     
-                    upload_cv(driver)
+                    upload_cv(driver, adapter)
                     
                     # Show dry run preview if enabled
                     dry_run_preview(driver, filled_forms)
                     
-                    # Try to find and click the next button
-                    if not click_next_or_submit_button(driver):
+                    # Try to find and click the next button (replaying the recipe's button outside
+                    # dry runs, where the button helpers only report what they would click)
+                    if DRY_RUN:
+                        moved = click_adapter_next_button(driver, adapter)
+                    else:
+                        moved = run_recipe_step(driver, recipe, f"next_{site_page}",
+                                                lambda d, clicked: click_adapter_next_button(d, adapter, clicked),
+                                                after_replay=after_next_click)
+                    if not moved:
                         print("✅ Reached the end of the application flow.")
+                        if not DRY_RUN:
+                            store.set_status("linkedin", job_id, "applied")
                         # Create Trello card after finishing external application
                         # (Assuming success if it completes the loop)
                         # ... Trello card creation logic ...
                         break
                     
                     time.sleep(3) # Wait for next page to load
+                
+                if recipe_store:
+                    recipe_store.save()
 
             # Cleanup: close new tabs and switch back
             if len(driver.window_handles) > 1:
@@ -4486,6 +4594,9 @@ def process_individual_job(driver, job_id):
             
     except Exception as e:
         print(f"❌ Error processing job {job_id}: {str(e)}")
+        recipe_store = get_recipe_store()
+        if recipe_store:
+            recipe_store.save()
         # Clean up any extra tabs
         if len(driver.window_handles) > 1:
             driver.switch_to.window(driver.window_handles[0])
@@ -4512,9 +4623,14 @@ def process_direct_url(driver, url):
         
         print(f"📋 Job title: {job_title}")
         
+        # Known platforms get their adapter; no recipe is kept for test URLs
+        ats = detect_ats(driver)
+        adapter = get_adapter(ats)
+        print(f"🧭 Application runs on: {ats}")
+        
         # Fill forms and upload CV (no job analysis for direct URL testing)
-        filled_forms = analyze_and_fill_form(driver, form_data, None, job_title)
-        upload_cv(driver)
+        filled_forms = analyze_and_fill_form(driver, form_data, None, job_title, adapter=adapter)
+        upload_cv(driver, adapter)
         
         # Show dry run preview
         dry_run_preview(driver, filled_forms)
@@ -4523,7 +4639,7 @@ def process_direct_url(driver, url):
             print("🧪 DRY RUN COMPLETE: Form filled but not submitted")
         else:
             # Try to submit if not in dry run mode
-            if click_next_or_submit_button(driver):
+            if click_adapter_next_button(driver, adapter):
                 print("✅ Application submitted successfully!")
             else:
                 print("⚠️ Could not find submit button")
@@ -4612,18 +4728,22 @@ def main():
                 "profile.cookie_controls_mode": 1  # 0=Allow all, 1=Block third-party, 2=Block all
             }
         )
-        driver = uc.Chrome(options=options)
+        # Separate profile from the scraper so both can run at once; cookies are shared
+        apply_profile(options, "linkedin-filler")
+        # Application forms keep images; only media and trackers are blocked
+        driver, bandwidth = create_lean_driver(lambda opts: uc.Chrome(options=opts), options, 'apply')
         
         # Check if we're testing a direct URL
         if TEST_MODE and TEST_URL:
             print("🧪 TEST MODE: Using direct URL")
             process_direct_url(driver, TEST_URL)
         else:
-            # Sign in to LinkedIn
-            sign_in(driver)
+            # Sign in to LinkedIn (skipped when the saved session is still valid)
+            ensure_signed_in(driver, LINKEDIN_SESSION, sign_in)
             
             # Process saved jobs
             process_saved_jobs(driver)
+        print(bandwidth.report(driver))
         
     except Exception as e:
         print(f"❌ Critical error: {str(e)}")
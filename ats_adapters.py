@@ -0,0 +1,180 @@
+"""
+Dedicated fill adapters for the applicant tracking systems with known markup.
+
+An adapter knows a platform's own field ids, the buttons of its multi-step
+flow (start application, next/save-and-continue, submit) and the file input
+its resume upload posts through. All of them are looked up in one injected
+script per page, so on a known platform the standard fields are filled from
+their ids and the flow is moved on without the keyword heuristics or the
+multi-locale button XPaths. Fields an adapter does not know (screening
+questions, dropdowns, Workday's custom selects) still go through the generic
+analysis in analyze_and_fill_form, and sites with no adapter keep the generic
+path entirely.
+"""
+import os
+
+from ats_fingerprint import GENERIC_ATS
+
+ATS_ADAPTERS_ENABLED = os.getenv("ATS_ADAPTERS", "1").lower() not in ("0", "false", "no")
+
+# Returns {key: first matching element or null} for {key: [selectors]}; file
+# inputs are usually hidden behind a styled drop zone so they need not be visible
+LOCATE_CONTROLS_JS = """
+const groups = arguments[0];
+function visible(el) {
+    return el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+const found = {};
+for (const [key, selectors] of Object.entries(groups)) {
+    found[key] = null;
+    for (const selector of selectors) {
+        let matches = [];
+        try { matches = Array.from(document.querySelectorAll(selector)); } catch (e) { continue; }
+        const el = matches.find((m) => (m.type === 'file' || visible(m)) && !m.disabled);
+        if (el) { found[key] = el; break; }
+    }
+}
+return found;
+"""
+
+FIELD_PREFIX = "field:"
+
+class ATSAdapter:
+    """Selectors of one platform; subclasses only fill in the class attributes"""
+    name = GENERIC_ATS
+    # field type (as in analyze_and_fill_form's field_mappings) -> CSS selectors of the platform's input
+    field_ids = {}
+    apply_selectors = []
+    next_selectors = []
+    submit_selectors = []
+    upload_selectors = []
+
+    def control_groups(self):
+        groups = {FIELD_PREFIX + field_type: selectors for field_type, selectors in self.field_ids.items()}
+        groups.update({"apply": self.apply_selectors, "next": self.next_selectors,
+                       "submit": self.submit_selectors, "upload": self.upload_selectors})
+        return {key: selectors for key, selectors in groups.items() if selectors}
+
+    def locate_controls(self, driver):
+        """Every known control on the current page in one round trip: {key: element}, missing ones left out"""
+        try:
+            found = driver.execute_script(LOCATE_CONTROLS_JS, self.control_groups())
+        except Exception as e:
+            print(f"⚠️ {self.name} adapter lookup failed: {str(e)}")
+            return {}
+        return {key: element for key, element in (found or {}).items() if element is not None}
+
+    def field_elements(self, controls):
+        """field type -> input element for the platform fields present on the page"""
+        return {key[len(FIELD_PREFIX):]: element for key, element in controls.items() if key.startswith(FIELD_PREFIX)}
+
+    def fill_steps(self, controls, field_mappings):
+        """Fill plan steps for the platform fields present, valued from field_mappings"""
+        steps = []
+        for field_type, element in self.field_elements(controls).items():
+            value = field_mappings.get(field_type, {}).get("value")
+            if value:
+                steps.append({"type": field_type, "action": "text", "value": value, "element": element,
+                              "label": f"{self.name} {field_type}"})
+        return steps
+
+    def navigation(self, controls):
+        """("next", element) mid-flow, ("submit", element) on the last step, or (None, None)"""
+        for kind in ("next", "submit"):
+            if kind in controls:
+                return kind, controls[kind]
+        return None, None
+
+
+class WorkdayAdapter(ATSAdapter):
+    name = "workday"
+    field_ids = {
+        "first_name": ["input[data-automation-id='legalNameSection_firstName']"],
+        "last_name": ["input[data-automation-id='legalNameSection_lastName']"],
+        "email": ["input[data-automation-id='email']"],
+        "phone": ["input[data-automation-id='phone-number']"],
+        "linkedin": ["input[data-automation-id='linkedinQuestion']"],
+        "website": ["input[data-automation-id='website']"],
+    }
+    apply_selectors = ["a[data-automation-id='applyManually']", "button[data-automation-id='applyManually']",
+                       "a[data-automation-id='adventureButton']", "button[data-automation-id='adventureButton']"]
+    # The same footer button reads "Save and Continue" on every step and "Submit" on the review step
+    next_selectors = ["button[data-automation-id='bottom-navigation-next-button']",
+                      "button[data-automation-id='pageFooterNextButton']"]
+    submit_selectors = ["button[data-automation-id='bottom-navigation-submit-button']"]
+    upload_selectors = ["input[data-automation-id='file-upload-input-ref']", "input[type='file']"]
+
+
+class GreenhouseAdapter(ATSAdapter):
+    name = "greenhouse"
+    field_ids = {
+        "first_name": ["input#first_name"],
+        "last_name": ["input#last_name"],
+        "email": ["input#email"],
+        "phone": ["input#phone"],
+        "linkedin": ["input[autocomplete='custom-question-linkedin-profile']", "input[id*='linkedin' i]"],
+        "website": ["input[autocomplete='custom-question-website']", "input[id*='website' i]"],
+    }
+    # Single page: the form sits under the posting, there is no next step
+    apply_selectors = ["a#apply_button", "button.apply-button", "a[href='#app']"]
+    submit_selectors = ["input#submit_app", "button#submit_app", "form#application-form button[type='submit']"]
+    upload_selectors = ["input#resume[type='file']", "input[type='file'][name='resume']",
+                        "#resume_fieldset input[type='file']", "input[type='file']"]
+
+
+class LeverAdapter(ATSAdapter):
+    name = "lever"
+    field_ids = {
+        "name": ["input[name='name']"],
+        "email": ["input[name='email']"],
+        "phone": ["input[name='phone']"],
+        "linkedin": ["input[name='urls[LinkedIn]']"],
+        "website": ["input[name='urls[Portfolio]']", "input[name='urls[Other]']"],
+    }
+    apply_selectors = ["a[data-qa='btn-apply-bottom']", "a.postings-btn[href$='/apply']"]
+    submit_selectors = ["button#btn-submit", "button[data-qa='btn-submit']"]
+    upload_selectors = ["input#resume-upload-input", "input[type='file'][name='resume']"]
+
+
+class SmartRecruitersAdapter(ATSAdapter):
+    name = "smartrecruiters"
+    field_ids = {
+        "first_name": ["input#first-name-input", "input[name='firstName']"],
+        "last_name": ["input#last-name-input", "input[name='lastName']"],
+        "email": ["input#email-input", "input[name='email']"],
+        "phone": ["input#phone-number-input", "input[name='phoneNumber']"],
+        "linkedin": ["input#linkedin-input", "input[name='linkedin']"],
+        "website": ["input#website-input", "input[name='website']"],
+    }
+    apply_selectors = ["a[data-test='footer-apply-button']", "button[data-test='footer-apply-button']",
+                       "a#st-apply"]
+    next_selectors = ["button[data-test='footer-next']", "spl-button[data-test='footer-next']"]
+    submit_selectors = ["button[data-test='footer-submit']", "spl-button[data-test='footer-submit']"]
+    upload_selectors = ["input[type='file'][data-test='resume-upload-input']", "input[type='file']"]
+
+
+class SuccessFactorsAdapter(ATSAdapter):
+    name = "successfactors"
+    field_ids = {
+        "first_name": ["input#fbclc_fName"],
+        "last_name": ["input#fbclc_lName"],
+        "email": ["input#fbclc_email", "input#fbclc_emailConf"],
+        "phone": ["input#fbclc_phone", "input#fbclc_cellPhone"],
+        "country": ["input#fbclc_country"],
+    }
+    apply_selectors = ["a.dialogApplyBtn", "button.dialogApplyBtn", "a[data-careersite-propertyid='apply']"]
+    next_selectors = ["button#fbclc_createAccountButton", "button[id$='_nextButton']"]
+    submit_selectors = ["button#fbclc_submitBtn", "button[id$='_submitButton']"]
+    upload_selectors = ["input[type='file'][id*='resume' i]", "input[type='file'][id*='attachment' i]",
+                        "input[type='file']"]
+
+
+ADAPTERS = {adapter.name: adapter for adapter in (
+    WorkdayAdapter(), GreenhouseAdapter(), LeverAdapter(), SmartRecruitersAdapter(), SuccessFactorsAdapter()
+)}
+
+def get_adapter(ats):
+    """Adapter for ats, or None for generic sites or when ATS_ADAPTERS=0"""
+    if not ATS_ADAPTERS_ENABLED:
+        return None
+    return ADAPTERS.get(ats)
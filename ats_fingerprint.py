@@ -0,0 +1,98 @@
+"""
+Which applicant tracking system (ATS) an external application page runs on.
+
+The ATS name and the site's domain key the per-site recipes in ats_recipes and
+picks the adapter in ats_adapters. detect_ats() gathers everything it needs in
+one injected probe: the URL, which of each platform's DOM markers are present
+and the sources of the page's scripts and iframes, so platforms embedded on a
+company's own careers domain are recognised too. Everything else is "generic".
+"""
+from urllib.parse import urlparse
+
+GENERIC_ATS = "generic"
+
+# Host (or path) fragments each platform serves its application pages from
+ATS_URL_MARKERS = {
+    "workday": ["myworkdayjobs.com", "myworkday.com", "workdayjobs.com"],
+    "greenhouse": ["greenhouse.io", "boards.greenhouse"],
+    "lever": ["lever.co"],
+    "smartrecruiters": ["smartrecruiters.com"],
+    "successfactors": ["successfactors.com", "successfactors.eu", "sapsf.com", "sapsf.eu", "jobs.sap.com"],
+}
+
+# Elements only each platform's application pages carry
+ATS_DOM_MARKERS = {
+    "workday": ["[data-automation-id='jobPostingPage']", "[data-automation-id='applyFlowPage']",
+                "[data-automation-id^='legalNameSection']", "div[data-automation-id='wd-Popup']"],
+    "greenhouse": ["#grnhse_app", "#application_form", "form#application-form", "div#app_body"],
+    "lever": ["div.posting-page", "form#application-form[action*='lever']", "[data-qa='btn-apply-bottom']",
+              ".postings-btn-wrapper"],
+    "smartrecruiters": ["oc-oneclick-form", "spl-button[data-test]", "[data-test='footer-apply-button']"],
+    "successfactors": ["#fbclc_fName", "[id^='fbclc_']", "div.rcmFormSection", "#careerSiteHeader"],
+}
+
+# Hosts an embedded platform loads its scripts or iframes from
+ATS_SCRIPT_MARKERS = {
+    "workday": ["wd5.myworkday", "myworkdaycdn.com", "workday.com/wday"],
+    "greenhouse": ["boards.greenhouse.io/embed", "greenhouse.io/embed", "job-boards.greenhouse.io"],
+    "lever": ["jobs.lever.co", "lever.co/embed"],
+    "smartrecruiters": ["smartrecruiters.com", "smrtr.io"],
+    "successfactors": ["successfactors.com", "successfactors.eu", "sapsf.com", "rmkcdn.successfactors"],
+}
+
+# Returns {url, markers: {ats: [matched selectors]}, sources: [script and iframe srcs]}
+ATS_PROBE_JS = """
+const domMarkers = arguments[0];
+const markers = {};
+for (const [ats, selectors] of Object.entries(domMarkers)) {
+    markers[ats] = selectors.filter((selector) => {
+        try { return !!document.querySelector(selector); } catch (e) { return false; }
+    });
+}
+const sources = Array.from(document.querySelectorAll('script[src], iframe[src]'))
+    .map((el) => el.src).filter(Boolean).slice(0, 200);
+return {url: location.href, markers: markers, sources: sources};
+"""
+
+def site_domain(url):
+    """Lower-case host of url without a leading www. or port"""
+    host = (urlparse(url or "").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def ats_from_url(url):
+    """ATS name recognised from the URL alone, or GENERIC_ATS"""
+    lowered = (url or "").lower()
+    for ats, markers in ATS_URL_MARKERS.items():
+        if any(marker in lowered for marker in markers):
+            return ats
+    return GENERIC_ATS
+
+def ats_from_probe(probe):
+    """ATS name from an ATS_PROBE_JS result: URL first, then DOM markers, then script sources"""
+    if not isinstance(probe, dict):
+        return GENERIC_ATS
+    ats = ats_from_url(probe.get("url"))
+    if ats != GENERIC_ATS:
+        return ats
+    markers = probe.get("markers") or {}
+    matched = {name: len(markers.get(name) or []) for name in ATS_DOM_MARKERS}
+    best = max(matched, key=matched.get)
+    if matched[best]:
+        return best
+    sources = " ".join(probe.get("sources") or []).lower()
+    for name, fragments in ATS_SCRIPT_MARKERS.items():
+        if any(fragment in sources for fragment in fragments):
+            return name
+    return GENERIC_ATS
+
+def detect_ats(driver):
+    """ATS the current page runs on, from one probe; falls back to the URL if the probe fails"""
+    try:
+        probe = driver.execute_script(ATS_PROBE_JS, ATS_DOM_MARKERS)
+    except Exception as e:
+        print(f"⚠️ ATS probe failed: {str(e)}")
+        try:
+            return ats_from_url(driver.current_url)
+        except Exception:
+            return GENERIC_ATS
+    return ats_from_probe(probe)
@@ -0,0 +1,171 @@
+"""
+Per-site recipes for external applications, keyed by domain and ATS.
+
+A recipe remembers, for each step of an application (cookie banner, extra
+Apply button, newsletter skip, next/submit button per page), the locator that
+worked last time, plus which known field type each form label was filled as.
+Later applications on the same site replay those locators first and only run
+the slow heuristics when a replay misses.
+
+Every step carries success and failure counters. A step is dropped after
+RECIPE_MAX_FAILURES replays in a row that missed while the heuristics found
+nothing either, or when it has not worked for RECIPE_TTL_DAYS; a replay miss
+where the heuristics found a different control replaces the step straight away.
+"""
+import os
+import json
+import time
+import threading
+
+from ats_fingerprint import site_domain, ats_from_url
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ATS_RECIPES_ENABLED = os.getenv("ATS_RECIPES", "1").lower() not in ("0", "false", "no")
+ATS_RECIPES_PATH = os.getenv("ATS_RECIPES_PATH", os.path.join(SCRIPT_DIR, "ats_recipes.json"))
+RECIPE_MAX_FAILURES = int(os.getenv("RECIPE_MAX_FAILURES", "2"))
+RECIPE_TTL_DAYS = float(os.getenv("RECIPE_TTL_DAYS", "30"))
+# How long a replay waits for a recorded control before falling back to the heuristics
+RECIPE_WAIT_SECONDS = float(os.getenv("RECIPE_WAIT_SECONDS", "3"))
+# Label -> field type entries kept per recipe
+RECIPE_MAX_FIELDS = 200
+
+# A locator that finds el again on a later visit: {"by": "css selector" | "xpath", "selector": ...}.
+# Prefers a unique id or data/name attribute, then the element's exact text.
+ELEMENT_LOCATOR_JS = """
+const el = arguments[0];
+if (!el) return null;
+const tag = el.tagName.toLowerCase();
+function unique(selector) {
+    try { return document.querySelectorAll(selector).length === 1; } catch (e) { return false; }
+}
+if (el.id && !/^\\d/.test(el.id)) {
+    const selector = '#' + CSS.escape(el.id);
+    if (unique(selector)) return {by: 'css selector', selector: selector};
+}
+for (const attr of ['data-automation-id', 'data-qa', 'data-testid', 'data-ui', 'name', 'aria-label']) {
+    const value = el.getAttribute(attr);
+    if (!value) continue;
+    const selector = tag + '[' + attr + '="' + value.replace(/"/g, '\\\\"') + '"]';
+    if (unique(selector)) return {by: 'css selector', selector: selector};
+}
+const text = (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim();
+if (text && text.length < 60 && !text.includes("'")) {
+    return {by: 'xpath', selector: '//' + tag + "[normalize-space()='" + text + "']"};
+}
+return null;
+"""
+
+def recipe_key(domain, ats):
+    return f"{ats}:{domain}"
+
+class Recipe:
+    """Recorded steps and field types for one (domain, ATS) pair; changes are kept in the owning store"""
+
+    def __init__(self, store, key, data):
+        self.store = store
+        self.key = key
+        self.data = data
+
+    def _now(self):
+        return self.store.clock()
+
+    def _is_stale(self, step):
+        return (step.get("failures", 0) >= RECIPE_MAX_FAILURES or
+                self._now() - step.get("last_success", 0) > RECIPE_TTL_DAYS * 86400)
+
+    def locator(self, step_name):
+        """Locator recorded for step_name, or None if there is none or it went stale"""
+        with self.store.lock:
+            step = self.data["steps"].get(step_name)
+            if step and self._is_stale(step):
+                del self.data["steps"][step_name]
+                self.store.dirty = True
+                return None
+            return step and {"by": step["by"], "selector": step["selector"]}
+
+    def record_success(self, step_name, locator):
+        """locator worked for step_name; a different locator than the recorded one replaces it"""
+        with self.store.lock:
+            step = self.data["steps"].get(step_name)
+            if not step or (step["by"], step["selector"]) != (locator["by"], locator["selector"]):
+                step = self.data["steps"][step_name] = {"by": locator["by"], "selector": locator["selector"], "successes": 0}
+            step["successes"] = step.get("successes", 0) + 1
+            step["failures"] = 0
+            step["last_success"] = self._now()
+            self.data["updated"] = self._now()
+            self.store.dirty = True
+
+    def record_failure(self, step_name):
+        """Neither the recorded locator nor the heuristics worked for step_name"""
+        with self.store.lock:
+            step = self.data["steps"].get(step_name)
+            if step:
+                step["failures"] = step.get("failures", 0) + 1
+                self.store.dirty = True
+
+    def field_type(self, label):
+        return self.data["fields"].get(label)
+
+    def record_fields(self, field_types):
+        """Remember label -> field type for the fields filled on a page"""
+        if not field_types:
+            return
+        with self.store.lock:
+            fields = self.data["fields"]
+            fields.update(field_types)
+            for label in list(fields)[:max(0, len(fields) - RECIPE_MAX_FIELDS)]:
+                del fields[label]
+            self.store.dirty = True
+
+    def step_count(self):
+        return len(self.data["steps"])
+
+class RecipeStore:
+    """ats_recipes.json: every site's recipe, loaded once and written back with save()"""
+
+    def __init__(self, path=ATS_RECIPES_PATH, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.recipes = json.load(f)
+        except FileNotFoundError:
+            self.recipes = {}
+        except (json.JSONDecodeError, ValueError):
+            print(f"⚠️ {os.path.basename(path)} is unreadable; starting with no recipes")
+            self.recipes = {}
+
+    def recipe(self, domain, ats):
+        key = recipe_key(domain, ats)
+        with self.lock:
+            data = self.recipes.setdefault(key, {"steps": {}, "fields": {}, "created": self.clock()})
+            data.setdefault("steps", {})
+            data.setdefault("fields", {})
+        return Recipe(self, key, data)
+
+    def recipe_for_url(self, url, ats=None):
+        """Recipe for the site at url; ats defaults to what the URL reveals"""
+        return self.recipe(site_domain(url), ats or ats_from_url(url))
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.recipes, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+_recipe_store = None
+
+def get_recipe_store():
+    """Process-wide RecipeStore, or None when ATS_RECIPES=0"""
+    global _recipe_store
+    if not ATS_RECIPES_ENABLED:
+        return None
+    if _recipe_store is None:
+        _recipe_store = RecipeStore()
+    return _recipe_store
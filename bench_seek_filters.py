@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: the original inline Seek hard filters vs the compiled JobFilter.
+
+Runs both over the same synthetic pages of job descriptions, checks that they
+reject the same jobs, and prints the time per page.
+
+    python bench_seek_filters.py [pages] [jobs_per_page]
+"""
+import re
+import sys
+import random
+import timeit
+import datetime
+from dateutil.relativedelta import relativedelta
+
+from seek_filters import JobFilter
+
+TODAY = datetime.date(2025, 6, 1)
+
+FILLER = ("We are looking for a data professional to join our analytics team. You will build dashboards, "
+          "write SQL and Python, and work with stakeholders across the business. ")
+EXTRAS = ["Start date 14th of July.", "Contract ends 3 March.", "Initial 12 month contract.",
+          "Applicants must be an Australian Citizen.", "Start 2 Sep, 6 month contract.", "Hybrid, 3 days in office."]
+
+def legacy_is_date_within_six_months(date_str):
+    today = TODAY
+    six_months_from_now = today + relativedelta(months=6)
+    months = ['january', 'february', 'march', 'april', 'may', 'june',
+              'july', 'august', 'september', 'october', 'november', 'december']
+    date_str = date_str.lower()
+    day = int(re.search(r'\d+', date_str).group())
+    month = next((i+1 for i, m in enumerate(months) if m in date_str), None)
+    if month is None:
+        return False
+    year = today.year if (month > today.month or (month == today.month and day >= today.day)) else today.year + 1
+    try:
+        date = datetime.date(year, month, day)
+    except ValueError:
+        return True
+    return date <= six_months_from_now
+
+def legacy_check(job_title, job_description):
+    """The inline checks as they were in get_job_listings; returns the rejecting check or None"""
+    if re.search(r'australian\s+citizen', job_description, re.IGNORECASE):
+        return "citizenship"
+    date_pattern = r'\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+    dates = re.findall(date_pattern, job_description, re.IGNORECASE)
+    if any(not legacy_is_date_within_six_months(date) for date in dates):
+        return "contract_date"
+    skip_phrases = [
+        "9 month ", "9-month", "9month", "9 Month",
+        "12 month", "12-month", "12month", "12 Month",
+        "24 month", "24-month", "24month", "24 Month"
+    ]
+    if any(phrase in job_description or phrase in job_title for phrase in skip_phrases):
+        return "contract_phrase"
+    return None
+
+def make_pages(pages, jobs_per_page, seed=7):
+    rng = random.Random(seed)
+    return [[(f"Data Analyst {rng.randint(1, 999)}",
+              FILLER * rng.randint(10, 30) + " ".join(rng.sample(EXTRAS, rng.randint(0, 3))))
+             for _ in range(jobs_per_page)]
+            for _ in range(pages)]
+
+def main(pages=20, jobs_per_page=22):
+    data = make_pages(pages, jobs_per_page)
+    job_filter = JobFilter(today=TODAY)
+
+    legacy = [legacy_check(title, description) for page in data for title, description in page]
+    compiled = [rule.name if rule else None for page in data for rule in job_filter.check_page(page)]
+    assert legacy == compiled, "compiled rules disagree with the inline checks"
+
+    repeats = 5
+    legacy_time = min(timeit.repeat(
+        lambda: [legacy_check(t, d) for page in data for t, d in page], number=1, repeat=repeats))
+    per_job_time = min(timeit.repeat(
+        lambda: [job_filter.check_detail(t, d) for page in data for t, d in page], number=1, repeat=repeats))
+    page_time = min(timeit.repeat(
+        lambda: [job_filter.check_page(page) for page in data], number=1, repeat=repeats))
+
+    print(f"{pages} pages x {jobs_per_page} jobs, {sum(r is not None for r in legacy)} rejected by both")
+    for label, seconds in (("inline checks", legacy_time), ("compiled, per job", per_job_time),
+                           ("compiled, per page", page_time)):
+        print(f"  {label:<20} {seconds / pages * 1000:8.3f} ms/page  ({legacy_time / seconds:4.1f}x)")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,187 @@
+"""
+Browser session persistence so warm starts skip the sign-in flow.
+
+Each script keeps its own Chrome user-data profile (Chrome refuses to share one
+profile between running instances) and all scripts share a serialized copy of
+the site's cookies and localStorage. ensure_signed_in() probes the session with
+one cheap page load and only runs the real sign_in flow when the probe fails.
+"""
+import os
+import json
+import time
+from page_waits import wait_for_dom_ready
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BROWSER_SESSION_DIR = os.getenv("BROWSER_SESSION_DIR", os.path.join(SCRIPT_DIR, "browser_sessions"))
+USE_CHROME_PROFILE = os.getenv("USE_CHROME_PROFILE", "1").lower() in ("1", "true", "yes")
+SESSION_MAX_AGE_DAYS = float(os.getenv("SESSION_MAX_AGE_DAYS", "14"))
+
+class SessionSpec:
+    """How to restore and probe a signed-in session for one site"""
+
+    def __init__(self, name, origin, probe_url, signed_out_markers, signed_out_selectors=(), auth_cookie=None):
+        self.name = name
+        self.origin = origin
+        self.probe_url = probe_url
+        self.signed_out_markers = signed_out_markers
+        self.signed_out_selectors = list(signed_out_selectors)
+        self.auth_cookie = auth_cookie
+
+LINKEDIN_SESSION = SessionSpec(
+    name="linkedin",
+    origin="https://www.linkedin.com/",
+    probe_url="https://www.linkedin.com/feed/",
+    signed_out_markers=("/login", "/authwall", "/checkpoint", "/uas/", "/signup"),
+    signed_out_selectors=["input#username", "form.login__form"],
+    auth_cookie="li_at"
+)
+
+SEEK_SESSION = SessionSpec(
+    name="seek",
+    origin="https://www.seek.com.au/",
+    probe_url="https://www.seek.com.au/",
+    signed_out_markers=("/oauth/login", "login.seek.com"),
+    signed_out_selectors=['a[data-automation="sign in"]']
+)
+
+# Single round trip: URL, readiness and whether any signed-out marker element is present
+PROBE_JS = """
+const selectors = arguments[0];
+return {
+    url: location.href,
+    signedOutElement: selectors.some(sel => { try { return !!document.querySelector(sel); } catch (e) { return false; } })
+};
+"""
+
+def session_file(spec):
+    return os.path.join(BROWSER_SESSION_DIR, f"{spec.name}_session.json")
+
+def apply_profile(options, profile_name):
+    """Point Chrome at a persistent per-script user-data dir (disable with USE_CHROME_PROFILE=0)"""
+    if not USE_CHROME_PROFILE:
+        return None
+    profile_dir = os.path.join(BROWSER_SESSION_DIR, f"{profile_name}-profile")
+    os.makedirs(profile_dir, exist_ok=True)
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    return profile_dir
+
+def sanitize_cookie(cookie):
+    """Cookie dict from get_cookies() in the shape add_cookie() accepts"""
+    cleaned = {key: cookie[key] for key in ('name', 'value', 'path', 'domain', 'secure', 'httpOnly') if key in cookie}
+    if cookie.get('expiry') is not None:
+        cleaned['expiry'] = int(cookie['expiry'])
+    if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+        cleaned['sameSite'] = cookie['sameSite']
+    return cleaned
+
+def save_session(driver, spec):
+    """Serialize the current cookies and localStorage for spec.origin (owner-readable only)"""
+    try:
+        state = {
+            'saved_at': time.time(),
+            'origin': spec.origin,
+            'cookies': [sanitize_cookie(cookie) for cookie in driver.get_cookies()],
+            'local_storage': driver.execute_script(
+                "const out = {}; for (let i = 0; i < localStorage.length; i++) {"
+                " const k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out;"
+            ) or {}
+        }
+        os.makedirs(BROWSER_SESSION_DIR, exist_ok=True)
+        path = session_file(spec)
+        # Written beside the real file and swapped in, so a crash or another script saving
+        # at the same time never leaves a truncated session; created owner-only from the start
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"🍪 Saved {spec.name} session ({len(state['cookies'])} cookies)")
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not save {spec.name} session: {str(e)}")
+        return False
+
+def load_session_state(spec, max_age_days=SESSION_MAX_AGE_DAYS):
+    """Saved session state, or None if missing, unreadable or too old"""
+    path = session_file(spec)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if time.time() - state.get('saved_at', 0) > max_age_days * 86400:
+        print(f"⚠️ Saved {spec.name} session is older than {max_age_days:g} days, ignoring it")
+        return None
+    now = time.time()
+    state['cookies'] = [c for c in state.get('cookies', []) if c.get('expiry') is None or c['expiry'] > now]
+    if spec.auth_cookie and not any(c.get('name') == spec.auth_cookie for c in state['cookies']):
+        return None
+    return state
+
+def restore_session(driver, spec):
+    """Load saved cookies/localStorage into the browser; True if anything was restored"""
+    state = load_session_state(spec)
+    if not state:
+        return False
+    driver.get(spec.origin)  # Cookies can only be set for the current domain
+    restored = 0
+    for cookie in state['cookies']:
+        try:
+            driver.add_cookie(cookie)
+            restored += 1
+        except Exception:
+            pass  # Cookies for other subdomains are rejected; the rest still apply
+    if state.get('local_storage'):
+        driver.execute_script(
+            "for (const [k, v] of Object.entries(arguments[0])) { try { localStorage.setItem(k, v); } catch (e) {} }",
+            state['local_storage']
+        )
+    print(f"🍪 Restored {restored} cookies for {spec.name}")
+    return restored > 0
+
+def is_session_valid(driver, spec):
+    """Cheap probe: one page load, then check the URL and signed-out markers in one script call"""
+    try:
+        driver.get(spec.probe_url)
+        wait_for_dom_ready(driver)
+        probe = driver.execute_script(PROBE_JS, spec.signed_out_selectors) or {}
+    except Exception as e:
+        print(f"⚠️ Session probe failed for {spec.name}: {str(e)}")
+        return False
+    url = probe.get('url') or driver.current_url
+    if any(marker in url for marker in spec.signed_out_markers):
+        return False
+    if probe.get('signedOutElement'):
+        return False
+    if spec.auth_cookie and not driver.get_cookie(spec.auth_cookie):
+        return False
+    return True
+
+def ensure_signed_in(driver, spec, sign_in):
+    """Reuse the profile session, then saved cookies; run sign_in(driver) only if both fail.
+
+    Returns how the session was obtained: 'profile', 'cookies' or 'sign_in'. Raises if
+    sign_in returns without leaving a valid session (e.g. stuck on a checkpoint or
+    captcha); the signed-out cookies are then not saved.
+    """
+    started = time.time()
+    if is_session_valid(driver, spec):
+        method = 'profile'
+    elif restore_session(driver, spec) and is_session_valid(driver, spec):
+        method = 'cookies'
+    else:
+        print(f"🔐 No reusable {spec.name} session, running full sign-in")
+        sign_in(driver)
+        if not is_session_valid(driver, spec):
+            print(f"❌ {spec.name} sign-in finished without a valid session; not saving it")
+            raise Exception(f"{spec.name} sign-in did not produce a valid session")
+        method = 'sign_in'
+    save_session(driver, spec)
+    print(f"✅ {spec.name} session ready via {method} in {time.time() - started:.1f}s")
+    return method
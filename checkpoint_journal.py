@@ -0,0 +1,175 @@
+"""
+Append-only checkpoint journal for resumable scraping runs.
+
+Each finished unit of work (a job, a results page, an exhausted listing such
+as a Seek city or a LinkedIn collection) is one JSON line appended to
+`<base>.jsonl`, so recording progress costs the same no matter how many jobs a
+run has already seen. Every JOURNAL_SNAPSHOT_EVERY
+entries the replayed state is written to a compact `<base>.snapshot.json` and
+the journal starts over, which keeps resume time bounded. Resuming loads the
+snapshot and replays the journal on top; a torn last line left by a crash is
+ignored. Analyses are written to the journal lines only; the snapshot keeps the
+job statuses, and the analyses themselves live in the job store.
+
+A job entry can also carry the job record itself (e.g. a job that is queued or
+scored but not yet saved). Such jobs stay in the state as pending, with their
+latest record, until an entry without a record settles them; a restarted run
+picks them up from there instead of scraping or scoring them again.
+"""
+import os
+import json
+import threading
+
+JOURNAL_SNAPSHOT_EVERY = int(os.getenv("JOURNAL_SNAPSHOT_EVERY", "500"))
+
+def journal_paths(base_path):
+    return f"{base_path}.jsonl", f"{base_path}.snapshot.json"
+
+def empty_state():
+    return {"jobs": {}, "pending": {}, "pages": {}, "exhausted": set()}
+
+def apply_entry(state, entry):
+    """Fold one journal entry into state; entries are idempotent, so replaying twice is safe"""
+    op = entry.get("op")
+    if op == "job":
+        job_id = str(entry["job_id"])
+        state["jobs"][job_id] = entry.get("status")
+        if entry.get("job") is not None:
+            state["pending"][job_id] = entry["job"]
+        else:
+            state["pending"].pop(job_id, None)
+    elif op == "page":
+        state["pages"].setdefault(entry["url"], set()).add(int(entry["page"]))
+    elif op == "exhausted":
+        state["exhausted"].add(entry["url"])
+
+def merge_states(states):
+    """Union of several journal states (e.g. one per worker process)"""
+    merged = empty_state()
+    for state in states:
+        merged["jobs"].update(state["jobs"])
+        merged["pending"].update(state["pending"])
+        for listing_url, pages in state["pages"].items():
+            merged["pages"].setdefault(listing_url, set()).update(pages)
+        merged["exhausted"].update(state["exhausted"])
+    return merged
+
+def load_state(base_path):
+    """State recorded under base_path: the snapshot plus every intact journal line after it"""
+    journal_path, snapshot_path = journal_paths(base_path)
+    state = empty_state()
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        state["jobs"] = dict(snapshot.get("jobs", {}))
+        state["pending"] = dict(snapshot.get("pending", {}))
+        state["pages"] = {listing_url: set(pages) for listing_url, pages in snapshot.get("pages", {}).items()}
+        state["exhausted"] = set(snapshot.get("exhausted", []))
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    apply_entry(state, json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    continue  # Torn write from a crash
+    except FileNotFoundError:
+        pass
+    return state
+
+def remove_journal(base_path):
+    for path in journal_paths(base_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+class CheckpointJournal:
+    """Resumable record of finished jobs, pages and listings for one scraper process.
+
+    With resume=False any earlier journal under base_path is discarded.
+    """
+
+    def __init__(self, base_path, resume=True, snapshot_every=JOURNAL_SNAPSHOT_EVERY):
+        self.base_path = base_path
+        self.journal_path, self.snapshot_path = journal_paths(base_path)
+        self.snapshot_every = snapshot_every
+        self.lock = threading.Lock()
+        if resume:
+            self.state = load_state(base_path)
+        else:
+            remove_journal(base_path)
+            self.state = empty_state()
+        self.entries_since_snapshot = 0
+        self.file = open(self.journal_path, "a", encoding="utf-8")
+
+    def _append(self, entry):
+        with self.lock:
+            apply_entry(self.state, entry)
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            self.entries_since_snapshot += 1
+            if self.entries_since_snapshot >= self.snapshot_every:
+                self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {
+            "jobs": self.state["jobs"],
+            "pending": self.state["pending"],
+            "pages": {listing_url: sorted(pages) for listing_url, pages in self.state["pages"].items()},
+            "exhausted": sorted(self.state["exhausted"])
+        }
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.snapshot_path)
+        # Everything in the journal is now in the snapshot; a crash before the
+        # truncate only means those entries are replayed twice
+        self.file.close()
+        self.file = open(self.journal_path, "w", encoding="utf-8")
+        self.entries_since_snapshot = 0
+
+    def record_job(self, job_id, status, analysis=None, job=None):
+        entry = {"op": "job", "job_id": str(job_id), "status": status}
+        if analysis is not None:
+            entry["analysis"] = analysis
+        if job is not None:
+            entry["job"] = job
+        self._append(entry)
+
+    def record_page(self, listing_url, page_number):
+        self._append({"op": "page", "url": listing_url, "page": page_number})
+
+    def record_exhausted(self, listing_url):
+        self._append({"op": "exhausted", "url": listing_url})
+
+    def merge(self, state):
+        """Also treat another journal's finished work as done (in memory only)"""
+        with self.lock:
+            self.state = merge_states([self.state, state])
+
+    def is_done(self, job_id):
+        """True once any entry was recorded for job_id, including pending ones"""
+        return str(job_id) in self.state["jobs"]
+
+    def pending(self):
+        """(job_id, status, job record) for jobs recorded with a record and not settled since"""
+        return [(job_id, self.state["jobs"].get(job_id), job) for job_id, job in self.state["pending"].items()]
+
+    def is_page_done(self, listing_url, page_number):
+        return page_number in self.state["pages"].get(listing_url, ())
+
+    def is_exhausted(self, listing_url):
+        return listing_url in self.state["exhausted"]
+
+    def next_page(self, listing_url):
+        """First page after the last one finished for listing_url"""
+        return max(self.state["pages"].get(listing_url, {0})) + 1
+
+    def count(self, status=None):
+        return sum(1 for job_status in self.state["jobs"].values() if status is None or job_status == status)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
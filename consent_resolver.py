@@ -0,0 +1,259 @@
+"""
+Cookie-consent resolver: one in-page probe per site instead of a selector-by-selector search.
+
+A single injected script detects the consent-management platform (OneTrust,
+Cookiebot, Didomi, Google Funding Choices, Usercentrics) from its globals and
+banner markup and clicks that platform's own accept or reject control. On sites
+with no known platform the same pass tries the generic consent selectors and
+accept-button texts. Only when nothing matched does it hand back a consent
+iframe, which gets one more pass from inside the frame.
+
+A banner that was clicked is remembered per domain for the rest of the run, so
+that site is never probed again. An empty result is not remembered, because the
+platform's script may simply not have loaded yet. The first visit to a domain
+therefore re-probes for up to CONSENT_WAIT_SECONDS before it trusts "no banner".
+Later calls on that domain probe once without waiting.
+"""
+import os
+import time
+
+from ats_fingerprint import site_domain
+
+# Which control to press on a known platform: "accept" (default) or "reject"
+CONSENT_ACTION = os.getenv("CONSENT_ACTION", "accept").lower()
+# How long the first visit to a site keeps probing for a banner that has not shown yet
+CONSENT_WAIT_SECONDS = float(os.getenv("CONSENT_WAIT_SECONDS", "3"))
+CONSENT_POLL_SECONDS = 0.5
+
+# Per platform: globals and markup that reveal it, and its controls per action
+CONSENT_PLATFORMS = [
+    {
+        "name": "onetrust",
+        "globals": ["OneTrust", "OptanonActiveGroups"],
+        "markers": ["#onetrust-banner-sdk", "#onetrust-consent-sdk"],
+        "controls": {
+            "accept": ["#onetrust-accept-btn-handler", "#accept-recommended-btn-handler"],
+            "reject": ["#onetrust-reject-all-handler", "button.ot-pc-refuse-all-handler"],
+            "close": ["button.save-preference-btn-handler", "button.onetrust-close-btn-handler"],
+        },
+    },
+    {
+        "name": "cookiebot",
+        "globals": ["Cookiebot", "CookieConsentDialog"],
+        "markers": ["#CybotCookiebotDialog"],
+        "controls": {
+            "accept": ["#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll",
+                       "#CybotCookiebotDialogBodyButtonAccept"],
+            "reject": ["#CybotCookiebotDialogBodyButtonDecline"],
+            "close": ["#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowallSelection"],
+        },
+    },
+    {
+        "name": "didomi",
+        "globals": ["Didomi"],
+        "markers": ["#didomi-host", "#didomi-popup"],
+        "controls": {
+            "accept": ["#didomi-notice-agree-button"],
+            "reject": ["#didomi-notice-disagree-button", ".didomi-continue-without-agreeing"],
+            "close": [],
+        },
+    },
+    {
+        "name": "funding_choices",
+        "globals": ["googlefc"],
+        "markers": [".fc-consent-root", ".fc-dialog-container"],
+        "controls": {
+            "accept": ["button.fc-cta-consent", "button.fc-button-consent", "button[aria-label='Consent']",
+                       "button[aria-label='Consentir']"],
+            "reject": ["button.fc-cta-do-not-consent"],
+            "close": ["button.fc-close"],
+        },
+    },
+    {
+        "name": "usercentrics",
+        "globals": ["UC_UI", "usercentrics"],
+        "markers": ["#usercentrics-root", "#usercentrics-cmp-ui"],
+        "controls": {
+            "accept": ["button[data-testid='uc-accept-all-button']", "button#accept"],
+            "reject": ["button[data-testid='uc-deny-all-button']", "button#deny"],
+            "close": ["button[data-testid='uc-save-button']"],
+        },
+    },
+]
+
+# Tried when no known platform is on the page
+GENERIC_CONSENT_SELECTORS = [
+    "button[class*='accept']", "button[id*='accept']", "button[data-qa*='accept']",
+    "button[data-testid*='accept']", "button[data-testid*='consent']",
+    ".consent-accept", ".cookie-accept", ".gdpr-accept", "#consent-accept", "#cookie-accept", "#gdpr-accept",
+]
+
+# Whole button texts (case-insensitive) that accept cookies, in the languages the old selectors covered
+GENERIC_CONSENT_TEXTS = [
+    "accept all", "accept all cookies", "accept cookies", "allow all", "allow all cookies", "agree", "i agree",
+    "consent", "consentir", "aceptar", "aceptar todo", "aceptar todas", "aceptar cookies",
+    "accepter tout", "tout accepter", "akzeptieren", "alle akzeptieren",
+]
+
+CONSENT_FRAME_SELECTOR = "iframe[title*='Cookie'], iframe[id*='cookie'], iframe[title*='Privacy'], iframe[id^='sp_message_iframe']"
+
+# Returns {platform, action, selector, text, tag, shadow, clicked, frame}; platform is
+# null when nothing consent-related was found and frame is then a consent iframe, if any
+RESOLVE_CONSENT_JS = """
+const platforms = arguments[0];
+const actions = arguments[1];
+const genericSelectors = arguments[2];
+const genericTexts = arguments[3];
+const frameSelector = arguments[4];
+
+function visible(el) {
+    return el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden' && !el.disabled;
+}
+function roots() {
+    const list = [document];
+    for (const host of document.querySelectorAll('#usercentrics-root, #usercentrics-cmp-ui')) {
+        if (host.shadowRoot) list.push(host.shadowRoot);
+    }
+    return list;
+}
+function find(selector) {
+    for (const root of roots()) {
+        let matches = [];
+        try { matches = root.querySelectorAll(selector); } catch (e) { continue; }
+        for (const el of matches) if (visible(el)) return [el, root !== document];
+    }
+    return [null, false];
+}
+function hasGlobal(name) {
+    try { return window[name] !== undefined; } catch (e) { return false; }
+}
+function present(selector) {
+    try { return !!document.querySelector(selector); } catch (e) { return false; }
+}
+// A generic match inside an application form (one with fields to type in) is not a consent button
+function inApplicationForm(el) {
+    const form = el.closest('form');
+    return !!form && !!form.querySelector("input[type='text'], input[type='email'], input[type='tel'], textarea");
+}
+function press(platform, action, selector, el, shadow) {
+    const text = (el.innerText || el.value || '').replace(/\\s+/g, ' ').trim().slice(0, 80);
+    el.click();
+    return {platform: platform, action: action, selector: selector, text: text, tag: el.tagName.toLowerCase(),
+            shadow: shadow, clicked: true, frame: null};
+}
+
+const platform = platforms.find((p) => p.globals.some(hasGlobal) || p.markers.some(present));
+if (platform) {
+    for (const action of actions) {
+        for (const selector of platform.controls[action] || []) {
+            const [el, shadow] = find(selector);
+            if (el) return press(platform.name, action, selector, el, shadow);
+        }
+    }
+    return {platform: platform.name, action: null, selector: null, text: '', tag: '', shadow: false,
+            clicked: false, frame: null};
+}
+
+for (const selector of genericSelectors) {
+    const [el, shadow] = find(selector);
+    if (el && !inApplicationForm(el)) return press('generic', 'accept', selector, el, shadow);
+}
+for (const el of document.querySelectorAll("button, [role='button']")) {
+    const text = (el.innerText || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    if (genericTexts.includes(text) && visible(el) && !inApplicationForm(el)) {
+        return press('generic', 'accept', null, el, false);
+    }
+}
+
+const frame = Array.from(document.querySelectorAll(frameSelector)).find(visible) || null;
+return {platform: null, action: null, selector: null, text: '', tag: '', shadow: false, clicked: false, frame: frame};
+"""
+
+def consent_actions(preferred=CONSENT_ACTION):
+    """Order the platform controls are tried in: the preferred choice, then saving/closing, then the other"""
+    other = "accept" if preferred == "reject" else "reject"
+    return [preferred if preferred in ("accept", "reject") else "accept", "close", other]
+
+def consent_locator(result):
+    """Locator for the control a probe clicked, for recipes; None inside frames or shadow roots"""
+    if not result or not result.get("clicked") or result.get("in_frame") or result.get("shadow"):
+        return None
+    if result.get("selector"):
+        return {"by": "css selector", "selector": result["selector"]}
+    text = result.get("text") or ""
+    if text and "'" not in text and result.get("tag"):
+        return {"by": "xpath", "selector": f"//{result['tag']}[normalize-space()='{text}']"}
+    return None
+
+class ConsentResolver:
+    """Resolves each site's consent banner, remembering the sites where a control was clicked"""
+
+    def __init__(self, action=CONSENT_ACTION, wait_seconds=CONSENT_WAIT_SECONDS,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.actions = consent_actions(action)
+        self.wait_seconds = wait_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.results = {}
+        self.probed = set()
+
+    def remembers(self, url):
+        """True if the consent banner of url's site was already clicked this run"""
+        return site_domain(url) in self.results
+
+    def _probe(self, driver):
+        return driver.execute_script(RESOLVE_CONSENT_JS, CONSENT_PLATFORMS, self.actions,
+                                     GENERIC_CONSENT_SELECTORS, GENERIC_CONSENT_TEXTS, CONSENT_FRAME_SELECTOR)
+
+    def _probe_once(self, driver):
+        """One probe of the page, plus one from inside a consent iframe it points at"""
+        result = self._probe(driver)
+        if isinstance(result, dict) and not result.get("platform") and result.get("frame") is not None:
+            driver.switch_to.frame(result["frame"])
+            try:
+                framed = self._probe(driver)
+            finally:
+                driver.switch_to.default_content()
+            if isinstance(framed, dict) and framed.get("clicked"):
+                result = dict(framed, in_frame=True)
+        if isinstance(result, dict):
+            result.pop("frame", None)
+        return result
+
+    def resolve(self, driver):
+        """Probe and click the site's consent control; the probe result, or None if the probe failed.
+
+        A remembered result comes back with remembered=True and nothing is clicked.
+        """
+        try:
+            domain = site_domain(driver.current_url)
+        except Exception:
+            domain = ""
+        if domain in self.results:
+            return dict(self.results[domain], remembered=True)
+        # Only the first visit waits for a banner whose script is still loading
+        deadline = self.clock() + (self.wait_seconds if domain not in self.probed else 0)
+        self.probed.add(domain)
+        while True:
+            try:
+                result = self._probe_once(driver)
+            except Exception as e:
+                print(f"⚠️ Consent probe failed: {str(e)}")
+                return None
+            if not isinstance(result, dict):
+                return None
+            if result.get("clicked"):
+                self.results[domain] = result
+                return result
+            if self.clock() >= deadline:
+                return result
+            self.sleep(CONSENT_POLL_SECONDS)
+
+_consent_resolver = None
+
+def get_consent_resolver():
+    """Process-wide ConsentResolver, so results carry across the run's jobs"""
+    global _consent_resolver
+    if _consent_resolver is None:
+        _consent_resolver = ConsentResolver()
+    return _consent_resolver
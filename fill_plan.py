@@ -0,0 +1,179 @@
+"""
+Batched form filling: every decided value on a page is applied by one injected script.
+
+A fill plan is a list of steps, each a dict with the field's element (the
+handle a form snapshot returned for it), an action and a value:
+
+    text    set the value of an input or textarea
+    select  choose the option of a <select> whose text or value matches
+    check   tick a radio button or checkbox (through its label when it is hidden)
+    click   click a custom control such as a div[role=radio]
+
+Values are set through the native value setter and followed by the input,
+change and blur events that React, Angular and Workday listen for, so the
+framework sees the same thing as typed input. After a short settle delay the
+script reads every field back and returns, per step, whether the value stuck
+and the field's validation state. Steps that did not stick are the ones a page
+rejected programmatic input for; only those are redone with real keystrokes or
+clicks by the caller.
+"""
+import os
+
+FILL_PLAN_ENABLED = os.getenv("FILL_PLAN", "1").lower() not in ("0", "false", "no")
+# Time the page gets to run its validators before the fields are read back
+FILL_PLAN_SETTLE_MS = int(os.getenv("FILL_PLAN_SETTLE_MS", "300"))
+
+# Same error indicators has_validation_errors looks for around a field
+ERROR_SELECTORS = [
+    ".error", ".validation-error", ".field-error", "[role='alert']", ".alert-danger",
+    ".text-danger", ".error-message", "[class*='error']", "[class*='invalid']"
+]
+
+# Asynchronous: the last argument is the callback that returns the results
+APPLY_FILL_PLAN_JS = """
+const steps = arguments[0];
+const elements = arguments[1];
+const settleMs = arguments[2];
+const errorSelector = arguments[3].join(', ');
+const done = arguments[arguments.length - 1];
+
+function visible(el) {
+    return !!el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+
+function setNativeValue(el, value) {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype :
+        el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    const descriptor = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (descriptor && descriptor.set) descriptor.set.call(el, value);
+    else el.value = value;
+}
+
+function fire(el) {
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    if (document.activeElement === el) {
+        el.blur();
+    } else {
+        el.dispatchEvent(new FocusEvent('blur'));
+        el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    }
+}
+
+function findOption(el, value) {
+    const wanted = String(value).trim();
+    return Array.from(el.options).find((o) => (o.text || '').trim() === wanted) ||
+        Array.from(el.options).find((o) => o.value === wanted) || null;
+}
+
+function normalized(value) {
+    return String(value).replace(/[^0-9a-z]/gi, '').toLowerCase();
+}
+
+function apply(step, el) {
+    if (step.action === 'text') {
+        el.focus();
+        setNativeValue(el, step.value);
+        fire(el);
+    } else if (step.action === 'select') {
+        const option = findOption(el, step.value);
+        if (!option) return 'no matching option';
+        el.focus();
+        setNativeValue(el, option.value);
+        fire(el);
+    } else if (step.action === 'check') {
+        if (el.checked) return null;
+        const id = el.getAttribute('id');
+        const label = id ? document.querySelector('label[for="' + CSS.escape(id) + '"]') : el.closest('label');
+        (visible(el) || !visible(label) ? el : label).click();
+        if (!el.checked) el.click();
+    } else if (step.action === 'click') {
+        el.click();
+    } else {
+        return 'unknown action ' + step.action;
+    }
+    return null;
+}
+
+function verify(step, el) {
+    if (step.action === 'text') return el.value === step.value || normalized(el.value) === normalized(step.value);
+    if (step.action === 'select') {
+        const option = findOption(el, step.value);
+        return !!option && el.value === option.value;
+    }
+    if (step.action === 'check') return !!el.checked;
+    const ariaChecked = el.getAttribute('aria-checked');
+    return ariaChecked === null || ariaChecked === 'true';
+}
+
+function errorText(el) {
+    for (let container = el.parentElement, depth = 0; container && depth < 2; container = container.parentElement, depth++) {
+        for (const error of container.querySelectorAll(errorSelector)) {
+            const text = (error.innerText || '').trim();
+            if (text && visible(error)) return text;
+        }
+    }
+    return '';
+}
+
+const problems = steps.map((step, i) => {
+    const el = elements[i];
+    if (!el || !el.isConnected) return 'element is gone';
+    try {
+        return apply(step, el);
+    } catch (e) {
+        return String(e);
+    }
+});
+
+setTimeout(() => {
+    done(steps.map((step, i) => {
+        const el = elements[i];
+        if (problems[i]) return {ok: false, problem: problems[i], value: '', valid: true, error: ''};
+        return {
+            ok: verify(step, el),
+            problem: '',
+            value: el.value !== undefined ? String(el.value) : '',
+            valid: (!el.validity || el.validity.valid) && el.getAttribute('aria-invalid') !== 'true',
+            error: errorText(el)
+        };
+    }));
+}, settleMs);
+"""
+
+def _not_applied(problem):
+    return {"ok": False, "problem": problem, "value": "", "valid": True, "error": ""}
+
+def apply_fill_plan(driver, plan, settle_ms=FILL_PLAN_SETTLE_MS):
+    """Apply every step of plan in one execute_async_script call; one result dict per step.
+
+    Each result has ok (the value stuck), value (what the field holds now),
+    valid (no constraint or aria-invalid failure), error (visible error text
+    next to the field) and problem (why a step could not be applied). With
+    FILL_PLAN=0, or if the script fails, every step comes back not ok so the
+    caller fills them one by one.
+    """
+    if not plan:
+        return []
+    if not FILL_PLAN_ENABLED:
+        return [_not_applied("batched filling is off") for _ in plan]
+    steps = [{"action": step["action"], "value": str(step["value"])} for step in plan]
+    try:
+        results = driver.execute_async_script(
+            APPLY_FILL_PLAN_JS, steps, [step["element"] for step in plan], settle_ms, ERROR_SELECTORS
+        )
+    except Exception as e:
+        print(f"⚠️ Batched form fill failed: {str(e)}")
+        results = None
+    if not isinstance(results, list) or len(results) != len(plan):
+        return [_not_applied("batched fill returned no results") for _ in plan]
+    return results
+
+def has_fill_errors(result):
+    """True if a filled field failed validation or shows an error message"""
+    return not result.get("valid", True) or bool(result.get("error"))
+
+def fill_plan_summary(plan, results):
+    applied = sum(1 for result in results if result.get("ok"))
+    invalid = sum(1 for result in results if result.get("ok") and has_fill_errors(result))
+    return f"{applied}/{len(plan)} steps applied in one batch, {invalid} with validation errors"
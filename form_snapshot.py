@@ -0,0 +1,433 @@
+"""
+One-pass DOM snapshot of an application form.
+
+A single injected script walks every input, select, textarea, custom radio
+and Workday-style widget on the page and returns a JSON model of them: ids,
+names, labels, nearby text, visibility, required/checked flags and select
+options. Each element is tagged with a data-af-handle attribute, a handle that
+stays the same for as long as the element is in the page, and the script
+returns the elements themselves alongside the model, so acting on a field
+later needs no lookup.
+
+The classification below mirrors the per-element helpers in
+application_filler (get_field_context, find_radio_groups,
+get_radio_label_text, extract_question_text_from_radio,
+find_custom_radio_elements) but reads the model instead of making several
+WebDriver calls per field. Two lookups of those helpers are not mirrored
+because they search the whole document instead of the field's surroundings:
+the first matching heading on the page and "label[for*=name]". Both only ran
+after the local lookups found nothing.
+"""
+import os
+import json
+
+FORM_SNAPSHOT_ENABLED = os.getenv("FORM_SNAPSHOT", "1").lower() not in ("0", "false", "no")
+# Also run the per-element collection on each page and report both round-trip counts
+FORM_SNAPSHOT_COMPARE = os.getenv("FORM_SNAPSHOT_COMPARE", "0").lower() in ("1", "true", "yes")
+
+HANDLE_ATTRIBUTE = "data-af-handle"
+
+TEXT_INPUT_TYPES = ("text", "email", "tel", "number", "url")
+
+# Same order as find_custom_radio_elements
+CUSTOM_RADIO_SELECTORS = [
+    "label[for*='question']",
+    "div[class*='radio'][class*='option']",
+    "button[role='radio']",
+    "div[role='radio']",
+    "[class*='radio-button']",
+    "[class*='option-button']",
+]
+
+WORKDAY_SELECTORS = [
+    "[data-automation-id*='searchBox']",
+    "[data-automation-id*='selectinput']",
+    "[data-automation-id*='dropdown']",
+    "[data-automation-id*='combobox']",
+]
+
+QUESTION_KEYWORDS = ["experience", "immigration", "hybrid", "available"]
+PARENT_QUESTION_KEYWORDS = ["experience", "immigration", "hybrid", "available", "salary", "years", "need", "do you"]
+PRIVACY_TERMS = ["privacy", "terms", "data", "policy", "consent", "agree", "controller", "legal"]
+PRIVACY_CHECKBOX_NAMES = ["new_legal_notice", "legal_notice", "privacy_policy"]
+
+# Radio names seen on past forms whose questions cannot be read from the page
+KNOWN_RADIO_QUESTIONS = {
+    "30515459002": "Do you need, or will you need in the future, any immigration-related support or sponsorship from Glovo in order to begin the employment at the work location?",
+    "30515462002": "Glovo's hybrid ways of working mean 3 days in the office, and 2 days WFH, does this match your preferences or requirements?",
+    "30515463002": "Please indicate your English proficiency level",
+    "30515464002": "Please indicate your experience level",
+    "30515465002": "Please indicate your experience level",
+    "30515466002": "Please indicate your experience level",
+    "31264548002": "When would you be available to start?",
+}
+KNOWN_RADIO_LABELS = {
+    "29495816002": "Do you need immigration sponsorship?",
+    "29495819002": "Would you be interested in hybrid/remote work?",
+    "31264560002": "When are you available to start?",
+}
+
+# Returns [model JSON, elements]; elements[i] is the element described by model.fields[i]
+FORM_SNAPSHOT_JS = """
+const handleAttr = arguments[0];
+const customSelectors = arguments[1];
+const workdaySelectors = arguments[2];
+const questionKeywords = arguments[3];
+const PRECEDING_SCAN_LIMIT = 1500;
+
+function text(el) {
+    return el ? (el.innerText || '').trim() : '';
+}
+
+function visible(el) {
+    if (!el.getClientRects().length) return false;
+    const style = getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.visibility === 'collapse' || parseFloat(style.opacity) === 0) return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function ownText(el) {
+    let own = '';
+    for (const node of el.childNodes) {
+        if (node.nodeType === 3) own += node.nodeValue;
+    }
+    return own;
+}
+
+const all = Array.from(document.body ? document.body.getElementsByTagName('*') : []);
+const position = new Map(all.map((el, i) => [el, i]));
+
+// Nearest elements before el in document order (ancestors excluded, as in
+// XPath's preceding axis) that look like question text, nearest first
+function preceding(el) {
+    const found = {questions: [], question_marks: [], question_like: [], custom_question: []};
+    let i = position.has(el) ? position.get(el) - 1 : -1;
+    for (let scanned = 0; i >= 0 && scanned < PRECEDING_SCAN_LIMIT; i--, scanned++) {
+        const candidate = all[i];
+        if (candidate.contains(el)) continue;
+        const own = ownText(candidate);
+        const hasMark = own.includes('?');
+        const lowered = own.toLowerCase();
+        const questionClass = (candidate.getAttribute('class') || '').includes('question');
+        const tag = candidate.tagName.toLowerCase();
+        if ((hasMark || questionKeywords.some((word) => lowered.includes(word))) && found.questions.length < 5) {
+            found.questions.push(text(candidate));
+        }
+        if (hasMark && found.question_marks.length < 3) found.question_marks.push(text(candidate));
+        if ((hasMark || questionClass || tag === 'legend' || tag === 'label') && found.question_like.length < 3) {
+            found.question_like.push(text(candidate));
+        }
+        if ((hasMark || questionClass) && found.custom_question.length < 1) found.custom_question.push(text(candidate));
+        if (found.questions.length >= 5 && found.question_marks.length >= 3 &&
+            found.question_like.length >= 3 && found.custom_question.length >= 1) break;
+    }
+    return found;
+}
+
+let nextHandle = window.__afNextHandle || 1;
+let customCount = 0;
+const fields = [];
+const elements = [];
+const indexOf = new Map();
+
+function describe(el) {
+    if (indexOf.has(el)) return fields[indexOf.get(el)];
+    let handle = el.getAttribute(handleAttr);
+    if (!handle) {
+        handle = String(nextHandle++);
+        el.setAttribute(handleAttr, handle);
+    }
+    const tag = el.tagName.toLowerCase();
+    const id = el.getAttribute('id') || '';
+    const labelFor = id ? document.querySelector('label[for="' + CSS.escape(id) + '"]') : null;
+    const ancestorLabel = el.parentElement ? el.parentElement.closest('label') : null;
+    const fieldset = el.closest('fieldset');
+    const legend = fieldset ? fieldset.querySelector('legend') : null;
+    const groupDiv = el.parentElement ? el.parentElement.closest('div') : null;
+    const labelQuestion = labelFor ? labelFor.closest("[class*='question'], [class*='field']") : null;
+    const field = {
+        handle: handle,
+        tag: tag,
+        type: (el.getAttribute('type') || '').toLowerCase(),
+        role: el.getAttribute('role') || '',
+        id: id,
+        name: el.getAttribute('name') || '',
+        placeholder: el.getAttribute('placeholder') || '',
+        value: el.value !== undefined ? String(el.value) : (el.getAttribute('value') || ''),
+        data_value: el.getAttribute('data-value') || '',
+        class: el.getAttribute('class') || '',
+        for: el.getAttribute('for') || '',
+        data_question: el.getAttribute('data-question') || '',
+        automation_id: el.getAttribute('data-automation-id') || '',
+        visible: visible(el),
+        enabled: !el.disabled,
+        required: !!el.required || el.getAttribute('aria-required') === 'true',
+        checked: !!el.checked,
+        aria_invalid: el.getAttribute('aria-invalid') === 'true',
+        text: text(el),
+        label_for: text(labelFor),
+        label_for_visible: labelFor ? visible(labelFor) : false,
+        label_question: text(labelQuestion),
+        ancestor_label: text(ancestorLabel),
+        legend: text(legend),
+        group_name: groupDiv ? (groupDiv.getAttribute('data-field-name') || groupDiv.getAttribute('data-name') || '') : '',
+        parent_text: text(el.parentElement),
+        preceding_text: text(el.previousElementSibling),
+        following_text: text(el.nextElementSibling),
+        options: tag === 'select' ? Array.from(el.options).map((o) => ({text: (o.text || '').trim(), value: o.value})) : [],
+        custom_radio: false,
+        workday: false,
+        preceding: null
+    };
+    indexOf.set(el, fields.length);
+    fields.push(field);
+    elements.push(el);
+    return field;
+}
+
+for (const el of document.querySelectorAll('input, select, textarea')) {
+    const field = describe(el);
+    if (field.type === 'radio') field.preceding = preceding(el);
+}
+for (const selector of customSelectors) {
+    for (const el of document.querySelectorAll(selector)) {
+        const field = describe(el);
+        if (!field.custom_radio) {
+            field.custom_radio = true;
+            field.custom_order = ++customCount;
+            field.preceding = field.preceding || preceding(el);
+        }
+    }
+}
+for (const selector of workdaySelectors) {
+    for (const el of document.querySelectorAll(selector)) describe(el).workday = true;
+}
+window.__afNextHandle = nextHandle;
+
+return [JSON.stringify({url: location.href, title: document.title, fields: fields}), elements];
+"""
+
+def handle_selector(handle):
+    """CSS selector for the element tagged with handle"""
+    return f"[{HANDLE_ATTRIBUTE}='{handle}']"
+
+def _preceding(field, kind):
+    return (field.get("preceding") or {}).get(kind, [])
+
+def field_context(field):
+    """Same text get_field_context builds: id, name, placeholder, label, short parent text, preceding sibling"""
+    parent_text = field["parent_text"] if len(field["parent_text"]) < 200 else ""
+    return " ".join(filter(None, [field["id"], field["name"], field["placeholder"], field["label_for"],
+                                  parent_text, field["preceding_text"]]))
+
+def radio_group_name(field, group_count):
+    """Group key for a radio, by the strategies of find_radio_groups"""
+    name = field["name"]
+    if not name:
+        radio_id = field["id"]
+        if radio_id:
+            if radio_id.startswith("question_") and "_" in radio_id[9:]:
+                parts = radio_id.split("_")
+                if len(parts) >= 3:
+                    name = f"{parts[0]}_{parts[1]}"
+            else:
+                name = radio_id
+        if not name:
+            name = field["group_name"]
+        if not name:
+            for question_text in _preceding(field, "question_like"):
+                if question_text and len(question_text) < 200 and '?' in question_text:
+                    name = "question_" + str(hash(question_text))[:8]
+                    break
+        if not name and field["label_for"] and field["label_question"] and len(field["label_question"]) < 200:
+            name = "question_" + str(hash(field["label_question"]))[:8]
+        if not name:
+            name = f"radio_group_{group_count}"
+    return name.strip()
+
+def radio_label_text(field):
+    """Option label for a radio, by the lookups of get_radio_label_text"""
+    if len(field["label_for"]) > 3:
+        return field["label_for"]
+    if len(field["ancestor_label"]) > 3:
+        return field["ancestor_label"]
+    for text in _preceding(field, "question_marks"):
+        if text and "?" in text and len(text) < 200:
+            return text
+    if len(field["following_text"]) > 3:
+        return field["following_text"]
+
+    parent_text = field["parent_text"]
+    if parent_text and ("?" in parent_text or any(word in parent_text.lower() for word in
+                                                  ["experience", "years", "immigration", "hybrid", "available", "salary"])):
+        for line in parent_text.split('\n'):
+            if line.strip() and ("?" in line or any(word in line.lower() for word in
+                                                    ["experience", "years", "immigration", "hybrid", "available"])):
+                if len(line.strip()) < 200:
+                    return line.strip()
+        if len(parent_text) < 200:
+            return parent_text
+
+    value, radio_name = field["value"], field["name"]
+    for name_part, label in KNOWN_RADIO_LABELS.items():
+        if name_part in radio_name:
+            return label + (f" (Option {value})" if value else "")
+    return value or f"Radio option for {radio_name}"
+
+def radio_question_text(field):
+    """Question a radio answers, by the lookups of extract_question_text_from_radio, or None"""
+    for text in _preceding(field, "questions"):
+        if text and 10 < len(text) < 300:
+            return text[:-1].strip() if text.endswith('*') else text
+    if 10 < len(field["legend"]) < 300:
+        return field["legend"]
+    if len(field["parent_text"]) > 10:
+        for line in field["parent_text"].split('\n'):
+            line = line.strip()
+            if line and 10 < len(line) < 300:
+                if "?" in line or any(word in line.lower() for word in PARENT_QUESTION_KEYWORDS):
+                    return line
+    for name_part, question in KNOWN_RADIO_QUESTIONS.items():
+        if name_part in field["name"]:
+            return question
+    return None
+
+def custom_radio_group_name(field):
+    """Group key for a custom radio element, by the lookups of get_custom_radio_group_name, or None"""
+    for_attr = field["for"]
+    if for_attr and "question" in for_attr:
+        parts = for_attr.split("_")
+        if len(parts) >= 2:
+            return f"{parts[0]}_{parts[1]}"
+    if field["data_question"]:
+        return field["data_question"]
+    for question_text in _preceding(field, "custom_question"):
+        if question_text and len(question_text) < 150:
+            return f"custom_question_{hash(question_text) % 10000}"
+    return None
+
+def is_privacy_checkbox(name, context):
+    return any(term in context.lower() for term in PRIVACY_TERMS) or name in PRIVACY_CHECKBOX_NAMES
+
+class FormSnapshot:
+    """Model of every form control on a page, plus the element behind each field"""
+
+    def __init__(self, model, elements):
+        self.url = model.get("url", "")
+        self.title = model.get("title", "")
+        self.fields = model.get("fields", [])
+        self.elements = list(elements or [])
+        for field, element in zip(self.fields, self.elements):
+            field["element"] = element
+
+    def _inputs(self):
+        return [field for field in self.fields if field["tag"] in ("input", "select", "textarea")]
+
+    def text_fields(self):
+        return [field for field in self._inputs()
+                if field["tag"] == "textarea" or (field["tag"] == "input" and field["type"] in TEXT_INPUT_TYPES)]
+
+    def selects(self):
+        return [field for field in self._inputs() if field["tag"] == "select"]
+
+    def checkboxes(self):
+        return [field for field in self._inputs() if field["tag"] == "input" and field["type"] == "checkbox"]
+
+    def radios(self):
+        return [field for field in self._inputs() if field["tag"] == "input" and field["type"] == "radio"]
+
+    def radio_groups(self):
+        """Radios grouped as find_radio_groups groups them, in page order"""
+        groups = {}
+        for field in self.radios():
+            name = radio_group_name(field, len(groups))
+            if name:
+                groups.setdefault(name, []).append(field)
+        return groups
+
+    def custom_radio_groups(self):
+        """Visible custom radio elements grouped as find_custom_radio_elements groups them"""
+        radio_names = {field["name"] for field in self.radios() if field["name"]}
+        candidates = sorted((field for field in self.fields if field["custom_radio"]), key=lambda f: f["custom_order"])
+        groups = {}
+        for field in candidates:
+            if not field["visible"]:
+                continue
+            if field["for"] and any(radio_name in field["for"] for radio_name in radio_names):
+                continue
+            group_name = custom_radio_group_name(field)
+            if group_name:
+                group = groups.setdefault(group_name, [])
+                if all(existing["text"] != field["text"] for existing in group):
+                    group.append(field)
+        return {name: group for name, group in groups.items()
+                if not (len(group) == 1 and ("?" in group[0]["text"] or len(group[0]["text"]) > 100))}
+
+    def workday_fields(self):
+        return [field for field in self.fields if field["workday"] and field["visible"]]
+
+def take_form_snapshot(driver):
+    """FormSnapshot of the current page from one execute_script call, or None if the script failed"""
+    try:
+        model_json, elements = driver.execute_script(
+            FORM_SNAPSHOT_JS, HANDLE_ATTRIBUTE, CUSTOM_RADIO_SELECTORS, WORKDAY_SELECTORS, QUESTION_KEYWORDS
+        )
+        return FormSnapshot(json.loads(model_json), elements)
+    except Exception as e:
+        print(f"⚠️ Form snapshot failed: {str(e)}")
+        return None
+
+def collect_form_fields(snapshot):
+    """Fields analyze_and_fill_form works on, classified from a snapshot.
+
+    Same shape as the per-element collection in application_filler:
+    text_fields, radio_questions, custom_radio_questions, dropdowns,
+    checkboxes and workday_fields, each entry carrying its element.
+    """
+    collected = {
+        "text_fields": [{"element": field["element"], "context": field_context(field), "visible": field["visible"]}
+                        for field in snapshot.text_fields()],
+        "radio_questions": [],
+        "custom_radio_questions": [],
+        "dropdowns": [],
+        "checkboxes": [],
+        "workday_fields": [{"element": field["element"], "context": field_context(field)}
+                           for field in snapshot.workday_fields()],
+    }
+
+    for group_name, radios in snapshot.radio_groups().items():
+        options, elements, visible = [], {}, {}
+        for radio in radios:
+            label_text = radio_label_text(radio)
+            options.append(label_text)
+            elements[label_text] = radio["element"]
+            visible[label_text] = radio["visible"]
+        question_text = radio_question_text(radios[0])
+        collected["radio_questions"].append({
+            "question": question_text if question_text else group_name,
+            "options": options, "elements": elements, "visible": visible
+        })
+
+    for group_name, group in snapshot.custom_radio_groups().items():
+        options, elements = [], {}
+        for field in group:
+            if field["text"] and len(field["text"]) < 200:
+                options.append(field["text"])
+                elements[field["text"]] = field["element"]
+        if options:
+            collected["custom_radio_questions"].append({"question": group_name, "options": options, "elements": elements})
+
+    for field in snapshot.selects():
+        if field["visible"]:
+            collected["dropdowns"].append({
+                "element": field["element"], "context": field_context(field),
+                "options": [option["text"] for option in field["options"] if option["text"]]
+            })
+
+    for field in snapshot.checkboxes():
+        collected["checkboxes"].append({
+            "element": field["element"], "context": field_context(field), "name": field["name"], "id": field["id"],
+            "checked": field["checked"], "visible": field["visible"]
+        })
+    return collected
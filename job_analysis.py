@@ -0,0 +1,278 @@
+"""
+Structured relevance analysis: the JSON schema requested from Gemini and the
+typed, validated result object built from its reply.
+
+JobAnalysis.to_dict() returns the same dict shape the markdown parser produced,
+so stored analyses and callers (should_apply, total_score, ...) are unchanged.
+analyze_in_batches scores several jobs per request and falls back to one job per
+request only for entries that did not come back valid.
+"""
+import re
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+
+from llm_scoring import call_with_backoff, is_transient_error
+
+SCORE_FIELDS = ['skills_match', 'role_alignment', 'remote_work', 'innovation', 'compensation_proxy', 'final_score']
+
+# Gemini response_schema (OpenAPI subset) for analyze_job_relevance
+RELEVANCE_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'meaningfulness_score': {'type': 'NUMBER'},
+        'meaningfulness_justification': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'skills_match': {'type': 'NUMBER'},
+        'role_alignment': {'type': 'NUMBER'},
+        'remote_work': {'type': 'NUMBER'},
+        'innovation': {'type': 'NUMBER'},
+        'compensation_proxy': {'type': 'NUMBER'},
+        'final_score': {'type': 'NUMBER'},
+        'salary_estimation': {'type': 'STRING'},
+        'should_apply': {'type': 'BOOLEAN'},
+        'recommendation': {'type': 'STRING'},
+        'key_points': {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+    },
+    'required': ['meaningfulness_score', 'final_score', 'should_apply', 'recommendation'] + SCORE_FIELDS[:-1]
+}
+
+# Batch mode: a JSON array with one entry per job, matched back to its job by job_ref
+BATCH_RESPONSE_SCHEMA = {
+    'type': 'ARRAY',
+    'items': {
+        'type': 'OBJECT',
+        'properties': dict(RELEVANCE_RESPONSE_SCHEMA['properties'], job_ref={'type': 'INTEGER'}),
+        'required': ['job_ref'] + RELEVANCE_RESPONSE_SCHEMA['required']
+    }
+}
+
+CONTEXT_LIMIT_MARKERS = (
+    "context length", "context window", "too long", "maximum number of tokens",
+    "input token count", "exceeds the maximum", "max_tokens"
+)
+
+class AnalysisValidationError(ValueError):
+    """Raised when a structured reply does not match the relevance schema"""
+
+class ContextLimitError(Exception):
+    """Raised by a batch request that would not fit (or did not fit) the model's token limits"""
+
+def _score(data, key):
+    value = data.get(key)
+    if isinstance(value, bool) or value is None:
+        raise AnalysisValidationError(f"'{key}' missing or not a number")
+    if isinstance(value, str):
+        match = re.match(r'\s*(\d+(?:\.\d+)?)', value)  # Tolerate "7/10"
+        if not match:
+            raise AnalysisValidationError(f"'{key}' is not a number: {value!r}")
+        value = match.group(1)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise AnalysisValidationError(f"'{key}' is not a number: {value!r}")
+    return max(0.0, min(10.0, value))
+
+def _string_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [line.strip('- *').strip() for line in value.split('\n') if line.strip()]
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    raise AnalysisValidationError(f"expected a list of strings, got {type(value).__name__}")
+
+@dataclass
+class JobAnalysis:
+    """Validated relevance analysis for one job"""
+    meaningfulness_score: float
+    skills_match: float
+    role_alignment: float
+    remote_work: float
+    innovation: float
+    compensation_proxy: float
+    final_score: float
+    should_apply: bool
+    recommendation: str
+    meaningfulness_justification: list = field(default_factory=list)
+    key_points: list = field(default_factory=list)
+    salary_estimation: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise AnalysisValidationError(f"expected a JSON object, got {type(data).__name__}")
+        should_apply = data.get('should_apply')
+        if isinstance(should_apply, str) and should_apply.strip().upper() in ('YES', 'NO', 'TRUE', 'FALSE'):
+            should_apply = should_apply.strip().upper() in ('YES', 'TRUE')
+        if not isinstance(should_apply, bool):
+            raise AnalysisValidationError("'should_apply' missing or not a boolean")
+        return cls(
+            meaningfulness_score=_score(data, 'meaningfulness_score'),
+            skills_match=_score(data, 'skills_match'),
+            role_alignment=_score(data, 'role_alignment'),
+            remote_work=_score(data, 'remote_work'),
+            innovation=_score(data, 'innovation'),
+            compensation_proxy=_score(data, 'compensation_proxy'),
+            final_score=_score(data, 'final_score'),
+            should_apply=should_apply,
+            recommendation=str(data.get('recommendation') or '').strip(),
+            meaningfulness_justification=_string_list(data.get('meaningfulness_justification')),
+            key_points=_string_list(data.get('key_points')),
+            salary_estimation=str(data.get('salary_estimation') or '').strip()
+        )
+
+    @property
+    def rank_key(self):
+        """Sort key for ranking a batch of analysed jobs, best first when reverse=True"""
+        return (self.should_apply, self.final_score, self.meaningfulness_score)
+
+    def to_dict(self):
+        """Legacy analysis dict, as produced by the markdown parser"""
+        scores = {name: getattr(self, name) for name in SCORE_FIELDS}
+        scores['meaningfulness_score'] = self.meaningfulness_score
+        return {
+            'scores': scores,
+            'meaningfulness_score': self.meaningfulness_score,
+            'meaningfulness_justification': "\n".join(self.meaningfulness_justification),
+            'salary_estimation': self.salary_estimation,
+            'should_apply': self.should_apply,
+            'recommendation': self.recommendation,
+            'key_points': self.key_points,
+            'total_score': self.final_score,
+            'structured': True
+        }
+
+def extract_json_payload(text):
+    """Decode the JSON value in a model reply, tolerating ```json fences and leading prose"""
+    cleaned = (text or '').strip()
+    fenced = re.search(r'```(?:json)?\s*(.*?)```', cleaned, re.DOTALL)
+    if fenced:
+        cleaned = fenced.group(1).strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+    start = min([i for i in (cleaned.find('{'), cleaned.find('[')) if i >= 0], default=-1)
+    if start < 0:
+        raise AnalysisValidationError("no JSON object in response")
+    try:
+        value, _ = json.JSONDecoder().raw_decode(cleaned[start:])
+    except json.JSONDecodeError as e:
+        raise AnalysisValidationError(f"invalid JSON: {e}")
+    return value
+
+def parse_structured_analysis(text):
+    """Parse and validate a structured reply into a JobAnalysis (raises AnalysisValidationError)"""
+    return JobAnalysis.from_dict(extract_json_payload(text))
+
+def parse_batch_analyses(text, job_refs):
+    """Map job_ref -> JobAnalysis for every valid entry of a batch reply.
+
+    Entries that are missing, duplicated or fail validation are simply left out so
+    the caller can re-score just those jobs on their own.
+    """
+    payload = extract_json_payload(text)
+    if isinstance(payload, dict):
+        payload = payload.get('jobs', payload.get('results'))
+    if not isinstance(payload, list):
+        raise AnalysisValidationError("batch reply is not a JSON array")
+    wanted = set(job_refs)
+    analyses = {}
+    for entry in payload:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            ref = int(entry.get('job_ref'))
+        except (TypeError, ValueError):
+            continue
+        if ref not in wanted or ref in analyses:
+            continue
+        try:
+            analyses[ref] = JobAnalysis.from_dict(entry)
+        except AnalysisValidationError:
+            continue
+    return analyses
+
+def is_context_limit_error(error):
+    if isinstance(error, ContextLimitError):
+        return True
+    text = str(error).lower()
+    return any(marker in text for marker in CONTEXT_LIMIT_MARKERS)
+
+class BatchScoringStats:
+    """Thread-safe counters for batch scoring, printed in the run report"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batched_jobs = 0
+        self.splits = 0
+        self.single_fallbacks = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self):
+        per_request = (self.batched_jobs / self.requests) if self.requests else 0.0
+        return (f"📦 Batch scoring: {self.batched_jobs} jobs in {self.requests} requests "
+                f"(~{per_request:.1f} jobs/request), {self.splits} splits, "
+                f"{self.single_fallbacks} single-job fallbacks")
+
+def analyze_in_batches(jobs, request_batch, analyze_single, stats=None, on_error=None, limiter=None,
+                       sleep=time.sleep):
+    """Score jobs with one request per batch; returns analysis dicts aligned with `jobs`.
+
+    request_batch(jobs) returns the raw reply for a batch prompt whose jobs are numbered
+    1..N (job_ref). A ContextLimitError (or a provider error that looks like one) splits
+    the batch in half and retries each half. Rate-limit and transient errors retry the
+    whole batch through call_with_backoff (under limiter, if given). If they persist, the
+    batch's jobs get on_error(job, error), or the error is raised when on_error is None.
+    Scoring one by one would only send more requests into the same limit. Jobs whose
+    entry is missing or invalid, and batches whose reply cannot be parsed at all, fall
+    back to analyze_single(job).
+    """
+    stats = stats or BatchScoringStats()
+    if not jobs:
+        return []
+    if len(jobs) == 1:
+        stats.add(single_fallbacks=1)
+        return [analyze_single(jobs[0])]
+
+    try:
+        text = call_with_backoff(lambda: request_batch(jobs), limiter, sleep=sleep,
+                                 retry_on=lambda e: is_transient_error(e) and not is_context_limit_error(e))
+    except Exception as e:
+        if is_context_limit_error(e):
+            middle = len(jobs) // 2
+            print(f"✂️ Batch of {len(jobs)} jobs exceeds the token limit, splitting into {middle} + {len(jobs) - middle}")
+            stats.add(splits=1)
+            return (analyze_in_batches(jobs[:middle], request_batch, analyze_single, stats, on_error, limiter, sleep) +
+                    analyze_in_batches(jobs[middle:], request_batch, analyze_single, stats, on_error, limiter, sleep))
+        if isinstance(e, AnalysisValidationError):
+            print(f"⚠️ Batch reply unusable ({str(e)}), scoring {len(jobs)} jobs one by one")
+            stats.add(single_fallbacks=len(jobs))
+            return [analyze_single(job) for job in jobs]
+        print(f"❌ Batch request of {len(jobs)} jobs failed ({str(e)})")
+        if on_error is None:
+            raise
+        return [on_error(job, e) for job in jobs]
+
+    stats.add(requests=1)
+    try:
+        analyses = parse_batch_analyses(text, range(1, len(jobs) + 1))
+    except AnalysisValidationError as e:
+        print(f"⚠️ Batch reply unparseable ({str(e)}), scoring {len(jobs)} jobs one by one")
+        analyses = {}
+
+    results = []
+    for ref, job in enumerate(jobs, start=1):
+        if ref in analyses:
+            stats.add(batched_jobs=1)
+            results.append(analyses[ref].to_dict())
+        else:
+            stats.add(single_fallbacks=1)
+            results.append(analyze_single(job))
+    return results
@@ -0,0 +1,113 @@
+"""
+Staged producer/consumer pipeline with bounded queues.
+
+The browser thread produces scraped jobs with put(); each Stage runs its own
+worker threads and hands results to the next stage through a bounded queue, so
+a slow stage applies backpressure instead of letting work pile up in memory.
+A pass then takes roughly as long as its slowest stage, not the sum of all stages.
+"""
+import time
+import queue
+import threading
+import traceback
+
+_STOP = object()
+
+class Stage:
+    """One pipeline step: fn(item) returns the item for the next stage, or None to drop it"""
+
+    def __init__(self, name, fn, workers=1, queue_size=10):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._alive = workers
+        self._lock = threading.Lock()
+
+class JobPipeline:
+    """Runs a chain of Stages on background threads; results of the last stage are collected"""
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.results = []
+        self._results_lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+        self.started_at = time.time()
+        for index, stage in enumerate(stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._run_worker, args=(index,),
+                    name=f"{stage.name}-{worker + 1}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def put(self, item):
+        """Feed an item into the first stage; blocks while that stage's queue is full"""
+        if self._closed:
+            raise RuntimeError("Pipeline already closed")
+        self.stages[0].queue.put(item)
+
+    def _run_worker(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                break
+            started = time.time()
+            try:
+                result = stage.fn(item)
+            except Exception as e:
+                result = None
+                with stage._lock:
+                    stage.errors += 1
+                print(f"❌ Pipeline stage '{stage.name}' failed: {str(e)}")
+                traceback.print_exc()
+            with stage._lock:
+                stage.busy_seconds += time.time() - started
+                stage.processed += 1
+                if result is None:
+                    stage.dropped += 1
+            if result is None:
+                continue
+            if next_stage:
+                next_stage.queue.put(result)  # Blocks when the next stage is saturated
+            else:
+                with self._results_lock:
+                    self.results.append(result)
+
+        # The last worker of a stage to stop propagates shutdown to the next stage
+        with stage._lock:
+            stage._alive -= 1
+            last_worker = stage._alive == 0
+        if last_worker and next_stage:
+            for _ in range(next_stage.workers):
+                next_stage.queue.put(_STOP)
+
+    def close(self):
+        """Signal end of input and wait for every stage to drain; returns the collected results"""
+        if not self._closed:
+            self._closed = True
+            for _ in range(self.stages[0].workers):
+                self.stages[0].queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        return self.results
+
+    def report(self):
+        """Per-stage counters and busy time, to spot the bottleneck stage"""
+        elapsed = time.time() - self.started_at
+        lines = [f"⏱️ Pipeline wall time: {elapsed:.1f}s"]
+        for stage in self.stages:
+            per_worker = stage.busy_seconds / max(stage.workers, 1)
+            lines.append(
+                f"   {stage.name}: {stage.processed} items, {stage.dropped} dropped, {stage.errors} errors, "
+                f"{stage.busy_seconds:.1f}s busy over {stage.workers} worker(s) (~{per_worker:.1f}s each)"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,379 @@
+"""
+SQLite-backed job store shared by the LinkedIn scraper, the Seek scraper and the application filler.
+
+Replaces the JSON files that were re-read and rewritten on every save: jobs are
+upserted one row at a time by (source, job_id), analysis results live in their
+own table, and "already processed" checks are indexed lookups.
+"""
+import os
+import json
+import sqlite3
+import threading
+import datetime
+
+from seen_index import SEEN_INDEX_ENABLED, open_seen_index
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(SCRIPT_DIR, "jobs.db"))
+
+# Legacy JSON files imported once into the store
+LEGACY_JSON_FILES = [
+    "easy_apply_jobs.json",
+    "external_jobs.json",
+    "scraped_jobs.json",
+    "apply_jobs.json"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    source TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    link TEXT,
+    easy_apply INTEGER,
+    status TEXT,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source, job_id)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_id ON jobs (job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (source, status);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    source TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    model TEXT,
+    should_apply INTEGER,
+    total_score REAL,
+    data TEXT NOT NULL,
+    analyzed_at TEXT NOT NULL,
+    PRIMARY KEY (source, job_id)
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_should_apply ON analyses (source, should_apply);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _now():
+    return datetime.datetime.now().isoformat()
+
+def _job_key(job):
+    job_id = job.get('job_id') or job.get('id')
+    return str(job_id) if job_id else None
+
+def _seen_keys(source, job_id):
+    """Seen-index keys for a job: one per (source, id) and one for the id under any source"""
+    return (f"{source}/{job_id}", f"*/{job_id}")
+
+def is_failed_analysis(analysis):
+    """True for a placeholder analysis of a job the LLM could not score"""
+    return isinstance(analysis, dict) and bool(analysis.get('error'))
+
+def guess_source(job):
+    """Infer the job board from the links stored on a legacy job record"""
+    for key in ('link', 'source_url', 'apply_link', 'url'):
+        if 'seek.com' in (job.get(key) or ''):
+            return 'seek'
+    return 'linkedin'
+
+class JobIdView:
+    """Set-like view over stored job ids; `job_id in view` is an indexed lookup"""
+
+    def __init__(self, store, source=None):
+        self.store = store
+        self.source = source
+
+    def __contains__(self, job_id):
+        return self.store.has_job(job_id, self.source)
+
+    def __len__(self):
+        return self.store.count_jobs(self.source)
+
+class JobStore:
+    """Indexed SQLite store for scraped jobs and their analysis results (WAL mode).
+
+    A memory-mapped Bloom filter (`<db>.seen`, see seen_index.py) answers most
+    "never seen" checks without a query; SQLite confirms every possible hit.
+    """
+
+    def __init__(self, db_path=JOB_STORE_PATH, seen_lookups=SEEN_INDEX_ENABLED):
+        self.db_path = db_path
+        self.seen_lookups = seen_lookups
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        # One connection shared across threads, serialized by the lock below
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=30000")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+        # Two keys per job (see _seen_keys)
+        self._seen = open_seen_index(f"{db_path}.seen", self._all_seen_keys, 2 * self.count_jobs())
+
+    def _all_seen_keys(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT source, job_id FROM jobs").fetchall()
+        for row in rows:
+            yield from _seen_keys(row['source'], row['job_id'])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+            self._seen.close()
+
+    # --- jobs ---------------------------------------------------------------
+
+    def upsert_job(self, source, job, status=None):
+        """Insert or update a single job row keyed by (source, job_id)"""
+        job_id = _job_key(job)
+        if not job_id:
+            return False
+        now = _now()
+        easy_apply = job.get('easy_apply')
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (source, job_id, title, company, location, link, easy_apply, status, data, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, job_id) DO UPDATE SET
+                    title = COALESCE(excluded.title, jobs.title),
+                    company = COALESCE(excluded.company, jobs.company),
+                    location = COALESCE(excluded.location, jobs.location),
+                    link = COALESCE(excluded.link, jobs.link),
+                    easy_apply = COALESCE(excluded.easy_apply, jobs.easy_apply),
+                    status = COALESCE(excluded.status, jobs.status),
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    source, job_id, job.get('title'), job.get('company'), job.get('location'),
+                    job.get('link') or job.get('source_url') or job.get('url'),
+                    None if easy_apply is None else int(bool(easy_apply)),
+                    status, json.dumps(job, ensure_ascii=False), now, now
+                )
+            )
+            self._conn.commit()
+            for key in _seen_keys(source, job_id):
+                self._seen.add(key)
+        return True
+
+    def might_have_job(self, job_id, source=None):
+        """False only for jobs that were never stored, answered without a query"""
+        if not self.seen_lookups:
+            return True
+        return self._seen.might_contain(f"{source}/{job_id}" if source else f"*/{job_id}")
+
+    def has_job(self, job_id, source=None):
+        """Indexed membership check, optionally restricted to one source"""
+        if not job_id:
+            return False
+        if not self.might_have_job(job_id, source):
+            return False
+        with self._lock:
+            if source:
+                row = self._conn.execute(
+                    "SELECT 1 FROM jobs WHERE source = ? AND job_id = ?", (source, str(job_id))
+                ).fetchone()
+            else:
+                row = self._conn.execute("SELECT 1 FROM jobs WHERE job_id = ? LIMIT 1", (str(job_id),)).fetchone()
+        return row is not None
+
+    def count_jobs(self, source=None):
+        with self._lock:
+            if source:
+                return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE source = ?", (source,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def job_ids(self, source=None):
+        """View usable wherever the old code expected a set of seen job ids"""
+        return JobIdView(self, source)
+
+    def get_job(self, source, job_id):
+        if not self.might_have_job(job_id, source):
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE source = ? AND job_id = ?", (source, str(job_id))
+            ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def get_status(self, source, job_id):
+        if not self.might_have_job(job_id, source):
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM jobs WHERE source = ? AND job_id = ?", (source, str(job_id))
+            ).fetchone()
+        return row['status'] if row else None
+
+    def set_status(self, source, job_id, status):
+        """Update the status of a stored job, creating a minimal row if it is missing"""
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE source = ? AND job_id = ?",
+                (status, _now(), source, str(job_id))
+            ).rowcount
+            self._conn.commit()
+        if not updated:
+            self.upsert_job(source, {'job_id': str(job_id)}, status=status)
+
+    def jobs(self, source=None, status=None):
+        """Return stored job dicts, optionally filtered by source and status"""
+        query = "SELECT data FROM jobs WHERE 1 = 1"
+        params = []
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", params).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    # --- analyses -----------------------------------------------------------
+
+    def save_analysis(self, source, job_id, analysis, model=None):
+        """Insert or replace the analysis result for a job"""
+        if not job_id or analysis is None:
+            return False
+        if isinstance(analysis, dict):
+            should_apply = analysis.get('should_apply')
+            total_score = analysis.get('total_score', analysis.get('relevance_score'))
+        else:
+            should_apply, total_score = None, None
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO analyses (source, job_id, model, should_apply, total_score, data, analyzed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, job_id) DO UPDATE SET
+                    model = excluded.model,
+                    should_apply = excluded.should_apply,
+                    total_score = excluded.total_score,
+                    data = excluded.data,
+                    analyzed_at = excluded.analyzed_at
+                """,
+                (
+                    source, str(job_id), model,
+                    None if should_apply is None else int(bool(should_apply)),
+                    total_score, json.dumps(analysis, ensure_ascii=False), _now()
+                )
+            )
+            self._conn.commit()
+        return True
+
+    def record_analyzed_job(self, source, job, analysis, status):
+        """Store a scored job together with its analysis.
+
+        A failed analysis is not stored at all, so the job is still unseen and
+        gets scored again on the next run; returns False in that case.
+        """
+        if is_failed_analysis(analysis):
+            return False
+        if not self.upsert_job(source, job, status=status):
+            return False
+        if analysis:
+            self.save_analysis(source, _job_key(job), analysis)
+        return True
+
+    def get_analysis(self, source, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM analyses WHERE source = ? AND job_id = ?", (source, str(job_id))
+            ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def analyzed_jobs(self, source=None, limit=None):
+        """(job, analysis, status) for every stored job that has an LLM analysis recorded"""
+        query = """
+            SELECT jobs.data AS job, analyses.data AS analysis, jobs.status AS status FROM analyses
+            JOIN jobs ON jobs.source = analyses.source AND jobs.job_id = analyses.job_id
+            WHERE 1 = 1
+        """
+        params = []
+        if source:
+            query += " AND analyses.source = ?"
+            params.append(source)
+        query += " ORDER BY analyses.analyzed_at DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [(json.loads(row['job']), json.loads(row['analysis']), row['status']) for row in rows]
+
+    # --- legacy JSON import -------------------------------------------------
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+            self._conn.commit()
+
+    def import_legacy_json(self, file_names=LEGACY_JSON_FILES, base_dir=SCRIPT_DIR, force=False):
+        """One-time import of the old JSON job files; later calls are no-ops"""
+        if not force and self.get_meta('legacy_json_imported'):
+            return 0
+
+        imported = 0
+        for file_name in file_names:
+            file_path = os.path.join(base_dir, file_name)
+            if not os.path.exists(file_path):
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    jobs = json.load(f)
+            except json.JSONDecodeError:
+                print(f"⚠️ {file_name} was empty or corrupted, skipping import")
+                continue
+
+            count = 0
+            for job in jobs if isinstance(jobs, list) else []:
+                job_id = _job_key(job)
+                if not job_id:
+                    continue
+                source = guess_source(job)
+                analysis = job.get('analysis')
+                if isinstance(analysis, dict):
+                    status = 'to_apply' if analysis.get('should_apply') else 'analyzed'
+                else:
+                    status = 'scraped'
+                self.upsert_job(source, job, status=status)
+                if analysis:
+                    self.save_analysis(source, job_id, analysis)
+                count += 1
+            print(f"📁 Imported {count} jobs from {file_name}")
+            imported += count
+
+        self.set_meta('legacy_json_imported', _now())
+        print(f"✅ Legacy JSON import complete: {imported} jobs")
+        return imported
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_job_store(db_path=JOB_STORE_PATH):
+    """Process-wide shared JobStore, created (and legacy JSON imported) on first use"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None or _shared_store.db_path != db_path:
+            _shared_store = JobStore(db_path)
+            _shared_store.import_legacy_json()
+        return _shared_store
@@ -0,0 +1,120 @@
+"""
+Lean browser profile for scraping runs.
+
+Blocks images, fonts, video and tracker/ad domains with CDP Network.setBlockedURLs
+(plus Chrome's own image switch), since the scrapers only read text. Blocked and
+transferred requests are tallied from the performance log to report the
+bandwidth saved per run. Tune with LEAN_BROWSER, LEAN_DENY and LEAN_ALLOW.
+"""
+import os
+from collections import Counter
+from page_waits import enable_network_tracking, add_performance_listener, read_performance_events
+
+LEAN_BROWSER = os.getenv("LEAN_BROWSER", "1").lower() in ("1", "true", "yes")
+# Extra comma-separated URL patterns to block, e.g. "*cdn.example.com*"
+LEAN_DENY = [p.strip() for p in os.getenv("LEAN_DENY", "").split(",") if p.strip()]
+# Comma-separated substrings; any default block pattern containing one is dropped, e.g. ".svg,hotjar"
+LEAN_ALLOW = [p.strip() for p in os.getenv("LEAN_ALLOW", "").split(",") if p.strip()]
+
+IMAGE_PATTERNS = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*",
+                  "*media.licdn.com/dms/image*", "*image-service-cdn.seek.com.au*"]
+FONT_PATTERNS = ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"]
+MEDIA_PATTERNS = ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*dms/playlist*"]
+TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*bat.bing.com*", "*clarity.ms*",
+    "*px.ads.linkedin.com*", "*ads.linkedin.com*", "*snap.licdn.com*", "*analytics.tiktok.com*",
+    "*segment.io*", "*cdn.segment.com*", "*newrelic.com*", "*nr-data.net*", "*optimizely.com*",
+    "*tealiumiq.com*", "*adservice.google.com*", "*criteo.com*", "*taboola.com*"
+]
+
+# Scraping reads text only; the application filler still needs images (and fonts for icon buttons)
+LEAN_PROFILES = {
+    'scrape': {'block_images': True, 'patterns': IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS},
+    'apply': {'block_images': False, 'patterns': MEDIA_PATTERNS + TRACKER_PATTERNS}
+}
+
+# Rough transfer size of a blocked request by CDP resource type, used to estimate savings
+ESTIMATED_BYTES = {
+    'Image': 30_000, 'Font': 40_000, 'Media': 400_000, 'Script': 40_000,
+    'XHR': 2_000, 'Fetch': 2_000, 'Ping': 500, 'Other': 5_000
+}
+
+def blocked_patterns(profile, deny=LEAN_DENY, allow=LEAN_ALLOW):
+    """Block patterns for a profile with the deny list added and allow-listed patterns removed"""
+    patterns = LEAN_PROFILES[profile]['patterns'] + [p for p in deny if p not in LEAN_PROFILES[profile]['patterns']]
+    return [p for p in patterns if not any(allowed in p for allowed in allow)]
+
+class BandwidthReport:
+    """Tallies transferred and blocked requests from CDP Network events"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.request_types = {}
+        self.transferred_bytes = 0
+        self.transferred_by_type = Counter()
+        self.blocked = Counter()
+
+    def __call__(self, event):
+        method = event.get("method")
+        params = event.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            self.request_types[request_id] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            size = params.get("encodedDataLength", 0) or 0
+            self.transferred_bytes += size
+            self.transferred_by_type[self.request_types.pop(request_id, "Other")] += size
+        elif method == "Network.loadingFailed":
+            resource_type = params.get("type") or self.request_types.get(request_id, "Other")
+            self.request_types.pop(request_id, None)
+            if params.get("blockedReason"):
+                self.blocked[resource_type] += 1
+
+    @property
+    def estimated_saved_bytes(self):
+        return sum(count * ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES['Other'])
+                   for resource_type, count in self.blocked.items())
+
+    def report(self, driver=None):
+        """Summary line; pass the driver to first drain events still sitting in the performance log"""
+        if driver is not None:
+            read_performance_events(driver)
+        if not self.enabled:
+            return "🪶 Lean browser disabled (LEAN_BROWSER=0)"
+        blocked_total = sum(self.blocked.values())
+        return (f"🪶 Lean browser: blocked {blocked_total} requests {dict(self.blocked)}, "
+                f"~{self.estimated_saved_bytes / 1e6:.1f} MB saved (estimated), "
+                f"{self.transferred_bytes / 1e6:.1f} MB transferred")
+
+def apply_lean_options(options, profile='scrape'):
+    """Chrome options part of the lean profile; also turns on the performance log used for the report"""
+    enable_network_tracking(options)
+    if LEAN_BROWSER and LEAN_PROFILES[profile]['block_images']:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    return options
+
+def block_resources(driver, profile='scrape'):
+    """Install the URL block list on the current tab (call again for every new tab/window)"""
+    if not LEAN_BROWSER:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns(profile)})
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not enable resource blocking: {str(e)}")
+        return False
+
+def create_lean_driver(create_driver, options, profile='scrape'):
+    """Build a driver with create_driver(options) using the lean profile.
+
+    Returns (driver, BandwidthReport); print report.report(driver) at the end of the run.
+    """
+    apply_lean_options(options, profile)
+    driver = create_driver(options)
+    report = BandwidthReport(enabled=LEAN_BROWSER)
+    add_performance_listener(report)
+    if block_resources(driver, profile):
+        print(f"🪶 Lean browser ({profile}): blocking {len(blocked_patterns(profile))} URL patterns")
+    return driver, report
@@ -2,10 +2,10 @@ import requests
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 import os
+import sys
 import time
 import datetime
 from dateutil.relativedelta import relativedelta
-import json
 import re
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -36,6 +36,23 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 import traceback
 import google.generativeai as genai
+from page_waits import (
+    jitter, wait_for_any_selector,
+    wait_for_mutation_quiescence, wait_for_network_idle, wait_for_page
+)
+from job_store import get_job_store, is_failed_analysis
+from browser_session import LINKEDIN_SESSION, apply_profile, ensure_signed_in
+from lean_browser import create_lean_driver, block_resources
+from tab_pool import TabPool, TAB_POOL_SIZE
+from llm_cache import get_llm_cache, make_cache_key
+from job_pipeline import Stage, JobPipeline
+from checkpoint_journal import CheckpointJournal
+from relevance_prefilter import RelevancePrefilter, PREFILTER_BATCH_SIZE, log_prefilter_precision
+from job_analysis import (
+    RELEVANCE_RESPONSE_SCHEMA, BATCH_RESPONSE_SCHEMA, AnalysisValidationError, BatchScoringStats,
+    ContextLimitError, analyze_in_batches, parse_structured_analysis
+)
+import queue
 
 
 proxies = [
@@ -68,12 +85,26 @@ caps['goog:loggingPrefs'] = {'performance': 'ALL'}
 
 # Constants
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CHECKPOINT_FILE = os.path.join(SCRIPT_DIR, "job_scorer_checkpoint.json")
+# Per-collection run state (page reached, jobs queued/scored/saved), one journal per collection
+RUN_STATE_PATTERN = os.path.join(SCRIPT_DIR, "linkedin_run_{}")
 SCRAPED_JOBS_FILE = os.path.join(SCRIPT_DIR, "scraped_jobs.json")
 CV_FILE_PATH = os.path.join(SCRIPT_DIR, "cv_text.txt")
 TOP_APPLICANT_URL = "https://www.linkedin.com/jobs/collections/top-applicant/"
 RECOMMENDED_URL = "https://www.linkedin.com/jobs/collections/recommended/"
 LINKEDIN_EASY_APPLY_FLAG = "⭐"
+JOB_SOURCE = "linkedin"
+JOBS_PER_PAGE = 25  # Collection pages are addressed with ?start=<offset>
+
+# Pipeline sizing: scoring is the slow stage, so it gets several workers
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", "3"))
+PERSIST_WORKERS = 1
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "10"))
+# Jobs scored per Gemini request; the shared instructions are sent once per batch
+SCORE_BATCH_SIZE = int(os.getenv("SCORE_BATCH_SIZE", "8"))
+# Rough prompt budget (~4 chars/token); bigger batches are split before sending
+BATCH_MAX_PROMPT_TOKENS = int(os.getenv("BATCH_MAX_PROMPT_TOKENS", "30000"))
+# Jobs are buffered until both the prefilter and the scorer have a full batch
+COLLECTION_BATCH_SIZE = max(PREFILTER_BATCH_SIZE, SCORE_BATCH_SIZE)
 
 # Updated SELECTORS with verified 2024 LinkedIn structure
 SELECTORS = {
@@ -95,6 +126,10 @@ SELECTORS = {
     'easy_apply': "button[aria-label='Easy Apply']"
 }
 
+# Selectors that signal a page is usable, for the event-driven waits
+JOB_CARD_SELECTORS = ["div.job-card-container"] + SELECTORS['job_cards']
+JOB_DETAIL_SELECTORS = [".jobs-description__content", ".jobs-box__html-content", ".jobs-description-content__text"]
+
 
 
 # Initialize services
@@ -103,13 +138,14 @@ pb = Pushbullet(os.getenv("PUSHBULLET_API_KEY")) if os.getenv("PUSHBULLET_API_KE
 client = Groq(api_key=os.getenv("GROQ_API_KEY")) if os.getenv("GROQ_API_KEY") else None
 
 # Initialize Gemini client
+NEW_GEMINI_MODEL_ID = "gemini-2.5-pro" # User specified model
+# Bump whenever the analyze_job_relevance prompt changes so cached analyses are not reused
+RELEVANCE_PROMPT_VERSION = "meaningfulness-json-v2"
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
     print("⚠️ GEMINI_API_KEY not found in environment variables. AI features will be disabled.")
     gemini_model = None
 else:
-    NEW_GEMINI_MODEL_ID = "gemini-2.5-pro" # User specified model
-    
     # Configure Gemini with environment variable
     genai.configure(api_key=gemini_api_key)
     gemini_model = genai.GenerativeModel(NEW_GEMINI_MODEL_ID)
@@ -999,42 +1035,20 @@ def process_job_cards(driver, job_cards):
     return processed_jobs
 
 def load_existing_job_ids():
-    """Load job IDs from all JSON files"""
-    existing_ids = set()
-    
-    # Track sources of job IDs for debugging
-    sources = {
-        'easy_apply_jobs.json': 0,
-        'external_jobs.json': 0,
-        'scraped_jobs.json': 0,
-        'apply_jobs.json': 0
-    }
-    
-    for filename in sources.keys():
-        try:
-            if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    try:
-                        jobs = json.load(f)
-                        # Try both 'id' and 'job_id' fields
-                        new_ids = {job.get('job_id', job.get('id')) for job in jobs if job.get('job_id') or job.get('id')}
-                        existing_ids.update(new_ids)
-                        sources[filename] = len(new_ids)
-                        print(f"📁 Found {len(new_ids)} jobs in {filename}")
-                    except json.JSONDecodeError:
-                        print(f"⚠️ {filename} was empty or corrupted")
-        except Exception as e:
-            print(f"⚠️ Error loading {filename}: {str(e)}")
-    
-    print("\n📊 Job ID sources summary:")
-    for source, count in sources.items():
-        print(f"- {source}: {count} jobs")
-    print(f"Total unique jobs: {len(existing_ids)}")
-    
+    """Return a view of every previously processed job id backed by the job store.
+
+    Membership checks (`job_id in existing_ids`) go to the store's memory-mapped
+    seen-id filter and only hit SQLite for possible matches; the old JSON files are
+    imported into the store once on first use.
+    """
+    store = get_job_store()
+    existing_ids = store.job_ids()
+    print(f"📁 Job store {os.path.basename(store.db_path)}: {len(existing_ids)} jobs, "
+          f"{store.count_jobs(JOB_SOURCE)} from LinkedIn")
     return existing_ids
 
-def get_job_listings(driver, max_pages=5):
-    """Get job listings from both collections"""
+def get_job_listings(driver, max_pages=5, resume=False):
+    """Get job listings from both collections; resume continues each one from its run state"""
     all_jobs = []
     processed_job_ids = set()
     
@@ -1042,34 +1056,152 @@ def get_job_listings(driver, max_pages=5):
     existing_ids = load_existing_job_ids()
     print(f"\n📚 Found {len(existing_ids)} previously processed jobs")
     
+    # Local prefilter shared by both collections so its IDF statistics build up over the run
+    prefilter = RelevancePrefilter(load_cv_text(CV_FILE_PATH))
+    log_prefilter_precision(prefilter, get_job_store(), JOB_SOURCE)
+    
     # First process top applicant jobs
     print("\n🎯 Starting with Top Applicant collection...")
-    top_applicant_jobs = process_job_collection(driver, TOP_APPLICANT_URL, processed_job_ids, existing_ids)
+    top_applicant_jobs = process_job_collection(driver, TOP_APPLICANT_URL, processed_job_ids, existing_ids,
+                                                prefilter=prefilter, resume=resume)
     all_jobs.extend(top_applicant_jobs)
     
     # Then process recommended jobs
     print("\n👥 Moving to Recommended collection...")
-    recommended_jobs = process_job_collection(driver, RECOMMENDED_URL, processed_job_ids, existing_ids, max_pages)
+    recommended_jobs = process_job_collection(driver, RECOMMENDED_URL, processed_job_ids, existing_ids, max_pages,
+                                              prefilter=prefilter, resume=resume)
     all_jobs.extend(recommended_jobs)
     
+    print(prefilter.report())
+    print(BATCH_STATS.report())
     return all_jobs
 
-def process_job_collection(driver, base_url, processed_job_ids, existing_ids, max_pages=None):
-    """Process jobs from a specific collection"""
-    collection_jobs = []
-    current_page = 1
+def build_collection_pipeline(cv_content, linkedin_save_queue, run_state=None):
+    """Score -> persist stages fed by the browser thread.
+
+    LinkedIn actions (clicking Save) need the driver, so the persist stage only queues
+    them on linkedin_save_queue and the browser thread performs them between navigations.
+    Items are batches of up to SCORE_BATCH_SIZE jobs so each batch costs one Gemini request.
+    Jobs that already carry an analysis (scored before a restart) skip the score stage.
+    """
+    def score(batch):
+        unscored = [job_data for job_data in batch if 'analysis' not in job_data]
+        if unscored:
+            for job_data, analysis in zip(unscored, analyze_jobs_batch(unscored, cv_content)):
+                job_data['analysis'] = analysis
+                # A failed analysis stays 'queued' so --resume scores the job again
+                if run_state and not is_failed_analysis(analysis):
+                    run_state.record_job(job_data['job_id'], 'scored', job=job_data)
+        return batch
+
+    def persist(batch):
+        # A failed analysis (error_analysis, e.g. a batch that exhausted its retries) is
+        # dropped here: the job stays unseen and unsaved so the next run scores it again
+        batch = [job_data for job_data in batch if not is_failed_analysis(job_data['analysis'])]
+        for job_data in batch:
+            # Single-row insert; also makes the job an indexed "seen" id for later runs
+            save_jobs([job_data], job_data.get('easy_apply', False))
+            if run_state:
+                run_state.record_job(job_data['job_id'], 'saved')
+            if job_data['analysis'].get('should_apply', False):
+                linkedin_save_queue.put(job_data['job_id'])
+        return batch
+
+    return JobPipeline([
+        Stage("score", score, workers=SCORE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+        Stage("persist", persist, workers=PERSIST_WORKERS, queue_size=PIPELINE_QUEUE_SIZE)
+    ])
+
+def drain_linkedin_saves(driver, base_url, linkedin_save_queue):
+    """Browser-thread consumer for the 'save on LinkedIn' actions queued by the pipeline"""
+    while True:
+        try:
+            job_id = linkedin_save_queue.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            driver.get(f"{base_url}?currentJobId={job_id}")
+            wait_for_any_selector(driver, JOB_DETAIL_SELECTORS, timeout=10)
+            try_save_job(driver)
+        except Exception as e:
+            print(f"❌ Error saving job {job_id} on LinkedIn: {str(e)}")
+
+def flush_prefilter_buffer(prefilter, buffer, pipeline, run_state=None):
+    """Prefilter the buffered jobs as one batch; send survivors to the pipeline in scoring batches, record the rest"""
+    if not buffer:
+        return
+    if prefilter:
+        kept, pruned = prefilter.filter_batch(buffer)
+    else:
+        kept, pruned = list(buffer), []
+    store = get_job_store()
+    for job_data in pruned:
+        store.upsert_job(JOB_SOURCE, job_data, status='prefiltered')
+        if run_state:
+            run_state.record_job(job_data['job_id'], 'prefiltered')
+    for start in range(0, len(kept), SCORE_BATCH_SIZE):
+        pipeline.put(kept[start:start + SCORE_BATCH_SIZE])
+    buffer.clear()
+
+def collection_page_url(base_url, page_number):
+    """Direct URL of a collection results page (1-based)"""
+    if page_number <= 1:
+        return base_url
+    return f"{base_url}?start={(page_number - 1) * JOBS_PER_PAGE}"
+
+def collection_run_state(base_url, resume=False):
+    """Run-state journal for one collection, e.g. linkedin_run_top-applicant.jsonl"""
+    return CheckpointJournal(RUN_STATE_PATTERN.format(base_url.rstrip('/').rsplit('/', 1)[-1]), resume=resume)
+
+def process_job_collection(driver, base_url, processed_job_ids, existing_ids, max_pages=None, prefilter=None,
+                           resume=False):
+    """Process jobs from a specific collection.
+
+    The browser thread only navigates and extracts; scoring and saving run in a
+    staged pipeline so page loads and LLM calls overlap. With TAB_POOL_SIZE > 1,
+    job details load in parallel worker tabs while the listing stays in this tab.
+    Progress goes to the collection's run state as it happens; with resume=True the
+    run starts after the last finished page, and jobs queued or scored before the
+    restart go straight back into the pipeline without being scraped or scored again.
+    """
+    pipeline = None
+    tab_pool = None
+    linkedin_save_queue = queue.Queue()
+    prefilter_buffer = []
+    run_state = collection_run_state(base_url, resume)
+    current_page = run_state.next_page(base_url)
     
     try:
         # Load CV content first
         cv_content = load_cv_text(CV_FILE_PATH)
         if not cv_content:
             raise Exception("Failed to load CV content")
-            
-        print(f"\n4. Navigating to {base_url}...")
-        driver.get(base_url)
-        time.sleep(3)
         
-        while True:
+        pipeline = build_collection_pipeline(cv_content, linkedin_save_queue, run_state)
+        
+        pending = run_state.pending()
+        if pending:
+            print(f"♻️ Resuming {len(pending)} jobs queued before the restart")
+        for job_id, status, job_data in pending:
+            processed_job_ids.add(job_id)
+            if status == 'scored':
+                pipeline.put([job_data])  # Analysis kept from the earlier run, only saving is left
+            else:
+                prefilter_buffer.append(job_data)
+        flush_prefilter_buffer(prefilter, prefilter_buffer, pipeline, run_state)
+        
+        collection_done = run_state.is_exhausted(base_url)
+        if collection_done:
+            print("🏁 Every page of this collection was finished before the restart")
+        else:
+            page_url = collection_page_url(base_url, current_page)
+            print(f"\n4. Navigating to {page_url}...")
+            driver.get(page_url)
+            wait_for_page(driver, JOB_CARD_SELECTORS)
+            if TAB_POOL_SIZE > 1:
+                tab_pool = TabPool(driver, TAB_POOL_SIZE, on_new_tab=lambda d: block_resources(d, 'scrape'))
+        
+        while not collection_done:
             if max_pages and current_page > max_pages:
                 print(f"Reached maximum pages ({max_pages}) for this collection")
                 break
@@ -1082,66 +1214,117 @@ def process_job_collection(driver, base_url, processed_job_ids, existing_ids, ma
                 print("❌ Could not find job container")
                 break
             
-            # Scroll and get job IDs
-            job_cards = scroll_and_get_jobs(driver, scroll_container)
             job_ids_on_page = []
             
-            print(f"\n🔍 Found {len(job_cards)} job cards on page")
+            # Scroll and get job IDs; the count covers every round trip of reading the list
+            with WebDriverCommandCounter(driver) as counter:
+                card_count = scroll_job_list(driver, scroll_container)
+                print(f"\n🔍 Found {card_count} job cards on page")
+                card_ids = harvest_job_ids(driver, scroll_container)
+                if card_ids:
+                    print(f"⚡ Batched harvest returned {len(card_ids)} job IDs")
+                else:
+                    # Fallback: per-card extraction (several round trips per card)
+                    print("⚠️ Batched harvest returned nothing, falling back to per-card extraction")
+                    for card in scroll_container.find_elements(By.CSS_SELECTOR, "div.job-card-container"):
+                        try:
+                            card_ids.append(extract_job_id(card))
+                        except Exception as e:
+                            print(f"⚠️ Error extracting job ID: {str(e)}")
+                            continue
+            print(f"📡 Job list on page {current_page}: {counter.summary()}")
             
-            for card in job_cards:
-                try:
-                    job_id = extract_job_id(card)
-                    if job_id:
-                        if job_id in existing_ids:
-                            print(f"⏭️ Skipping previously processed job {job_id}")
-                        elif job_id in processed_job_ids:
-                            print(f"⏭️ Skipping already seen job {job_id}")
-                        else:
-                            print(f"✨ New job found: {job_id}")
-                            job_ids_on_page.append(job_id)
-                except Exception as e:
-                    print(f"⚠️ Error extracting job ID: {str(e)}")
-                    continue
+            for job_id in card_ids:
+                if job_id:
+                    if job_id in existing_ids:
+                        print(f"⏭️ Skipping previously processed job {job_id}")
+                    elif job_id in processed_job_ids:
+                        print(f"⏭️ Skipping already seen job {job_id}")
+                    elif run_state.is_done(job_id):
+                        print(f"⏭️ Skipping job {job_id} handled before the restart")
+                    elif job_id in job_ids_on_page:
+                        continue
+                    else:
+                        print(f"✨ New job found: {job_id}")
+                        job_ids_on_page.append(job_id)
             
             print(f"\n📊 Found {len(job_ids_on_page)} new jobs to process on page {current_page}")
             
-            # Process each job
-            for idx, job_id in enumerate(job_ids_on_page, 1):
-                try:
-                    print(f"\n🔍 Processing job {idx}/{len(job_ids_on_page)} (ID: {job_id})")
+            def buffer_job(job_id, job_data):
+                # Batch through the local prefilter, then hand off to the score stage
+                prefilter_buffer.append(job_data)
+                processed_job_ids.add(job_id)
+                run_state.record_job(job_id, 'queued', job=job_data)
+                if len(prefilter_buffer) >= COLLECTION_BATCH_SIZE:
+                    flush_prefilter_buffer(prefilter, prefilter_buffer, pipeline, run_state)
+
+            if tab_pool:
+                job_urls = [(job_id, f"{base_url}?currentJobId={job_id}") for job_id in job_ids_on_page]
+                for job_id, job_data in tab_pool.fetch(job_urls, extract_job_details, JOB_DETAIL_SELECTORS,
+                                                       ready_marker=lambda job_id: f"currentJobId={job_id}"):
+                    if job_data:
+                        buffer_job(job_id, job_data)
+            else:
+                # Process each job, one navigation at a time
+                for idx, job_id in enumerate(job_ids_on_page, 1):
+                    try:
+                        print(f"\n🔍 Processing job {idx}/{len(job_ids_on_page)} (ID: {job_id})")
                     
-                    # Build URL based on collection
-                    job_url = f"{base_url}?currentJobId={job_id}"
-                    driver.get(job_url)
-                    time.sleep(2)
+                        # Build URL based on collection
+                        job_url = f"{base_url}?currentJobId={job_id}"
+                        driver.get(job_url)
+                        wait_for_any_selector(driver, JOB_DETAIL_SELECTORS, timeout=10)
+                        jitter(1.0, 2.5)
                     
-                    job_data = extract_job_details(driver)
-                    if job_data:
-                        analysis = analyze_job_relevance(job_data, cv_content)
-                        job_data['analysis'] = analysis
-                        
-                        # Try to save the job if it's recommended
-                        if analysis.get('should_apply', False):
-                            try_save_job(driver)
+                        job_data = extract_job_details(driver)
+                        if job_data:
+                            buffer_job(job_id, job_data)
                         
-                        collection_jobs.append(job_data)
-                        processed_job_ids.add(job_id)
-                        
-                except Exception as e:
-                    print(f"❌ Error processing job {job_id}: {str(e)}")
-                    continue
+                    except Exception as e:
+                        print(f"❌ Error processing job {job_id}: {str(e)}")
+                        continue
+            
+            flush_prefilter_buffer(prefilter, prefilter_buffer, pipeline, run_state)
+            
+            # Perform LinkedIn saves for jobs that have finished scoring so far
+            if tab_pool:
+                tab_pool.run_in_tab(lambda: drain_linkedin_saves(driver, base_url, linkedin_save_queue))
+            else:
+                drain_linkedin_saves(driver, base_url, linkedin_save_queue)
+            run_state.record_page(base_url, current_page)
+            
+            if not tab_pool:
+                # Job URLs (?currentJobId=) show the collection's first page, so go
+                # back to this page before clicking Next
+                driver.get(collection_page_url(base_url, current_page))
+                wait_for_page(driver, JOB_CARD_SELECTORS)
             
             # Try next page
             if not go_to_next_page(driver):
                 print("🏁 No more pages in this collection")
+                run_state.record_exhausted(base_url)
                 break
             
             current_page += 1
-            time.sleep(3)
+            wait_for_any_selector(driver, JOB_CARD_SELECTORS, timeout=10)
             
     except Exception as e:
         print(f"❌ Error processing collection: {str(e)}")
     
+    collection_jobs = []
+    if pipeline:
+        flush_prefilter_buffer(prefilter, prefilter_buffer, pipeline, run_state)
+        collection_jobs = [job_data for batch in pipeline.close() for job_data in batch]
+        print(pipeline.report())
+        if tab_pool:
+            tab_pool.run_in_tab(lambda: drain_linkedin_saves(driver, base_url, linkedin_save_queue))
+        else:
+            drain_linkedin_saves(driver, base_url, linkedin_save_queue)
+    if tab_pool:
+        print(tab_pool.report())
+        tab_pool.close()
+    run_state.close()
+    
     return collection_jobs
 
 def try_save_job(driver):
@@ -1256,6 +1439,104 @@ def extract_job_id(job_card):
         print(f"❌ Error extracting job ID: {str(e)}")
         return None
 
+class WebDriverCommandCounter:
+    """Count the WebDriver commands (chromedriver round trips) issued while active.
+
+    Every driver and element call funnels through ``driver.execute``, so shadowing
+    it on the instance catches find_element, get_attribute, .text, execute_script etc.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self.by_command = {}
+        self._original_execute = None
+
+    def __enter__(self):
+        self._original_execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            self.by_command[driver_command] = self.by_command.get(driver_command, 0) + 1
+            return self._original_execute(driver_command, params)
+
+        self.driver.execute = counting_execute
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Drop the instance attribute so the class method is visible again
+        try:
+            del self.driver.execute
+        except AttributeError:
+            pass
+        return False
+
+    def summary(self):
+        top = sorted(self.by_command.items(), key=lambda item: item[1], reverse=True)[:5]
+        return f"{self.count} WebDriver commands ({', '.join(f'{cmd}={n}' for cmd, n in top)})"
+
+# Single-round-trip harvest of every job card's id in the list container; the details
+# themselves are read from the job pane. Mirrors extract_job_id: card data attributes,
+# then job links, then up to 3 parent hops.
+HARVEST_JOB_IDS_JS = """
+const container = arguments[0] || document;
+const cardSelectors = arguments[1];
+const linkSelector = arguments[2];
+const idAttrs = ['data-job-id', 'data-occludable-job-id'];
+
+function idFromHref(href) {
+    if (!href) return null;
+    let m = href.match(/\\/jobs\\/view\\/(\\d+)/);
+    if (m) return m[1];
+    m = href.match(/currentJobId=(\\d+)/);
+    return m ? m[1] : null;
+}
+
+function idFromAttrs(el) {
+    for (const attr of idAttrs) {
+        const value = el.getAttribute(attr);
+        if (value) return value;
+    }
+    return null;
+}
+
+let cards = [];
+for (const selector of cardSelectors) {
+    cards = Array.from(container.querySelectorAll(selector));
+    if (cards.length) break;
+}
+
+return cards.map((card) => {
+    let jobId = idFromAttrs(card);
+    if (!jobId) {
+        for (const a of card.querySelectorAll("a[href*='/jobs/view/'], a[href*='currentJobId='], " + linkSelector)) {
+            jobId = idFromHref(a.href);
+            if (jobId) break;
+        }
+    }
+    let parent = card.parentElement;
+    for (let i = 0; !jobId && parent && i < 3; i++, parent = parent.parentElement) {
+        jobId = idFromAttrs(parent);
+    }
+    return jobId;
+});
+"""
+
+def harvest_job_ids(driver, container):
+    """Job id of every card in the list, in page order, from one execute_script call"""
+    try:
+        raw_ids = driver.execute_script(HARVEST_JOB_IDS_JS, container, JOB_CARD_SELECTORS, SELECTORS['link']) or []
+    except Exception as e:
+        print(f"⚠️ Batched card harvest failed: {str(e)}")
+        return []
+
+    job_ids = []
+    for raw_id in raw_ids:
+        job_id = str(raw_id or '').split(':')[-1]
+        if job_id.isdigit() and job_id not in job_ids:
+            job_ids.append(job_id)
+    return job_ids
+
 def load_cv_text(cv_file_path):
     print("\n Loading CV content...")
     try:
@@ -1268,90 +1549,45 @@ def load_cv_text(cv_file_path):
         return ""
 
 def save_jobs(jobs, easy_apply=True):
-    """Save jobs to appropriate JSON file based on Easy Apply status"""
+    """Save jobs to the job store, one row per job.
+
+    Every analyzed job is recorded so later runs skip it, except jobs whose analysis
+    failed, which are left out so they are scored again; jobs marked 'should apply'
+    get the 'to_apply' status (the old easy_apply_jobs.json / external_jobs.json split
+    is kept in the easy_apply column).
+    """
     if not jobs:
         return True
-        
-    # Determine which file to use
-    file_name = "easy_apply_jobs.json" if easy_apply else "external_jobs.json"
-    file_path = os.path.join(SCRIPT_DIR, file_name)
-    
+
     try:
-        # Load existing jobs
-        existing_jobs = []
-        if os.path.exists(file_path):
-            try:
-                print(f"📚 Loading existing jobs from {file_name}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_jobs = json.load(f)
-            except json.JSONDecodeError:
-                print(f"⚠️ {file_name} was empty or corrupted, starting fresh")
-                existing_jobs = []
-        
-        # Add new jobs that should be applied to
-        new_jobs = [job for job in jobs if job.get('analysis', {}).get('should_apply', False)]
-        if not new_jobs:
-            print("ℹ️ No new jobs to save (none marked as 'should apply')")
-            return True
-            
-        # Add only unique jobs
-        existing_ids = {job.get('job_id') for job in existing_jobs}
-        unique_new_jobs = [job for job in new_jobs if job.get('job_id') not in existing_ids]
-        
-        if not unique_new_jobs:
-            print("ℹ️ No new unique jobs to save")
-            return True
-            
-        # Combine and save
-        all_jobs = existing_jobs + unique_new_jobs
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
-        
-        # Save with error handling
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(all_jobs, f, indent=2, ensure_ascii=False)
-            print(f"✅ Successfully saved {len(unique_new_jobs)} new jobs to {file_name}. Total: {len(all_jobs)}")
-            return True
-        except Exception as save_error:
-            print(f"❌ Error writing to {file_name}: {str(save_error)}")
-            # Try to save to a backup file
-            backup_file = f"{file_name}.backup"
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(all_jobs, f, indent=2, ensure_ascii=False)
-            print(f"✅ Saved backup to {backup_file}")
-            return False
-        
+        store = get_job_store()
+        saved = 0
+        for job in jobs:
+            job.setdefault('easy_apply', easy_apply)
+            analysis = job.get('analysis') or {}
+            if is_failed_analysis(analysis):
+                print(f"⚠️ Not saving job {job.get('title')}: analysis failed, it will be scored again next run")
+                continue
+            status = 'to_apply' if analysis.get('should_apply', False) else 'analyzed'
+            if store.record_analyzed_job(JOB_SOURCE, job, analysis, status):
+                saved += 1
+                if status == 'to_apply':
+                    print(f"✨ Job {job.get('title')} marked for application!")
+        print(f"✅ Saved {saved} jobs to the job store")
+        return True
+
     except Exception as e:
         print(f"❌ Error in save_jobs: {str(e)}")
         return False
 
-def analyze_job_relevance(job, cv_content):
-    """Analyze job relevance with specific criteria"""
-    print("\n🧠 Analyzing job relevance...")
-    if not gemini_model:
-        print("❌ Gemini client not initialized. Skipping analysis.")
-        return {
-            'scores': {}, 'should_apply': False, 'recommendation': 'Skipped analysis - Gemini API key missing.', 'benefits': [], 'total_score': 0, 'meaningfulness_score': 0, 'meaningfulness_justification': ''
-        }
-        
-    try:
-        prompt = f"""Analyze the following job posting based on the candidate's CV, preferences, and the criteria for a 'meaningful' job. Provide a structured analysis.
-
-**Candidate Profile:**
+RELEVANCE_CANDIDATE_PROFILE = """**Candidate Profile:**
 - Role: Data Analyst/Data Scientist/BI Developer
 - Experience: 4+ years
 - Key Tech Stack: Python, SQL, MLflow, Random Forests, XGBoost, tabular data, geospatial data, cloud platforms (AWS/GCP/Azure), MLOps, ETL, data visualization (Tableau/PowerBI), machine learning frameworks (Scikit-learn, TensorFlow/Keras, PyTorch).
 - Preferences: Remote preferred, but hybrid (up to 3 days in office) is acceptable (Barcelona-based). Minimum salary: 42k€/year (flexible for great opportunities). Values innovation, learning, professional growth, and an exciting work environment/mission.
+"""
 
-**Job Details:**
-Title: {job['title']}
-Company: {job['company']}
-Location: {job['location']}
-Description (first 1500 chars): {job['description'][:1500]}...
-
-**Analysis Instructions:**
+RELEVANCE_INSTRUCTIONS = """**Analysis Instructions:**
 1.  **Meaningfulness Score:** Assign a 'meaningfulness_score' from 0 to 10. This score should reflect how well the job aligns with the criteria for a 'meaningful' role defined below.
 2.  **Meaningfulness Justification:** Provide a concise justification for the 'meaningfulness_score', extracting 2-3 key snippets or phrases from the job description that support your assessment.
 3.  **Standard Scores:** Rate the following aspects on a scale of 0-10:
@@ -1390,46 +1626,68 @@ Description (first 1500 chars): {job['description'][:1500]}...
     *   Standard corporate roles with no discernible passion, mission, or positive impact (unless growth is exceptional).
     *   Generic consultancy roles (unless highly specialized in a valued impact area or offering exceptional growth).
     *   Roles focused primarily on routine reporting, basic maintenance of old systems, or lacking clear learning/development avenues.
+"""
 
-**Output Format (Strictly Adhere to this):**
+RELEVANCE_OUTPUT_FIELDS = """- "meaningfulness_score": number 0-10
+- "meaningfulness_justification": array of 2-3 snippets quoted from the description
+- "skills_match", "role_alignment", "remote_work", "innovation", "compensation_proxy", "final_score": numbers 0-10
+- "salary_estimation": string in the format "X-Y EUR"
+- "should_apply": true or false
+- "recommendation": one or two sentences
+- "key_points": array of 3-4 short strings
+"""
 
-**Meaningfulness Score:** X/10
-**Meaningfulness Justification:**
-- Snippet 1: "..."
-- Snippet 2: "..."
-- Snippet 3: "..."
+def format_job_details(job):
+    return f"""Title: {job['title']}
+Company: {job['company']}
+Location: {job['location']}
+Description (first 1500 chars): {job['description'][:1500]}..."""
 
-**Skills Match:** X/10
-**Role Alignment:** X/10
-**Remote Work:** X/10
-**Innovation Focus:** X/10
-**Compensation Proxy:** X/10
-**Final Score:** X/10
+def relevance_generation_config(schema=RELEVANCE_RESPONSE_SCHEMA):
+    """Generation config asking Gemini for schema-constrained JSON (plain config on old client versions)"""
+    try:
+        return genai.types.GenerationConfig(
+            temperature=0.2,
+            response_mime_type="application/json",
+            response_schema=schema
+        )
+    except TypeError:
+        return genai.types.GenerationConfig(temperature=0.2)
 
-**Salary Estimation:** X-Y EUR
+def analyze_job_relevance(job, cv_content):
+    """Analyze job relevance with specific criteria"""
+    print("\n🧠 Analyzing job relevance...")
+    llm_cache = get_llm_cache()
+    cache_key = make_cache_key(NEW_GEMINI_MODEL_ID, RELEVANCE_PROMPT_VERSION, cv_content, job)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        print("💾 Using cached analysis for unchanged job/CV (no LLM call)")
+        return cached
+    
+    if not gemini_model:
+        print("❌ Gemini client not initialized. Skipping analysis.")
+        return {
+            'scores': {}, 'should_apply': False, 'recommendation': 'Skipped analysis - Gemini API key missing.', 'benefits': [], 'total_score': 0, 'meaningfulness_score': 0, 'meaningfulness_justification': ''
+        }
+        
+    try:
+        prompt = f"""Analyze the following job posting based on the candidate's CV, preferences, and the criteria for a 'meaningful' job. Provide a structured analysis.
 
-**Should Apply:** [YES/NO]
-**Recommendation:** [One or two sentences]
+{RELEVANCE_CANDIDATE_PROFILE}
+**Job Details:**
+{format_job_details(job)}
 
-**Key Points:**
-- [Point 1]
-- [Point 2]
-- [Point 3]
-"""
+{RELEVANCE_INSTRUCTIONS}
+**Output Format:**
+Respond with a single JSON object (no markdown) with these keys:
+{RELEVANCE_OUTPUT_FIELDS}"""
 
         print("⚡ Sending request to Gemini API...")
         # Use Gemini API
-        response = gemini_model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                # candidate_count=1, # Default is 1
-                # stop_sequences=['\n\n\n'], # Optional: If needed
-                # max_output_tokens=1500, # Adjusted for potentially longer justification
-                temperature=0.2 # Slightly lower for more deterministic structured output
-            )
-        )
+        response = gemini_model.generate_content(prompt, generation_config=relevance_generation_config())
 
         # Ensure response.text is accessed correctly
+        response_ok = bool(response.parts)
         if response.parts:
              response_text = "".join(part.text for part in response.parts)
         else:
@@ -1445,71 +1703,16 @@ Description (first 1500 chars): {job['description'][:1500]}...
         print(response_text)
         print("=" * 80)
         
-        # Parse with improved regex
-        scores = {}
-        # Corrected regex: Use r'**' for markdown bold, not r'\\*\\*'
-        score_pattern = r'\*\*(Skills Match|Role Alignment|Remote Work|Innovation Focus|Compensation Proxy|Final Score|Meaningfulness Score):\*\*\s*(\d+(?:\.\d+)?)/10'
-        matches = re.finditer(score_pattern, response_text, re.IGNORECASE | re.MULTILINE)
-        
-        for match in matches:
-            category, score_value = match.groups() 
-            scores[category.lower().replace(' ', '_').replace('_focus','')] = float(score_value)
-
-        # Extract Meaningfulness Justification
-        justification = ""
-        # Corrected regex and more robust lookahead for various next sections or end of text
-        justification_pattern = r'\*\*Meaningfulness Justification:\*\*\s*(.*?)(?=\n\s*\*\*(?:Skills Match|Role Alignment|Remote Work|Innovation Focus|Compensation Proxy|Final Score):\*\*|$)'
-        justification_match = re.search(justification_pattern, response_text, re.DOTALL | re.IGNORECASE)
-        if justification_match:
-            justification_text = justification_match.group(1).strip()
-            snippet_matches = re.finditer(r'-\s*Snippet \d+:\s*"(.*?)"', justification_text, re.IGNORECASE)
-            snippets = [sm.group(1) for sm in snippet_matches]
-            if snippets:
-                justification = "\n".join(snippets) 
-            else: 
-                justification = justification_text
-        
-        # Extract salary estimation
-        salary_estimation = ""
-        salary_pattern = r'\*\*Salary Estimation:\*\*\s*([0-9,\-\s]+EUR)'
-        salary_match = re.search(salary_pattern, response_text, re.IGNORECASE)
-        if salary_match:
-            salary_estimation = salary_match.group(1).strip()
-        
-        # Extract should_apply decision
-        should_apply = False
-        # Corrected regex
-        apply_pattern = r'\*\*Should Apply:\*\*\s*(YES|NO)'
-        apply_match = re.search(apply_pattern, response_text, re.IGNORECASE)
-        if apply_match:
-            should_apply = apply_match.group(1).upper() == 'YES'
-        
-        # Extract recommendation
-        # Corrected regex and more robust lookahead
-        rec_pattern = r'\*\*Recommendation:\*\*\s*(.*?)(?=\n\s*\*\*Key Points:\*\*|$)'
-        rec_match = re.search(rec_pattern, response_text, re.DOTALL | re.IGNORECASE)
-        recommendation = rec_match.group(1).strip() if rec_match else ""
-        
-        # Extract Key Points
-        key_points = []
-        # Corrected regex and more robust lookahead to the end of the string
-        key_points_pattern = r'\*\*Key Points:\*\*\s*(.*?)(?=\s*$)' 
-        key_points_match = re.search(key_points_pattern, response_text, re.DOTALL | re.IGNORECASE)
-        if key_points_match:
-            key_points_text = key_points_match.group(1).strip() # Strip trailing/leading whitespace from the block
-            key_points = [p.strip('- *').strip() for p in key_points_text.split('\n') if p.strip()]
+        try:
+            result = parse_structured_analysis(response_text).to_dict()
+        except AnalysisValidationError as e:
+            # Old client libraries ignore the schema and may answer in markdown
+            print(f"⚠️ Structured output invalid ({str(e)}), falling back to markdown parser")
+            result = parse_analysis(response_text)
+            result['structured'] = False
+        scores = result.get('scores', {})
+        should_apply = result.get('should_apply', False)
 
-        result = {
-            'scores': scores,
-            'meaningfulness_score': scores.get('meaningfulness_score', 0),
-            'meaningfulness_justification': justification,
-            'salary_estimation': salary_estimation,
-            'should_apply': should_apply,
-            'recommendation': recommendation,
-            'key_points': key_points, 
-            'total_score': scores.get('final_score', 0)
-        }
-        
         print(f"\n✅ Parsed analysis:")
         print(f"Meaningfulness Score: {result['meaningfulness_score']}/10")
         print(f"Justification: {result['meaningfulness_justification']}")
@@ -1517,23 +1720,95 @@ Description (first 1500 chars): {job['description'][:1500]}...
         print(f"Should Apply: {'YES' if should_apply else 'NO'}")
         print(f"Total Score: {result['total_score']}/10")
         
+        # Only schema-valid analyses are cached, as in analyze_jobs_batch; a markdown
+        # fallback is often a failed parse and would stick for the whole cache TTL
+        if response_ok and result.get('structured'):
+            llm_cache.set(cache_key, result)
+        
         return result
         
     except Exception as e:
         print(f"❌ API error: {str(e)}")
         traceback.print_exc() # Add traceback for better debugging
-        return {
-            'scores': {},
-            'should_apply': False,
-            'recommendation': f'Error analyzing job: {str(e)}',
-            'key_points': [], # Changed from benefits
-            'total_score': 0,
-            'meaningfulness_score': 0,
-            'meaningfulness_justification': f'Error: {str(e)}'
-        }
+        return error_analysis(e)
+
+def error_analysis(error):
+    """Zero-score placeholder for a job that could not be analyzed (never cached or stored)"""
+    return {
+        'error': True,
+        'scores': {},
+        'should_apply': False,
+        'recommendation': f'Error analyzing job: {str(error)}',
+        'key_points': [], # Changed from benefits
+        'total_score': 0,
+        'meaningfulness_score': 0,
+        'meaningfulness_justification': f'Error: {str(error)}'
+    }
+
+BATCH_STATS = BatchScoringStats()
+
+def request_relevance_batch(jobs):
+    """One Gemini request analysing every job in `jobs` (numbered 1..N); returns the raw reply"""
+    job_blocks = "\n\n".join(f"### Job {ref}\n{format_job_details(job)}" for ref, job in enumerate(jobs, start=1))
+    prompt = f"""Analyze each of the following {len(jobs)} job postings independently, based on the candidate's CV, preferences, and the criteria for a 'meaningful' job. Provide a structured analysis for every job.
+
+{RELEVANCE_CANDIDATE_PROFILE}
+{RELEVANCE_INSTRUCTIONS}
+**Jobs:**
+{job_blocks}
+
+**Output Format:**
+Respond with a JSON array (no markdown) containing one object per job, each with "job_ref" (the job number above) and these keys:
+{RELEVANCE_OUTPUT_FIELDS}"""
+    estimated_tokens = len(prompt) // 4
+    if estimated_tokens > BATCH_MAX_PROMPT_TOKENS:
+        raise ContextLimitError(f"~{estimated_tokens} prompt tokens > BATCH_MAX_PROMPT_TOKENS")
+
+    print(f"⚡ Sending batch of {len(jobs)} jobs to Gemini API (~{estimated_tokens} prompt tokens)...")
+    response = gemini_model.generate_content(prompt, generation_config=relevance_generation_config(BATCH_RESPONSE_SCHEMA))
+    if response.candidates:
+        finish_reason = response.candidates[0].finish_reason
+        if getattr(finish_reason, 'name', str(finish_reason)) == 'MAX_TOKENS':
+            raise ContextLimitError("batch reply truncated at max output tokens")
+    if not response.parts:
+        raise AnalysisValidationError(f"empty or blocked batch response: {response.prompt_feedback}")
+    return "".join(part.text for part in response.parts)
+
+def analyze_jobs_batch(jobs, cv_content):
+    """Analyze several jobs with one Gemini request; returns analyses aligned with `jobs`.
+
+    Cached jobs are skipped, oversized batches are split, rate-limited batches are retried
+    with backoff, and any job missing from the batch reply is re-scored on its own with
+    analyze_job_relevance.
+    """
+    if not gemini_model:
+        return [analyze_job_relevance(job, cv_content) for job in jobs]
+
+    llm_cache = get_llm_cache()
+    cache_keys = [make_cache_key(NEW_GEMINI_MODEL_ID, RELEVANCE_PROMPT_VERSION, cv_content, job) for job in jobs]
+    results = [llm_cache.get(key) for key in cache_keys]
+    pending = [index for index, result in enumerate(results) if result is None]
+    if len(pending) < len(jobs):
+        print(f"💾 Using cached analyses for {len(jobs) - len(pending)}/{len(jobs)} jobs (no LLM call)")
+
+    analyses = analyze_in_batches(
+        [jobs[index] for index in pending],
+        request_relevance_batch,
+        lambda job: analyze_job_relevance(job, cv_content),
+        BATCH_STATS,
+        # Marked 'error' so the persist stage drops it instead of saving a zero score
+        on_error=lambda job, error: error_analysis(error)
+    )
+    for index, analysis in zip(pending, analyses):
+        results[index] = analysis
+        if analysis.get('structured'):
+            llm_cache.set(cache_keys[index], analysis)
+        print(f"✅ {jobs[index]['title']}: final {analysis.get('total_score', 0)}/10, "
+              f"should apply: {'YES' if analysis.get('should_apply') else 'NO'}")
+    return results
 
 def parse_analysis(response):
-    """Parse the structured analysis response"""
+    """Parse a markdown analysis response (fallback when the reply is not valid JSON)"""
     print("\n📖 Parsing analysis response...")
     try:
         # Extract all scores using improved regex pattern
@@ -1585,6 +1860,12 @@ def parse_analysis(response):
         if apply_match:
             should_apply = apply_match.group(1).upper() == 'YES'
 
+        # Extract salary estimation
+        salary_estimation = ""
+        salary_match = re.search(r'\*\*Salary Estimation:\*\*\s*([0-9,\-\s]+EUR)', response, re.IGNORECASE)
+        if salary_match:
+            salary_estimation = salary_match.group(1).strip()
+
         result = {
             'scores': scores,
             'meaningfulness_score': scores.get('meaningfulness_score', 0),
@@ -1659,8 +1940,11 @@ def scroll_for_jobs(driver):
         print("📜 Falling back to manual scrolling method")
         return scroll_fallback_method(driver)
 
-def scroll_and_get_jobs(driver, container):
-    """Scroll container and get job cards"""
+# Card count only, so polling the list while it loads never ships element references back
+COUNT_JOB_CARDS_JS = "return arguments[0].querySelectorAll('div.job-card-container').length;"
+
+def scroll_job_list(driver, container):
+    """Scroll container until its job cards are loaded; returns how many cards it holds"""
     print("\n📜 Scrolling for jobs...")
     last_height = driver.execute_script("return arguments[0].scrollHeight", container)
     scroll_attempts = 0
@@ -1676,20 +1960,21 @@ def scroll_and_get_jobs(driver, container):
                 });
             """, container)
             
-            # Wait for content to load
-            time.sleep(random.uniform(1.0, 1.5))
+            # Wait until lazy-loaded cards stop mutating the list
+            wait_for_mutation_quiescence(driver, container, quiet_ms=400, timeout=5)
+            jitter(0.3, 0.8)
             
             # Get new scroll height
             new_height = driver.execute_script("return arguments[0].scrollHeight", container)
             
-            # Get visible job cards
-            job_cards = container.find_elements(By.CSS_SELECTOR, "div.job-card-container")
-            print(f"Found {len(job_cards)} visible jobs")
+            # Count visible job cards
+            card_count = driver.execute_script(COUNT_JOB_CARDS_JS, container)
+            print(f"Found {card_count} visible jobs")
             
             # Check if we've loaded enough jobs
-            if len(job_cards) >= 24:  # LinkedIn typically shows 25 jobs per page
+            if card_count >= 24:  # LinkedIn typically shows 25 jobs per page
                 print("✅ Found full page of jobs")
-                return job_cards
+                return card_count
             
             # Check if we've reached the bottom
             if new_height == last_height:
@@ -1704,72 +1989,20 @@ def scroll_and_get_jobs(driver, container):
             print(f"❌ Scroll error: {str(e)}")
             scroll_attempts += 1
     
-    # Return whatever jobs we found
-    return container.find_elements(By.CSS_SELECTOR, "div.job-card-container")
+    # Report whatever jobs we found
+    return driver.execute_script(COUNT_JOB_CARDS_JS, container)
 
 def save_analyzed_jobs(jobs):
-    try:
-        # Define file paths
-        all_jobs_file = 'scraped_jobs.json'
-        apply_jobs_file = 'apply_jobs.json'  # New file for jobs to apply to
-        
-        print(f"\n💾 Attempting to save {len(jobs)} jobs...")
-        
-        # Load existing jobs from both files
-        existing_jobs = []
-        apply_jobs = []
-        
-        if os.path.exists(all_jobs_file):
-            with open(all_jobs_file, 'r', encoding='utf-8') as f:
-                try:
-                    existing_jobs = json.load(f)
-                except json.JSONDecodeError:
-                    existing_jobs = []
-                    
-        if os.path.exists(apply_jobs_file):
-            with open(apply_jobs_file, 'r', encoding='utf-8') as f:
-                try:
-                    apply_jobs = json.load(f)
-                except json.JSONDecodeError:
-                    apply_jobs = []
-        
-        # Process new jobs
-        existing_ids = {job.get('id') for job in existing_jobs}
-        apply_ids = {job.get('id') for job in apply_jobs}
-        
-        for job in jobs:
-            job_id = job.get('id')
-            
-            # Add to main jobs file if new
-            if job_id not in existing_ids:
-                existing_jobs.append(job)
-                
-            # Add to apply jobs file if should_apply is True
-            if job.get('analysis', {}).get('should_apply') and job_id not in apply_ids:
-                apply_jobs.append(job)
-                print(f"✨ Job {job.get('title')} marked for application!")
-        
-        # Save both files
-        with open(all_jobs_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_jobs, f, indent=2, ensure_ascii=False)
-            
-        with open(apply_jobs_file, 'w', encoding='utf-8') as f:
-            json.dump(apply_jobs, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Saved {len(existing_jobs)} total jobs")
-        print(f"✅ Saved {len(apply_jobs)} jobs to apply to")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error saving jobs: {str(e)}")
-        return False
+    """Save analyzed jobs to the job store (replaces scraped_jobs.json / apply_jobs.json)"""
+    print(f"\n💾 Attempting to save {len(jobs)} jobs...")
+    return save_jobs(jobs, easy_apply=None)
 
 def go_to_next_page(driver):
     """Handle pagination with better debugging"""
     try:
-        # First scroll to bottom smoothly
+        # First scroll to bottom so the pagination controls render
         driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'smooth'});")
-        time.sleep(2)
+        wait_for_mutation_quiescence(driver, quiet_ms=300, timeout=3)
         
         # Try to find the next button with multiple approaches
         next_button_locators = [
@@ -1794,10 +2027,13 @@ def go_to_next_page(driver):
                     print(f"Aria-label: {next_button.get_attribute('aria-label')}")
                     
                     # Click the button
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", next_button)
-                    time.sleep(2)
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+                    jitter(0.5, 1.5)
                     next_button.click()
                     print("✅ Successfully clicked next button")
+                    # Wait for the old job list to be replaced rather than a fixed pause
+                    wait_for_network_idle(driver, idle_ms=300, timeout=5)
+                    wait_for_mutation_quiescence(driver, quiet_ms=400, timeout=5)
                     return True
                     
             except Exception as e:
@@ -1809,23 +2045,26 @@ def go_to_next_page(driver):
         print(f"❌ Pagination error: {str(e)}")
         return False
 
-def main():
+def main(resume=False):
     print("\n🚀 Starting LinkedIn job scraper...")
     options = ChromeOptions()
     options.add_argument("--start-maximized")
     options.add_argument("--window-size=1400,900")
+    apply_profile(options, "linkedin-scraper")
     
     try:
         print("1. Initializing Chrome driver...")
-        driver = uc.Chrome(options=options)
+        driver, bandwidth = create_lean_driver(lambda opts: uc.Chrome(options=opts), options, 'scrape')
         driver.maximize_window()
         
-        print("2. Starting login sequence...")
-        sign_in(driver)
+        print("2. Restoring session (full login only if needed)...")
+        ensure_signed_in(driver, LINKEDIN_SESSION, sign_in)
         
         # Get job listings with the new format
-        jobs = get_job_listings(driver)
+        jobs = get_job_listings(driver, resume=resume)
         print(f"\n✅ Successfully processed {len(jobs)} jobs")
+        print(f"💾 LLM cache: {get_llm_cache().stats()}")
+        print(bandwidth.report(driver))
         
     except Exception as e:
         print(f"\n❌ Critical error: {str(e)}")
@@ -1837,4 +2076,5 @@ def main():
         print("\n✅ Script completed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # --resume continues each collection from its run state instead of page 1
+    main(resume="--resume" in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Persistent on-disk cache for LLM job analyses.
+
+Entries are keyed on a hash of (model id, prompt template version, CV text hash,
+job title/company/description), so re-scoring an unchanged job with an unchanged
+CV and prompt costs no LLM call. Entries expire after a TTL and the cache is
+trimmed least-recently-used first when it grows past its entry or byte limits.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(SCRIPT_DIR, "llm_cache.db"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30")) * 24 * 3600
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed);
+"""
+
+def text_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+def make_cache_key(model_id, prompt_version, cv_text, job):
+    """Hash of everything that can change the model's answer for a job"""
+    payload = json.dumps([
+        model_id,
+        prompt_version,
+        text_hash(cv_text),
+        job.get('title', ''),
+        job.get('company', ''),
+        job.get('description', '')
+    ], ensure_ascii=False)
+    return text_hash(payload)
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL, LRU size limits and hit/miss counters"""
+
+    def __init__(self, db_path=LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                 max_entries=LLM_CACHE_MAX_ENTRIES, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value (JSON-decoded) or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value):
+        """Store a JSON-serializable value, then trim the cache back under its limits"""
+        encoded = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO responses (key, value, size, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value, size = excluded.size,
+                    created_at = excluded.created_at, last_accessed = excluded.last_accessed
+                """,
+                (key, encoded, len(encoded.encode("utf-8")), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least-recently-used ones past the entry/byte limits"""
+        if self.ttl_seconds:
+            self.evictions += self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+
+        count, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_accessed ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            count -= 1
+            total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+        self.evictions += len(to_delete)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(hit_rate, 1),
+            'evictions': self.evictions,
+            'entries': len(self)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_llm_cache(db_path=LLM_CACHE_PATH):
+    """Process-wide shared LLM response cache"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None or _shared_cache.db_path != db_path:
+            _shared_cache = LLMResponseCache(db_path)
+        return _shared_cache
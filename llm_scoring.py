@@ -0,0 +1,128 @@
+"""
+Concurrent LLM scoring with a token-bucket rate limiter.
+
+RateLimiter enforces per-minute/per-hour token and request budgets across all
+worker threads; call_with_backoff retries rate-limited (429) calls with
+exponential backoff; ScoringPool runs relevance requests on a thread pool so the
+browser loop can keep scraping while earlier jobs are still being scored.
+"""
+import re
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class TokenBucket:
+    """Classic token bucket: `capacity` tokens refilled evenly over `period` seconds"""
+
+    def __init__(self, capacity, period, clock=time.monotonic):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` tokens are available (0 if they are available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # A single oversized request must not block forever
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+class RateLimiter:
+    """Enforces token and request budgets per minute and per hour; thread-safe"""
+
+    def __init__(self, tokens_per_minute=None, tokens_per_hour=None,
+                 requests_per_minute=None, requests_per_hour=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.token_buckets = [TokenBucket(limit, period, clock) for limit, period in
+                              ((tokens_per_minute, 60), (tokens_per_hour, 3600)) if limit]
+        self.request_buckets = [TokenBucket(limit, period, clock) for limit, period in
+                                ((requests_per_minute, 60), (requests_per_hour, 3600)) if limit]
+        self.waited_seconds = 0.0
+
+    def acquire(self, tokens):
+        """Block until one request carrying `tokens` tokens fits in every budget, then consume it"""
+        while True:
+            with self._lock:
+                wait = max(
+                    [bucket.wait_time(tokens) for bucket in self.token_buckets] +
+                    [bucket.wait_time(1) for bucket in self.request_buckets] + [0.0]
+                )
+                if wait <= 0:
+                    for bucket in self.token_buckets:
+                        bucket.consume(tokens)
+                    for bucket in self.request_buckets:
+                        bucket.consume(1)
+                    return
+            self.waited_seconds += wait
+            self.sleep(wait)
+
+def is_rate_limit_error(error):
+    """True for HTTP 429 / quota-exhausted errors from the LLM client"""
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in ("429", "resourceexhausted", "resource exhausted", "rate limit", "quota"))
+
+def is_transient_error(error):
+    """True for 429s and for server-side errors (5xx, unavailable, deadline exceeded) worth retrying"""
+    text = f"{type(error).__name__} {error}".lower()
+    return is_rate_limit_error(error) or bool(re.search(r'\b50[0234]\b', text)) or any(marker in text for marker in (
+        "internal error", "internalservererror", "serviceunavailable", "service unavailable",
+        "deadline exceeded", "deadlineexceeded", "timed out", "timeout"))
+
+def retry_after_seconds(error):
+    """Server-suggested retry delay from a 429 error message, if present"""
+    match = re.search(r'retry_delay\s*\{\s*seconds:\s*(\d+)', str(error)) or \
+        re.search(r'retry[- ]after[^\d]*(\d+)', str(error), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+def call_with_backoff(fn, limiter=None, tokens=0, max_retries=5, base_delay=2.0, max_delay=60.0, sleep=time.sleep,
+                      retry_on=is_rate_limit_error):
+    """Call fn() under the rate limiter, retrying 429s (or whatever retry_on accepts) with exponential backoff and jitter"""
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.acquire(tokens)
+        try:
+            return fn()
+        except Exception as e:
+            if not retry_on(e) or attempt == max_retries:
+                raise
+            delay = retry_after_seconds(e) or min(max_delay, base_delay * (2 ** attempt))
+            delay += random.uniform(0, delay * 0.25)
+            reason = "Rate limited" if is_rate_limit_error(e) else "Transient error"
+            print(f"⏳ {reason} (attempt {attempt + 1}/{max_retries}), retrying in {delay:.1f}s")
+            sleep(delay)
+
+class ScoringPool:
+    """Thread pool for LLM scoring calls that tracks what is still in flight"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scorer")
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=exc_type is None)
+        return False
@@ -0,0 +1,207 @@
+"""
+Shared wait layer for the scrapers.
+
+Waits on real page conditions (DOM readiness, network idle, DOM mutation
+quiescence, selectors) instead of fixed time.sleep calls. Fixed pauses only
+remain as an optional stealth jitter, enabled with SCRAPER_STEALTH_JITTER=1.
+"""
+import os
+import json
+import time
+import random
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+DEFAULT_TIMEOUT = 15
+POLL_FREQUENCY = 0.1
+STEALTH_JITTER = os.getenv("SCRAPER_STEALTH_JITTER", "0").lower() in ("1", "true", "yes")
+
+# Long-lived connections never finish loading, so they must not block network idle
+IGNORED_REQUEST_TYPES = {"EventSource", "WebSocket", "Ping", "Manifest", "Other"}
+
+_performance_listeners = []
+
+def jitter(low, high):
+    """Human-like pause for stealth; a no-op unless SCRAPER_STEALTH_JITTER is enabled"""
+    if STEALTH_JITTER:
+        time.sleep(random.uniform(low, high))
+
+def enable_network_tracking(options):
+    """Turn on Chrome performance logging so CDP Network events can be read back"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+def add_performance_listener(callback):
+    """Register a callback that receives every CDP event read from the performance log"""
+    if callback not in _performance_listeners:
+        _performance_listeners.append(callback)
+
+def read_performance_events(driver):
+    """Drain the performance log and return the parsed CDP events (None if logging is off)"""
+    try:
+        entries = driver.get_log("performance")
+    except (WebDriverException, ValueError):
+        return None
+
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        events.append(message)
+        for listener in _performance_listeners:
+            try:
+                listener(message)
+            except Exception as e:
+                print(f"⚠️ Performance listener failed: {str(e)}")
+    return events
+
+def wait_for_dom_ready(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait until document.readyState is complete"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return True
+    except TimeoutException:
+        print(f"⚠️ DOM not ready after {timeout}s")
+        return False
+
+def wait_for_selector(driver, selector, timeout=DEFAULT_TIMEOUT, visible=False, by=By.CSS_SELECTOR):
+    """Wait for a single selector; returns the element or None on timeout"""
+    condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition((by, selector)))
+    except TimeoutException:
+        return None
+
+def wait_for_any_selector(driver, selectors, timeout=DEFAULT_TIMEOUT):
+    """Wait until any of the CSS selectors matches; returns the first matching selector or None.
+
+    All selectors are checked inside the page, so each poll is a single round trip.
+    """
+    script = """
+        for (const selector of arguments[0]) {
+            try {
+                if (document.querySelector(selector)) return selector;
+            } catch (e) {}
+        }
+        return null;
+    """
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: d.execute_script(script, list(selectors))
+        )
+    except TimeoutException:
+        return None
+
+def wait_for_mutation_quiescence(driver, element=None, quiet_ms=500, timeout=10):
+    """Wait until the element (or the whole document) has had no DOM mutations for quiet_ms.
+
+    A MutationObserver runs inside the page, so this costs one round trip.
+    Returns True once quiet, False if mutations were still happening at timeout.
+    """
+    script = """
+        const target = arguments[0] || document.body;
+        const quietMs = arguments[1];
+        const timeoutMs = arguments[2];
+        const done = arguments[arguments.length - 1];
+        if (!target) { done(true); return; }
+        let quietTimer = null;
+        let finished = false;
+        const finish = (result) => {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(timeoutTimer);
+            done(result);
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(() => finish(true), quietMs);
+        });
+        observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+        quietTimer = setTimeout(() => finish(true), quietMs);
+        const timeoutTimer = setTimeout(() => finish(false), timeoutMs);
+    """
+    # The script timeout is driver-wide, so the caller's value is put back afterwards
+    try:
+        previous_timeout = driver.timeouts.script
+    except (AttributeError, WebDriverException):
+        previous_timeout = None
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(script, element, int(quiet_ms), int(timeout * 1000)))
+    except (TimeoutException, WebDriverException) as e:
+        print(f"⚠️ Mutation wait failed: {str(e)}")
+        return False
+    finally:
+        if previous_timeout is not None:
+            try:
+                driver.set_script_timeout(previous_timeout)
+            except WebDriverException:
+                pass
+
+def wait_for_network_idle(driver, idle_ms=500, timeout=DEFAULT_TIMEOUT, max_inflight=0):
+    """Wait until no network requests have been in flight for idle_ms.
+
+    Uses CDP Network events from the performance log (see enable_network_tracking).
+    Falls back to watching the Resource Timing buffer when logging is not enabled.
+    """
+    events = read_performance_events(driver)
+    if events is None:
+        return _wait_for_resource_timing_idle(driver, idle_ms, timeout)
+
+    inflight = set()
+    deadline = time.time() + timeout
+    idle_since = time.time()
+
+    while time.time() < deadline:
+        for event in events:
+            method = event.get("method")
+            params = event.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                if params.get("type") not in IGNORED_REQUEST_TYPES:
+                    inflight.add(request_id)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                inflight.discard(request_id)
+
+        if len(inflight) > max_inflight:
+            idle_since = time.time()
+        elif (time.time() - idle_since) * 1000 >= idle_ms:
+            return True
+        time.sleep(POLL_FREQUENCY)
+        events = read_performance_events(driver) or []
+
+    print(f"⚠️ Network not idle after {timeout}s ({len(inflight)} requests in flight)")
+    return False
+
+def _wait_for_resource_timing_idle(driver, idle_ms, timeout):
+    """Fallback network idle: resource timing entry count unchanged for idle_ms"""
+    deadline = time.time() + timeout
+    last_count = -1
+    stable_since = time.time()
+    while time.time() < deadline:
+        try:
+            count = driver.execute_script("return performance.getEntriesByType('resource').length")
+        except WebDriverException:
+            return False
+        if count != last_count:
+            last_count = count
+            stable_since = time.time()
+        elif (time.time() - stable_since) * 1000 >= idle_ms:
+            return True
+        time.sleep(POLL_FREQUENCY)
+    return False
+
+def wait_for_page(driver, selectors=None, timeout=DEFAULT_TIMEOUT, idle_ms=300):
+    """Common post-navigation wait: DOM ready, then a content selector, then a short network idle"""
+    wait_for_dom_ready(driver, timeout)
+    matched = wait_for_any_selector(driver, selectors, timeout) if selectors else None
+    wait_for_network_idle(driver, idle_ms=idle_ms, timeout=min(timeout, 5))
+    return matched
@@ -0,0 +1,168 @@
+"""
+Local pre-LLM relevance filter.
+
+Scores batches of jobs against cv_text.txt with a NumPy TF-IDF cosine similarity
+plus title keyword rules, and prunes obvious mismatches (e.g. sales roles in the
+"recommended" collection) before they reach analyze_job_relevance.
+"""
+import os
+import re
+from collections import Counter
+import numpy as np
+
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "1").lower() in ("1", "true", "yes")
+PREFILTER_THRESHOLD = float(os.getenv("PREFILTER_THRESHOLD", "0.05"))
+PREFILTER_BATCH_SIZE = int(os.getenv("PREFILTER_BATCH_SIZE", "5"))
+
+# Title rules: a negative title is pruned unless it also looks like a data role
+NEGATIVE_TITLE_PATTERN = re.compile(
+    r'\b(sales|account (?:executive|manager)|business development|bdr|sdr|recruit(?:er|ment)|talent acquisition|'
+    r'customer success|customer service|telemarketing|store manager|retail|cashier|nurse|driver|warehouse)\b',
+    re.IGNORECASE
+)
+POSITIVE_TITLE_PATTERN = re.compile(
+    r'\b(data|analyst|analytics|scientist|machine learning|ml|ai|bi|business intelligence|insights?|'
+    r'statistic\w*|quant\w*|mlops|python)\b',
+    re.IGNORECASE
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*")
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have in is it its of on or our that the their this to
+was we were will with you your they them who what when where which while about into over than then
+also can may not all any more most other some such only own same so very de la el en y los las del
+""".split())
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS and len(token) > 1]
+
+def job_text(job):
+    return f"{job.get('title', '')} {job.get('title', '')} {job.get('description', '')}"
+
+class RelevancePrefilter:
+    """Batch TF-IDF similarity to the CV plus keyword rules; keeps running pruning stats"""
+
+    def __init__(self, cv_text, threshold=PREFILTER_THRESHOLD):
+        self.cv_tokens = tokenize(cv_text)
+        self.threshold = threshold
+        # Document frequencies accumulate over the run so IDF improves with every batch
+        self.doc_freq = Counter(set(self.cv_tokens))
+        self.n_docs = 1
+        self.scored = 0
+        self.pruned = 0
+        self.prune_reasons = Counter()
+
+    def similarities(self, jobs):
+        """Cosine similarity of every job in the batch to the CV, computed as one matrix product"""
+        docs = [tokenize(job_text(job)) for job in jobs]
+        for tokens in docs:
+            self.doc_freq.update(set(tokens))
+        self.n_docs += len(docs)
+
+        vocab = {}
+        for tokens in [self.cv_tokens] + docs:
+            for token in tokens:
+                vocab.setdefault(token, len(vocab))
+        if not vocab:
+            return np.zeros(len(jobs))
+
+        rows, cols = [], []
+        for row, tokens in enumerate([self.cv_tokens] + docs):
+            rows.extend([row] * len(tokens))
+            cols.extend(vocab[token] for token in tokens)
+        counts = np.zeros((len(docs) + 1, len(vocab)))
+        np.add.at(counts, (np.array(rows, dtype=int), np.array(cols, dtype=int)), 1)
+
+        df = np.array([self.doc_freq[token] for token in vocab], dtype=float)
+        idf = np.log((1 + self.n_docs) / (1 + df)) + 1
+        weights = np.log1p(counts) * idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        weights = np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0)
+        return weights[1:] @ weights[0]
+
+    def score_batch(self, jobs):
+        """Return (score, keep, reason) for every job in the batch"""
+        if not jobs:
+            return []
+        sims = self.similarities(jobs)
+        decisions = []
+        for job, sim in zip(jobs, sims):
+            title = job.get('title', '')
+            positive = bool(POSITIVE_TITLE_PATTERN.search(title))
+            negative = NEGATIVE_TITLE_PATTERN.search(title)
+            score = float(sim) + (0.1 if positive else 0.0)
+            if negative and not positive:
+                decisions.append((score, False, f"title rule: '{negative.group(0)}'"))
+            elif not positive and sim < self.threshold:
+                decisions.append((score, False, f"similarity {sim:.3f} < {self.threshold}"))
+            else:
+                decisions.append((score, True, ""))
+        return decisions
+
+    def filter_batch(self, items, job_of=lambda item: item):
+        """Split items into (kept, pruned); job_of extracts the job dict from each item"""
+        if not PREFILTER_ENABLED or not items:
+            return list(items), []
+        kept, pruned = [], []
+        for item, (score, keep, reason) in zip(items, self.score_batch([job_of(item) for item in items])):
+            job = job_of(item)
+            job['prefilter_score'] = round(score, 4)
+            if keep:
+                kept.append(item)
+            else:
+                job['prefilter_reason'] = reason
+                pruned.append(item)
+                self.prune_reasons[reason.split(':')[0].split(' ')[0]] += 1
+                print(f"✂️ Prefilter pruned '{job.get('title', '')}' ({reason})")
+        self.scored += len(items)
+        self.pruned += len(pruned)
+        print(f"✂️ Prefilter batch: kept {len(kept)}/{len(items)} (run total: pruned {self.pruned}/{self.scored})")
+        return kept, pruned
+
+    def evaluate_against_history(self, labelled):
+        """Compare prefilter decisions with past LLM decisions.
+
+        labelled: iterable of (job, llm_said_apply). Precision is the share of pruned jobs
+        the LLM also rejected; 'lost' counts pruned jobs the LLM would have recommended.
+        """
+        labelled = [(job, bool(apply)) for job, apply in labelled if job.get('description')]
+        if not labelled:
+            return None
+        # Score on a copy so evaluation does not skew this run's IDF statistics
+        evaluator = RelevancePrefilter("", self.threshold)
+        evaluator.cv_tokens = self.cv_tokens
+        evaluator.doc_freq = Counter(self.doc_freq)
+        evaluator.n_docs = self.n_docs
+        decisions = []
+        for start in range(0, len(labelled), 50):
+            decisions.extend(evaluator.score_batch([job for job, _ in labelled[start:start + 50]]))
+        pruned_labels = [apply for (_, apply), (_, keep, _) in zip(labelled, decisions) if not keep]
+        lost = sum(pruned_labels)
+        return {
+            'evaluated': len(labelled),
+            'would_prune': len(pruned_labels),
+            'precision': round(1 - lost / len(pruned_labels), 3) if pruned_labels else None,
+            'lost_recommended': lost
+        }
+
+    def report(self):
+        rate = (self.pruned / self.scored * 100) if self.scored else 0.0
+        return f"✂️ Prefilter: pruned {self.pruned}/{self.scored} jobs ({rate:.0f}%) {dict(self.prune_reasons)}"
+
+def llm_decision(analysis, status):
+    """Past LLM verdict from a stored analysis (LinkedIn should_apply, Seek score thresholds)"""
+    if isinstance(analysis, dict) and 'should_apply' in analysis:
+        return bool(analysis['should_apply'])
+    return status in ('to_apply', 'matched', 'applied')
+
+def log_prefilter_precision(prefilter, store, source):
+    """Print how the current prefilter would have done against past LLM decisions in the store"""
+    history = [(job, llm_decision(analysis, status)) for job, analysis, status in store.analyzed_jobs(source, limit=2000)]
+    result = prefilter.evaluate_against_history(history)
+    if not result:
+        print("✂️ Prefilter: no past LLM decisions to evaluate against yet")
+        return None
+    precision = "n/a" if result['precision'] is None else f"{result['precision']:.0%}"
+    print(f"✂️ Prefilter vs {result['evaluated']} past LLM decisions: would prune {result['would_prune']}, "
+          f"precision {precision}, recommended jobs lost {result['lost_recommended']}")
+    return result
@@ -0,0 +1,220 @@
+"""
+Hard filters for Seek jobs (citizenship, contract length), as a precompiled rule set.
+
+All rules share one combined alternation regex, so a description is scanned
+once no matter how many rules there are, and a whole page of descriptions can
+be scanned in a single pass. Dates found by the scan are parsed together, each
+distinct date string only once.
+
+The same rules run at two levels: on listing records before any detail page is
+opened, and on the full description once a detail page is read. A rule only
+runs at listing level on fields the detail check also looks at (the title), so
+a listing reject is always a job the detail check would have rejected too.
+Set SEEK_LISTING_TEASER_RULES=1 to also run the description rules on the
+search-result teaser; that rejects more jobs early, but teasers are not part
+of the detail checks, so the results are no longer identical.
+"""
+import os
+import re
+import time
+import bisect
+import functools
+import datetime
+from collections import Counter
+from dateutil.relativedelta import relativedelta
+
+SEEK_LISTING_TEASER_RULES = os.getenv("SEEK_LISTING_TEASER_RULES", "0").lower() in ("1", "true", "yes")
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june',
+          'july', 'august', 'september', 'october', 'november', 'december']
+MONTH_NUMBERS = {name: i + 1 for i, name in enumerate(MONTHS)}
+
+# Patterns are kept as "lead character + tail" so the combined scan below can
+# start with a plain character class, which the regex engine searches fast
+CITIZENSHIP_TAIL = r'ustralian\s+citizen'
+CITIZENSHIP_REGEX = 'a' + CITIZENSHIP_TAIL
+DATE_TAIL = (
+    r'\d?(?:st|nd|rd|th)?\s+(?:of\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|'
+    r'Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+)
+DATE_REGEX = r'\d' + DATE_TAIL
+# Case-sensitive, as in the original substring checks
+SKIP_PHRASES = [
+    "9 month ", "9-month", "9month", "9 Month",
+    "12 month", "12-month", "12month", "12 Month",
+    "24 month", "24-month", "24month", "24 Month"
+]
+
+CITIZENSHIP_PATTERN = re.compile(CITIZENSHIP_REGEX, re.IGNORECASE)
+DATE_PATTERN = re.compile(DATE_REGEX, re.IGNORECASE)
+SKIP_PHRASE_PATTERN = re.compile("|".join(re.escape(phrase) for phrase in SKIP_PHRASES))
+
+def _phrase_tails(phrases):
+    """Phrases grouped by their first character, each group behind a lookbehind on that character"""
+    by_lead = {}
+    for phrase in phrases:
+        by_lead.setdefault(phrase[0], []).append(re.escape(phrase[1:]))
+    return "|".join(f"(?<={re.escape(lead)})(?:{'|'.join(tails)})" for lead, tails in by_lead.items())
+
+# One pass over the text for every rule. Alternatives are tried in this order
+# at each position; no two of them can match overlapping text, so the scan
+# finds the same matches as running each pattern on its own. Every match starts
+# with a digit (dates, phrases) or an "a" (citizenship); that lead character is
+# matched first and the tails check it with a lookbehind. The group holds the
+# tail only, so the matched text is match.group(0).
+COMBINED_PATTERN = re.compile(
+    "[0-9Aa](?:"
+    f"(?<=[Aa])(?i:(?P<citizenship>{CITIZENSHIP_TAIL}))"
+    f"|(?<=[0-9])(?:(?i:(?P<date>{DATE_TAIL}))|(?P<phrase>{_phrase_tails(SKIP_PHRASES)}))"
+    ")"
+)
+assert all(phrase[0].isdigit() for phrase in SKIP_PHRASES), "phrase tails assume a leading digit"
+DAY_PATTERN = re.compile(r'\d+')
+MONTH_NAME_PATTERN = re.compile("|".join(MONTHS))
+# Never part of a match, so texts joined with it scan as one string without
+# a match crossing from one text into the next
+PAGE_SEPARATOR = "\x00"
+
+def parse_dates(date_strs):
+    """Map each distinct "14th of July"-style string to (day, month or None)"""
+    parsed = {}
+    for date_str in set(date_strs):
+        lowered = date_str.lower()
+        month = MONTH_NAME_PATTERN.search(lowered)
+        parsed[date_str] = (int(DAY_PATTERN.search(lowered).group()),
+                            MONTH_NUMBERS[month.group()] if month else None)
+    return parsed
+
+@functools.lru_cache(maxsize=4)
+def _six_months_after(today):
+    return today + relativedelta(months=6)
+
+def dates_within_six_months(date_strs, today=None):
+    """Map each distinct date string to whether it falls within six months of today.
+
+    Month names are matched as full names, so abbreviations other than "May"
+    ("14 Jan", "3 Sep") give no month and count as outside the window. That
+    quirk is kept on purpose so the contract_date counts stay comparable. Invalid
+    day/month combinations ("31 June") used to raise mid-page; they now count
+    as inside the window, so they do not skip the job.
+    """
+    today = today or datetime.date.today()
+    six_months_from_now = _six_months_after(today)
+    within = {}
+    for date_str, (day, month) in parse_dates(date_strs).items():
+        if month is None:
+            within[date_str] = False
+            continue
+        # Assume the year is the next occurrence of this date
+        year = today.year if (month > today.month or (month == today.month and day >= today.day)) else today.year + 1
+        try:
+            within[date_str] = datetime.date(year, month, day) <= six_months_from_now
+        except ValueError:
+            within[date_str] = True
+    return within
+
+def is_date_within_six_months(date_str, today=None):
+    """True if a single date string falls within six months of today"""
+    return dates_within_six_months([date_str], today)[date_str]
+
+def scan_page(texts):
+    """Matches per text for a page of texts, as [{kind: [matched strings]}], in one regex pass"""
+    joined = PAGE_SEPARATOR.join(texts)
+    starts, offset = [], 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(PAGE_SEPARATOR)
+    found = [{} for _ in texts]
+    for match in COMBINED_PATTERN.finditer(joined):
+        index = bisect.bisect_right(starts, match.start()) - 1
+        found[index].setdefault(match.lastgroup, []).append(match.group(0))
+    return found
+
+class FilterRule:
+    """A named hard filter; check(title_matches, description_matches, within) returns True when it matches.
+
+    Matches are scan_page results; within maps date strings to dates_within_six_months.
+    """
+
+    def __init__(self, name, check, message):
+        self.name = name
+        self.check = check
+        self.message = message
+
+def _citizenship(title, description, within):
+    return 'citizenship' in description
+
+def _contract_date(title, description, within):
+    return any(not within[date] for date in description.get('date', ()))
+
+def _contract_phrase(title, description, within):
+    return 'phrase' in description or 'phrase' in title
+
+# Same order and messages as the original inline checks
+RULES = [
+    FilterRule("citizenship", _citizenship, "Australian citizenship requirement"),
+    FilterRule("contract_date", _contract_date, "contract length exceeding 6 months"),
+    FilterRule("contract_phrase", _contract_phrase, "matching contract-length phrase")
+]
+
+class JobFilter:
+    """Applies RULES to listing records and detail pages, counting hits per rule and level"""
+
+    def __init__(self, rules=RULES, teaser_rules=SEEK_LISTING_TEASER_RULES, today=None):
+        self.rules = rules
+        self.teaser_rules = teaser_rules
+        self.today = today
+        self.checked = Counter()
+        self.hits = Counter()
+        self.seconds = 0.0
+
+    def check_page(self, jobs, level='detail'):
+        """Rejecting rule (or None) for each (title, description) pair, from one scan of the whole page"""
+        started = time.perf_counter()
+        # Titles and descriptions are scanned together but kept apart, since
+        # titles only feed the phrase rule (a date in a title is not a contract date)
+        scans = scan_page([title for title, _ in jobs] + [description for _, description in jobs])
+        title_scans, description_scans = scans[:len(jobs)], scans[len(jobs):]
+        within = dates_within_six_months(
+            [date for scan in description_scans for date in scan.get('date', ())], self.today
+        )
+
+        results = []
+        for title_scan, description_scan in zip(title_scans, description_scans):
+            self.checked[level] += 1
+            rejected = None
+            for rule in self.rules:
+                if rule.check(title_scan, description_scan, within):
+                    self.hits[(level, rule.name)] += 1
+                    rejected = rule
+                    break
+            results.append(rejected)
+        self.seconds += time.perf_counter() - started
+        return results
+
+    def _listing_fields(self, record):
+        return (record.get('title') or '', (record.get('teaser') or '') if self.teaser_rules else '')
+
+    def check_listings(self, records):
+        """Map job_id to the rule that rejects its listing record, for a whole page of records"""
+        records = [record for record in records if record.get('job_id')]
+        rules = self.check_page([self._listing_fields(record) for record in records], level='listing')
+        return {record['job_id']: rule for record, rule in zip(records, rules) if rule}
+
+    def check_listing(self, record):
+        """Rule that rejects a single listing record, or None"""
+        return self.check_page([self._listing_fields(record)], level='listing')[0]
+
+    def check_detail(self, title, description):
+        """Rule that rejects a job from its detail page, or None"""
+        return self.check_page([(title or '', description or '')])[0]
+
+    def report(self):
+        lines = [f"🧹 Hard filters: {self.checked['listing']} listings / {self.checked['detail']} details checked "
+                 f"in {self.seconds * 1000:.1f} ms"]
+        for level in ('listing', 'detail'):
+            for rule in self.rules:
+                count = self.hits[(level, rule.name)]
+                if count:
+                    lines.append(f"   {level:<8} {rule.name:<16} rejected: {count}")
+        return "\n".join(lines)
@@ -0,0 +1,98 @@
+"""
+Direct HTTP fetch path for Seek job detail pages.
+
+Seek job pages are server-rendered, so a pooled requests.Session carrying the
+signed-in browser's cookies can read title, description, work type and the
+applied marker without a browser navigation. parse_job_detail_html returns
+None for pages that did not render server-side; callers then fall back to
+Selenium for that job.
+"""
+import os
+import importlib.util
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+
+# lxml is the faster parser when installed
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+SEEK_HTTP_DETAILS = os.getenv("SEEK_HTTP_DETAILS", "1").lower() in ("1", "true", "yes")
+HTTP_TIMEOUT = 10
+SEEK_JOB_URL = "https://www.seek.com.au/job/{}"
+
+# Check-mark icon Seek shows next to jobs already applied to (same paths the XPath check matched)
+APPLIED_ICON_PATHS = (
+    "M12 1C5.9 1 1 5.9 1 12s4.9 11 11 11 11-4.9 11-11S18.1 1 12 1zm0 20c-5 0-9-4-9-9s4-9 9-9 9 4 9 9-4 9-9 9z",
+    "M15.3 9.3 11 13.6l-1.3-1.3c-.4-.4-1-.4-1.4 0s-.4 1 0 1.4l2 2c.2.2.5.3.7.3s.5-.1.7-.3l5-5c.4-.4.4-1 0-1.4s-1-.4-1.4 0z"
+)
+
+def create_http_session(driver=None, pool_size=10):
+    """Pooled session with retries; copies cookies and user agent from the signed-in driver"""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "en-AU,en;q=0.9"
+    })
+    if driver is not None:
+        sync_cookies(session, driver)
+        try:
+            session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+        except Exception:
+            pass
+    return session
+
+def sync_cookies(session, driver):
+    """Copy the browser's cookies for the current site into the session"""
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+def _has_applied_marker(soup):
+    message = soup.find(id="applied-date-message")
+    if message and "You applied on" in message.get_text(" "):
+        return True
+    for svg in soup.find_all("svg", class_="w75d4w1y"):
+        paths = [path.get("d", "") for path in svg.find_all("path")]
+        if len(paths) >= 2 and APPLIED_ICON_PATHS[0] in paths[0] and APPLIED_ICON_PATHS[1] in paths[1]:
+            return True
+    return False
+
+def parse_job_detail_html(html):
+    """Job detail fields from a server-rendered Seek job page, or None if the page needs JS"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    details = soup.select_one('[data-automation="jobAdDetails"]')
+    title = soup.select_one('[data-automation="job-detail-title"]')
+    if details is None or title is None:
+        return None
+    description = details.get_text("\n", strip=True)
+    if not description:
+        return None
+    work_type = soup.select_one('[data-automation="job-detail-work-type"]')
+    apply_button = soup.select_one('[data-automation="job-detail-apply"]')
+    return {
+        'title': title.get_text(" ", strip=True),
+        'description': description,
+        'work_type': work_type.get_text(" ", strip=True) if work_type else None,
+        'applied': _has_applied_marker(soup),
+        'is_casual': "Casual/Vacation" in html,
+        'quick_apply': bool(apply_button) and apply_button.get_text(" ", strip=True).lower() == "quick apply"
+    }
+
+def fetch_job_detail(session, job_id, timeout=HTTP_TIMEOUT):
+    """GET and parse one job page; None means 'use the browser for this one'"""
+    try:
+        response = session.get(SEEK_JOB_URL.format(job_id), timeout=timeout)
+    except requests.RequestException as e:
+        print(f"⚠️ HTTP fetch failed for job {job_id}: {str(e)}")
+        return None
+    if response.status_code != 200:
+        print(f"⚠️ HTTP {response.status_code} for job {job_id}, falling back to the browser")
+        return None
+    detail = parse_job_detail_html(response.text)
+    if detail is None:
+        print(f"⚠️ Job {job_id} page was not server-rendered, falling back to the browser")
+    return detail
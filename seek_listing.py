@@ -0,0 +1,102 @@
+"""
+Seek search results from the page's embedded state instead of page_source regexes.
+
+Search pages are server-rendered with `window.SEEK_REDUX_DATA = {...}`. Reading
+just the jobs array from it (one execute_script call, or straight from an HTTP
+response) gives structured listing records, so hard filters can run before any
+job detail page is opened.
+"""
+import re
+import json
+
+REDUX_STATE_PATTERN = re.compile(r'window\.SEEK_REDUX_DATA\s*=\s*')
+
+# Returns only the jobs array, so the full app state never crosses the WebDriver wire
+LISTING_STATE_JS = """
+const state = window.SEEK_REDUX_DATA;
+if (!state || !state.results) return null;
+const results = state.results.results || state.results;
+return (results && results.jobs) || null;
+"""
+
+def _first(value):
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+def _text(value):
+    """Label text from the shapes Seek uses for a field: string, {label|description}, or a list of those"""
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get('label') or value.get('description') or value.get('name')
+    return str(value).strip() if value else None
+
+def normalize_listing(job):
+    """Flat listing record from one entry of the embedded jobs array"""
+    return {
+        'job_id': str(job.get('id') or job.get('jobId') or ''),
+        'title': (job.get('title') or '').strip(),
+        'advertiser': _text(job.get('advertiser')) or _text(job.get('companyName')),
+        'location': _text(job.get('locations')) or _text(job.get('location')),
+        'listing_date': job.get('listingDate'),
+        'listing_date_display': job.get('listingDateDisplay'),
+        'work_type': _text(job.get('workTypes')) or _text(job.get('workType')),
+        'salary': _text(job.get('salaryLabel')) or _text(job.get('salary')),
+        'teaser': job.get('teaser')
+    }
+
+def normalize_listings(jobs):
+    records, seen = [], set()
+    for job in jobs or []:
+        if not isinstance(job, dict):
+            continue
+        record = normalize_listing(job)
+        if record['job_id'] and record['job_id'] not in seen:
+            seen.add(record['job_id'])
+            records.append(record)
+    return records
+
+def extract_redux_state(html):
+    """Decode the SEEK_REDUX_DATA object embedded in a search page, or None"""
+    match = REDUX_STATE_PATTERN.search(html or '')
+    if not match:
+        return None
+    payload = html[match.end():]
+    try:
+        state, _ = json.JSONDecoder().raw_decode(payload)
+    except json.JSONDecodeError:
+        # The blob is a JS literal and may contain `undefined`, which JSON does not allow
+        try:
+            state, _ = json.JSONDecoder().raw_decode(re.sub(r'(?<=[:\[,])\s*undefined\b', 'null', payload))
+        except json.JSONDecodeError:
+            return None
+    return state if isinstance(state, dict) else None
+
+def parse_listing_html(html):
+    """Listing records from a search page's HTML; None if the page has no embedded state"""
+    state = extract_redux_state(html)
+    if not state or not isinstance(state.get('results'), dict):
+        return None
+    results = state['results'].get('results', state['results'])
+    jobs = results.get('jobs') if isinstance(results, dict) else None
+    return normalize_listings(jobs) if jobs is not None else None
+
+def read_listing(driver):
+    """Listing records from the loaded search page in one script call; None if the state is missing"""
+    try:
+        jobs = driver.execute_script(LISTING_STATE_JS)
+    except Exception as e:
+        print(f"⚠️ Could not read embedded listing state: {str(e)}")
+        return None
+    return normalize_listings(jobs) if jobs is not None else None
+
+def fetch_listing(session, url, timeout=10):
+    """Listing records for a search URL fetched over HTTP (no browser); None on failure"""
+    try:
+        response = session.get(url, timeout=timeout)
+    except Exception as e:
+        print(f"⚠️ HTTP listing fetch failed for {url}: {str(e)}")
+        return None
+    if response.status_code != 200:
+        return None
+    return parse_listing_html(response.text)
@@ -1,9 +1,10 @@
 import os
+import sys
 import time
-import datetime
-from dateutil.relativedelta import relativedelta
-import json
 import re
+import queue
+import signal
+import multiprocessing
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -17,11 +18,23 @@ from pushbullet import Pushbullet
 from collections import deque
 from dotenv import load_dotenv
 import google.generativeai as genai
+from page_waits import jitter, wait_for_dom_ready, wait_for_page
+from job_store import get_job_store
+from browser_session import SEEK_SESSION, apply_profile, ensure_signed_in
+from lean_browser import create_lean_driver
+from llm_cache import get_llm_cache, make_cache_key
+from llm_scoring import RateLimiter, ScoringPool, call_with_backoff
+from relevance_prefilter import RelevancePrefilter, PREFILTER_BATCH_SIZE, log_prefilter_precision
+from seek_http import SEEK_HTTP_DETAILS, create_http_session, fetch_job_detail
+from seek_listing import fetch_listing, read_listing
+from seek_filters import JobFilter
+from checkpoint_journal import CheckpointJournal, load_state, merge_states, remove_journal
 
 # Constants
 # Update file paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CHECKPOINT_FILE = os.path.join(SCRIPT_DIR, "job_scorer_checkpoint.json")
+# Append-only journal of finished jobs/pages (<base>.jsonl plus <base>.snapshot.json)
+CHECKPOINT_JOURNAL = os.path.join(SCRIPT_DIR, "seek_checkpoint")
 ANALYZED_JOBS_FILE = os.path.join(SCRIPT_DIR, "scraped_jobs.json")
 SCORED_JOBS_FILE = os.path.join(SCRIPT_DIR, "scored_jobs.json")
 CV_FILE_PATH = os.path.join(SCRIPT_DIR, "cv_text.txt")
@@ -37,6 +50,16 @@ TOKENS_PER_MINUTE = 5000
 TOKENS_PER_HOUR = 131072
 REQUESTS_PER_MINUTE = 30
 REQUESTS_PER_HOUR = 1800
+GEMINI_MODEL_ID = "gemini-2.5-pro-exp-03-25"
+# Bump whenever the analyze_job_relevance prompt changes so cached analyses are not reused
+RELEVANCE_PROMPT_VERSION = "relevance-interest-v1"
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "4"))
+ANALYSIS_OUTPUT_TOKENS = 300  # Rough size of the four-line analysis reply
+JOB_SOURCE = "seek"
+# Worker-pool mode: >1 runs that many headless browsers, each with its own profile and login
+SEEK_WORKERS = int(os.getenv("SEEK_WORKERS", "1"))
+WORKER_CHECKPOINT_PATTERN = os.path.join(SCRIPT_DIR, "seek_worker_{}_checkpoint")
+WORKER_SHUTDOWN_TIMEOUT = 120
 
 CITY_URLS = [
     "https://www.seek.com.au/data-jobs/in-All-Sydney-NSW/contract-temp?daterange=7&worktype=245%2C244",
@@ -44,6 +67,14 @@ CITY_URLS = [
     "https://www.seek.com.au/data-jobs/in-All-Melbourne-VIC/contract-temp?daterange=7&worktype=245%2C244"
 ]
 
+# Selectors that signal a search results page has rendered (results or the empty state)
+LISTING_READY_SELECTORS = [
+    "[id^='job-title-']",
+    "[data-automation='jobTitle']",
+    "[data-automation='searchZeroResults']",
+    "[data-automation='searchResultsHeader']"
+]
+
 
 # Load environment variables
 load_dotenv()
@@ -51,10 +82,19 @@ load_dotenv()
 # LLM API setup
 pb = Pushbullet(os.getenv("PUSHBULLET_API_KEY")) if os.getenv("PUSHBULLET_API_KEY") else None
 
+# Shared by every scoring thread so the budgets hold across concurrent requests
+RATE_LIMITER = RateLimiter(
+    tokens_per_minute=TOKENS_PER_MINUTE,
+    tokens_per_hour=TOKENS_PER_HOUR,
+    requests_per_minute=REQUESTS_PER_MINUTE,
+    requests_per_hour=REQUESTS_PER_HOUR
+)
+SCORING_POOL = ScoringPool(max_workers=SCORING_WORKERS)
+
 # Initialize Gemini client
 if os.getenv("GEMINI_API_KEY"):
     genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    gemini_model = genai.GenerativeModel('gemini-2.5-pro-exp-03-25') # Use the specified experimental model
+    gemini_model = genai.GenerativeModel(GEMINI_MODEL_ID) # Use the specified experimental model
     print("✅ Gemini client initialized")
 else:
     gemini_model = None
@@ -64,7 +104,7 @@ def sign_in(driver):
     print("Signing in...")
     try:
         # Wait for the page to load completely
-        time.sleep(10)
+        wait_for_dom_ready(driver)
         
         print(f"Current URL: {driver.current_url}")
         
@@ -96,7 +136,7 @@ def sign_in(driver):
         
         print("Clicking sign-in link...")
         driver.execute_script("arguments[0].click();", sign_in_link)
-        time.sleep(5)
+        wait_for_dom_ready(driver)
         
         print(f"Current URL after clicking sign-in: {driver.current_url}")
 
@@ -122,7 +162,12 @@ def sign_in(driver):
             EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-cy="login"]'))
         )
         sign_in_button.click()
-        time.sleep(10)  # Wait for login to complete
+        # Wait for login to complete: the login form navigates away on success
+        try:
+            WebDriverWait(driver, 20).until(lambda d: not d.find_elements(By.CSS_SELECTOR, 'button[data-cy="login"]'))
+        except TimeoutException:
+            print("⚠️ Login form still present after 20s")
+        wait_for_dom_ready(driver)
 
         print("Successfully signed in")
     except TimeoutException as e:
@@ -142,27 +187,21 @@ def sign_in(driver):
         print(f"Current URL: {driver.current_url}")
         raise
 
-def save_checkpoint(jobs, page_number, city_url):
-    checkpoint_data = {
-        "jobs": jobs,
-        "page_number": page_number,
-        "city_url": city_url
-    }
-    with open(CHECKPOINT_FILE, "w") as f:
-        json.dump(checkpoint_data, f)
-
-def load_checkpoint():
-    try:
-        with open(CHECKPOINT_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return None
-
 def save_analyzed_jobs(jobs):
-    with open(SCRAPED_JOBS_FILE, 'w') as f:
-        json.dump(jobs, f)
+    """Upsert matched jobs into the shared job store (one row per job)"""
+    store = get_job_store()
+    for job in jobs:
+        store.upsert_job(JOB_SOURCE, job, status='matched')
+
+def record_analyzed_job(job, parsed_result, status, journal=None):
+    """Persist a single analyzed job and its analysis as soon as it is scored"""
+    if not get_job_store().record_analyzed_job(JOB_SOURCE, job, parsed_result, status):
+        return
+    if journal:
+        journal.record_job(job['job_id'], status, analysis=parsed_result)
 
 def extract_job_ids_from_page(driver):
+    """Regex fallback for pages without embedded listing state (serializes the whole DOM)"""
     page_source = driver.page_source
     job_id_pattern = r'job-title-(\d+)'
     job_ids = re.findall(job_id_pattern, page_source)
@@ -178,23 +217,34 @@ def estimate_tokens(text):
     return len(text) // 3
 
 def is_quick_apply_job(driver):
+    """True if the loaded job page's apply button reads "Quick apply".
+    
+    Called once the job details are on the page, so the button (server-rendered with
+    them) is looked up directly; a job without one no longer costs a full wait.
+    """
     try:
-        # Wait for the apply button to be present
-        apply_button = WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, '[data-automation="job-detail-apply"]'))
-        )
-        
+        apply_buttons = driver.find_elements(By.CSS_SELECTOR, '[data-automation="job-detail-apply"]')
         # Check if the button text is "Quick apply"
-        return apply_button.text.strip().lower() == "quick apply"
+        return bool(apply_buttons) and apply_buttons[0].text.strip().lower() == "quick apply"
     except:
         return False
 
-def analyze_job_relevance(job, cv_content):
+class FailedAnalysis(str):
+    """Zero-score analysis text for a job Gemini could not score; never cached or stored"""
+
+def analyze_job_relevance(job, cv_content, limiter=None):
     print("\n🧠 Analyzing job relevance using Gemini...")
+    llm_cache = get_llm_cache()
+    cache_key = make_cache_key(GEMINI_MODEL_ID, RELEVANCE_PROMPT_VERSION, cv_content, job)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        print("💾 Using cached analysis for unchanged job/CV (no LLM call)")
+        return cached
+    
     if not gemini_model:
         print("❌ Gemini client not initialized. Skipping analysis.")
         # Return a default structure that parse_analysis can handle
-        return "Relevance Score: 0\nInterest Score: 0\nKey Match Reason: Skipped analysis - Gemini API key missing.\nCover Letter: Skipped analysis - Gemini API key missing."
+        return FailedAnalysis("Relevance Score: 0\nInterest Score: 0\nKey Match Reason: Skipped analysis - Gemini API key missing.\nCover Letter: Skipped analysis - Gemini API key missing.")
 
     try:
         # Refined prompt with Interest Score and Key Match Reason
@@ -223,28 +273,33 @@ def analyze_job_relevance(job, cv_content):
         """
 
         print("⚡ Sending request to Gemini API...")
-        response = gemini_model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.3
-            )
+        response = call_with_backoff(
+            lambda: gemini_model.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.3
+                )
+            ),
+            limiter=limiter,
+            tokens=estimate_tokens(prompt) + ANALYSIS_OUTPUT_TOKENS
         )
 
         # Ensure response.text is accessed correctly
         if response.parts:
             response_text = "".join(part.text for part in response.parts)
             print("✅ Gemini API call successful. Parsing response...")
+            llm_cache.set(cache_key, response_text)
             return response_text
         else:
             print("⚠️ Gemini API response was empty or blocked.")
             print(f"Prompt Feedback: {response.prompt_feedback}")
             # Return a default structure that parse_analysis can handle
-            return "Relevance Score: 0\nInterest Score: 0\nKey Match Reason: Error: No response from API or content blocked.\nCover Letter: Error: No response from API or content blocked."
+            return FailedAnalysis("Relevance Score: 0\nInterest Score: 0\nKey Match Reason: Error: No response from API or content blocked.\nCover Letter: Error: No response from API or content blocked.")
 
     except Exception as e:
         print(f"❌ Error during Gemini API call: {e}")
         # Return a default structure that parse_analysis can handle
-        return f"Relevance Score: 0\nInterest Score: 0\nKey Match Reason: Error during analysis: {e}\nCover Letter: Error during analysis: {e}"
+        return FailedAnalysis(f"Relevance Score: 0\nInterest Score: 0\nKey Match Reason: Error during analysis: {e}\nCover Letter: Error during analysis: {e}")
 
 def parse_analysis(response):
     lines = response.strip().split('\n')
@@ -302,62 +357,261 @@ def parse_analysis(response):
     print(f"Parsed Analysis: Relevance={result['relevance_score']}, Interest={result['interest_score']}") # Debug print
     return result
 
-def is_date_within_six_months(date_str):
-    today = datetime.date.today()
-    six_months_from_now = today + relativedelta(months=6)
+def finalize_scored_job(job_record, analysis_result, is_casual, quick_apply, journal=None):
+    """Apply the score thresholds to a scored job, notify and persist it; returns the page job or None"""
+    if isinstance(analysis_result, FailedAnalysis):
+        # Left out of the store and the journal so the next run scores it again
+        print(f"⚠️ Not recording job {job_record['title']}: analysis failed, it will be scored again next run")
+        return None
+    parsed_result = parse_analysis(analysis_result)
+    
+    job_id = job_record['job_id']
+    job_title = job_record['title']
+    job_url = job_record['link']
+    relevance_score = parsed_result['relevance_score']
+    interest_score = parsed_result['interest_score']
+    key_match_reason = parsed_result['key_match_reason']
+    cover_letter = parsed_result['cover_letter']
     
-    # List of month names
-    months = ['january', 'february', 'march', 'april', 'may', 'june', 
-              'july', 'august', 'september', 'october', 'november', 'december']
+    # Adjusted filtering logic: Require high relevance OR high interest
+    # Example: Relevance >= 7 OR (Relevance >= 5 AND Interest >= 8)
+    if not (relevance_score >= 7 or (relevance_score >= 5 and interest_score >= 8)):
+        print(f"Skipping job {job_title} (Relevance: {relevance_score}, Interest: {interest_score}) - doesn't meet threshold.")
+        record_analyzed_job(job_record, parsed_result, 'analyzed', journal)
+        return None
+
+    # Apply Quick Apply filter only for non-Casual positions and non-perfect matches
+    if not is_casual and relevance_score < 9 and interest_score < 9 and not quick_apply:
+        print(f"Skipping job {job_id} as it's not a Quick Apply job and scores aren't high enough")
+        record_analyzed_job(job_record, parsed_result, 'analyzed', journal)
+        return None
+
+    # Push Notification
+    notification_title = f"⭐ Job Match: {job_title} (R:{relevance_score}/I:{interest_score})"
+    notification_body = (
+        f"Reason: {key_match_reason}\n"
+        f"Link: {job_url}\n\n"
+        f"Cover Snippet:\n{cover_letter}"
+    )
+    if pb:
+        pb.push_note(notification_title, notification_body)
+    else:
+         print("Pushbullet not configured, skipping notification.")
     
-    # Convert date string to lowercase for case-insensitive matching
-    date_str = date_str.lower()
+    page_job = {
+        'link': job_url,
+        'description': job_record['description'],
+        'title': job_title,
+        'job_id': job_id,
+        'relevance_score': relevance_score,
+        'interest_score': interest_score,
+        'key_match_reason': key_match_reason,
+        'cover_letter': cover_letter
+    }
+    record_analyzed_job(page_job, parsed_result, 'matched', journal)
+    print(f"✅ Successfully processed job: {job_title} (R:{relevance_score}, I:{interest_score})")
+    return page_job
+
+def submit_prefiltered(prefilter, candidates, pending_scores, cv_content, journal=None):
+    """Run buffered (job_record, is_casual, quick_apply) candidates through the prefilter as one batch
+    and queue the survivors for LLM scoring"""
+    if not candidates:
+        return
+    if prefilter:
+        kept, pruned = prefilter.filter_batch(candidates, job_of=lambda candidate: candidate[0])
+    else:
+        kept, pruned = list(candidates), []
+    store = get_job_store()
+    for job_record, _, _ in pruned:
+        store.upsert_job(JOB_SOURCE, job_record, status='prefiltered')
+        if journal:
+            journal.record_job(job_record['job_id'], 'prefiltered')
+    for job_record, is_casual, quick_apply in kept:
+        future = SCORING_POOL.submit(analyze_job_relevance, job_record, cv_content, RATE_LIMITER)
+        pending_scores.append((job_record, is_casual, quick_apply, future))
+    candidates.clear()
+
+def read_job_detail_from_browser(driver, job_url):
+    """Selenium fallback for fetch_job_detail: navigate to the job page and read the same fields"""
+    driver.get(job_url)
+    WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-automation="jobAdDetails"]')))       
+    wait_for_dom_ready(driver)
     
-    # Extract day and month from the date string
-    day = int(re.search(r'\d+', date_str).group())
-    month = next((i+1 for i, m in enumerate(months) if m in date_str), None)
+    # The applied marker is server-rendered with the page, so once the DOM is
+    # ready a direct lookup is enough (no 5s wait on every job that lacks it)
+    applied_elements = driver.find_elements(By.XPATH, """
+        //div[@id='applied-date-message']//span[contains(@class, '_1j97a3y4y') and contains(@class, '_1j97a3yr') and contains(text(), 'You applied on')]
+        |
+        //svg[
+            contains(@class, 'w75d4w1y') and
+            ./path[1][contains(@d, 'M12 1C5.9 1 1 5.9 1 12s4.9 11 11 11 11-4.9 11-11S18.1 1 12 1zm0 20c-5 0-9-4-9-9s4-9 9-9 9 4 9 9-4 9-9 9z')] and
+            ./path[2][contains(@d, 'M15.3 9.3 11 13.6l-1.3-1.3c-.4-.4-1-.4-1.4 0s-.4 1 0 1.4l2 2c.2.2.5.3.7.3s.5-.1.7-.3l5-5c.4-.4.4-1 0-1.4s-1-.4-1.4 0z')]
+        ]
+    """)
     
-    if month is None:
-        return False
+    return {
+        'title': driver.find_element(By.CSS_SELECTOR, '[data-automation="job-detail-title"]').text,
+        'description': driver.find_element(By.CSS_SELECTOR, '[data-automation="jobAdDetails"]').text,
+        'work_type': None,
+        'applied': bool(applied_elements),
+        'is_casual': None,  # Read lazily from the page, only for jobs that pass the filters
+        'quick_apply': None
+    }
+
+def scrape_listing_page(driver, city_url, page_number, cv_content="", prefilter=None, store=None,
+                        on_listing=None, should_stop=None, http_session=None, job_filter=None, journal=None):
+    """Scrape one search results page and score its new jobs.
+
+    Returns (job_ids, page_jobs); job_ids is None when Seek reports no more results.
+    on_listing(job_ids) is called as soon as the listing is read, before any detail page
+    is opened, and should_stop() is checked between jobs. With an http_session, the
+    listing and job details are fetched over HTTP and the browser is only used as a fallback.
+    job_filter rejects what it can from the listing record before a detail page is opened.
+    Every job this page settles is recorded in journal, and jobs it already holds are skipped.
+    """
+    store = store or get_job_store()
+    job_filter = job_filter or JobFilter()
+    expected_url = f"{city_url}&page={page_number}"
+    # The server-rendered listing over HTTP first; the browser loads the page only when that
+    # fails or finds no jobs (so "no more results" is still read from the page)
+    listing = fetch_listing(http_session, expected_url) if http_session else None
+    if listing:
+        job_ids = [record['job_id'] for record in listing]
+    else:
+        if driver.current_url != expected_url:
+            print(f"Navigating to page: {expected_url}")
+            driver.get(expected_url)
+            wait_for_page(driver, LISTING_READY_SELECTORS, timeout=PAGE_LOAD_TIMEOUT)
+
+        no_results = driver.find_elements(By.XPATH, "//h3[contains(text(), 'No matching search results')]")
+        if no_results:
+            return None, []
+
+        # Structured records from the embedded page state; ids only via page_source as a fallback
+        listing = read_listing(driver)
+        if listing is None:
+            job_ids = extract_job_ids_from_page(driver)
+        else:
+            job_ids = [record['job_id'] for record in listing]
+    listing_by_id = {record['job_id']: record for record in listing or []}
+    # Hard filters over the whole page of listing records in one pass
+    listing_rejects = job_filter.check_listings(listing or [])
+    print(f"Found {len(job_ids)} job IDs on this page")
+    if on_listing:
+        on_listing(job_ids)
+    if not job_ids:
+        return job_ids, []
+
+    page_jobs = []
+    pending_scores = []
+    candidates = []
+    for job_id in job_ids:
+        if should_stop and should_stop():
+            print("Stop requested, leaving the rest of this page for a later run")
+            break
+        job_url = f"https://www.seek.com.au/job/{job_id}"
+        if journal and journal.is_done(job_id):
+            print(f"Skipping job {job_id}: finished before the restart")
+            continue
+        if store.has_job(job_id, JOB_SOURCE):
+            print(f"Skipping job {job_id}: already analyzed in a previous run")
+            continue
+        rule = listing_rejects.get(job_id)
+        if rule:
+            print(f"Skipping job {job_id} from its listing due to {rule.message} (no detail page opened)")
+            if journal:
+                journal.record_job(job_id, 'filtered')
+            continue
+        print(f"Processing job ID: {job_id}")
+        
+        # Server-rendered page over HTTP first; the browser only for pages that need JS
+        detail = fetch_job_detail(http_session, job_id) if http_session else None
+        if detail is None:
+            detail = read_job_detail_from_browser(driver, job_url)
+        jitter(1.0, 3.0)
+
+        if detail['applied']:
+            print(f"Skipping job {job_id} as it was previously applied to")
+            if journal:
+                journal.record_job(job_id, 'applied')
+            continue  # Skip to the next job in the loop
+
+        job_description = detail['description']
+        job_title = detail['title']
+
+        rule = job_filter.check_detail(job_title, job_description)
+        if rule:
+            print(f"Skipping job {job_id} due to {rule.message}: {job_title}")
+            if journal:
+                journal.record_job(job_id, 'filtered')
+            continue
+
+        # Capture the page signals now, while the job page is loaded (scoring runs off the
+        # browser thread); both are direct lookups, with no waiting
+        if detail['is_casual'] is None:
+            is_casual = "Casual/Vacation" in driver.page_source
+            quick_apply = False if is_casual else is_quick_apply_job(driver)
+        else:
+            is_casual = detail['is_casual']
+            quick_apply = False if is_casual else detail['quick_apply']
+        job_record = {'link': job_url, 'title': job_title, 'job_id': job_id, 'description': job_description}
+        listing_record = listing_by_id.get(job_id, {})
+        for key in ('advertiser', 'location', 'listing_date', 'salary'):
+            if listing_record.get(key):
+                job_record[key] = listing_record[key]
+        work_type = detail.get('work_type') or listing_record.get('work_type')
+        if work_type:
+            job_record['work_type'] = work_type
+        
+        # Prefilter in small batches, queue survivors for scoring and move straight on
+        candidates.append((job_record, is_casual, quick_apply))
+        if len(candidates) >= PREFILTER_BATCH_SIZE:
+            submit_prefiltered(prefilter, candidates, pending_scores, cv_content, journal)
     
-    # Assume the year is the next occurrence of this date
-    year = today.year if (month > today.month or (month == today.month and day >= today.day)) else today.year + 1
+    submit_prefiltered(prefilter, candidates, pending_scores, cv_content, journal)
     
-    date = datetime.date(year, month, day)
-    return date <= six_months_from_now
+    # Collect this page's scores before checkpointing it; each one is journaled as it is finalized
+    for job_record, is_casual, quick_apply, future in pending_scores:
+        page_job = finalize_scored_job(job_record, future.result(), is_casual, quick_apply, journal)
+        if page_job:
+            page_jobs.append(page_job)
+    
+    return job_ids, page_jobs
+
+def get_job_listings(driver, cv_content="", city_url="", prefilter=None, job_filter=None, journal=None):
+    """Scrape every results page of city_url; returns the jobs matched in this run.
 
-def get_job_listings(driver, resume_from_checkpoint=False, cv_content="", city_url=""):
+    With a journal, scraping starts after the last page it records for the city.
+    """
     jobs = []
     page_number = 1
     consecutive_empty_pages = 0
     max_empty_pages = 3  # Stop after 3 consecutive empty pages
+    store = get_job_store()
+    http_session = create_http_session(driver) if SEEK_HTTP_DETAILS else None
 
-    if resume_from_checkpoint:
-        checkpoint = load_checkpoint()
-        if checkpoint:
-            jobs = checkpoint["jobs"]
-            page_number = checkpoint["page_number"]
-            city_url = checkpoint["city_url"]
-            print(f"Resuming from checkpoint at page {page_number} for {city_url}")
+    if journal:
+        if journal.is_exhausted(city_url):
+            print(f"All pages of {city_url} were finished before the restart")
+            return jobs
+        page_number = journal.next_page(city_url)
+        if page_number > 1:
+            print(f"Resuming {city_url} at page {page_number}")
 
     while True:
         print(f"Scraping page {page_number} for {city_url}")
         for attempt in range(MAX_RETRIES):
             try:
-                expected_url = f"{city_url}&page={page_number}"
-                if driver.current_url != expected_url:
-                    print(f"Navigating to page: {expected_url}")
-                    driver.get(expected_url)
-                    time.sleep(10)
-
-                no_results = driver.find_elements(By.XPATH, "//h3[contains(text(), 'No matching search results')]")
-                if no_results:
+                job_ids, page_jobs = scrape_listing_page(
+                    driver, city_url, page_number, cv_content, prefilter, store,
+                    http_session=http_session, job_filter=job_filter, journal=journal
+                )
+                if job_ids is None:
                     print("No more results found. Stopping scraping.")
+                    if journal:
+                        journal.record_exhausted(city_url)
                     return jobs
 
-                job_ids = extract_job_ids_from_page(driver)
-                print(f"Found {len(job_ids)} job IDs on this page")
-
                 if not job_ids:
                     consecutive_empty_pages += 1
                     if consecutive_empty_pages >= max_empty_pages:
@@ -368,109 +622,9 @@ def get_job_listings(driver, resume_from_checkpoint=False, cv_content="", city_u
                 else:
                     consecutive_empty_pages = 0
 
-                page_jobs = []
-                for job_id in job_ids:
-                    job_url = f"https://www.seek.com.au/job/{job_id}"
-                    print(f"Processing job ID: {job_id}")
-                    
-                    driver.get(job_url)
-                    WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-automation="jobAdDetails"]')))       
-                    
-                    # Skip if already applied
-                    try:
-                        # Wait for either the green tick SVG or the "You applied on" text
-                        applied_element = WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, """
-                                //div[@id='applied-date-message']//span[contains(@class, '_1j97a3y4y') and contains(@class, '_1j97a3yr') and contains(text(), 'You applied on')]
-                                |
-                                //svg[
-                                    contains(@class, 'w75d4w1y') and
-                                    ./path[1][contains(@d, 'M12 1C5.9 1 1 5.9 1 12s4.9 11 11 11 11-4.9 11-11S18.1 1 12 1zm0 20c-5 0-9-4-9-9s4-9 9-9 9 4 9 9-4 9-9 9z')] and
-                                    ./path[2][contains(@d, 'M15.3 9.3 11 13.6l-1.3-1.3c-.4-.4-1-.4-1.4 0s-.4 1 0 1.4l2 2c.2.2.5.3.7.3s.5-.1.7-.3l5-5c.4-.4.4-1 0-1.4s-1-.4-1.4 0z')]
-                                ]
-                            """))
-                        )
-                        print(f"Skipping job {job_id} as it was previously applied to")
-                        continue  # Skip to the next job in the loop
-                    except TimeoutException:
-                        # Neither element found, proceed with job processing
-                        pass
-                    
-                    job_description = driver.find_element(By.CSS_SELECTOR, '[data-automation="jobAdDetails"]').text
-                    job_title = driver.find_element(By.CSS_SELECTOR, '[data-automation="job-detail-title"]').text
-
-                    # Check for "AUSTRALIAN CITIZEN" in any case combination
-                    if re.search(r'australian\s+citizen', job_description, re.IGNORECASE):
-                        print(f"Skipping job {job_id} due to Australian citizenship requirement")
-                        continue
-
-                    # Check for dates more than 6 months in the future
-                    date_pattern = r'\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
-                    dates = re.findall(date_pattern, job_description, re.IGNORECASE)
-                    if any(not is_date_within_six_months(date) for date in dates):
-                        print(f"Skipping job {job_id} due to contract length exceeding 6 months")
-                        continue
-
-                    # Check for phrases to skip in both title and description
-                    skip_phrases = [
-                        "9 month ", "9-month", "9month", "9 Month",
-                        "12 month", "12-month", "12month", "12 Month",
-                        "24 month", "24-month", "24month", "24 Month"
-                    ]
-                    if any(phrase in job_description or phrase in job_title for phrase in skip_phrases):
-                        print(f"Skipping job due to matching phrase: {job_title}")
-                        continue
-                    
-                    
-                    # Analyze job relevance and get cover letter
-                    analysis_result = analyze_job_relevance({'title': job_title, 'description': job_description, 'link': job_url}, cv_content)
-                    parsed_result = parse_analysis(analysis_result)
-                    
-                    relevance_score = parsed_result['relevance_score']
-                    interest_score = parsed_result['interest_score']
-                    key_match_reason = parsed_result['key_match_reason']
-                    cover_letter = parsed_result['cover_letter']
-                    
-                    # Adjusted filtering logic: Require high relevance OR high interest
-                    # Example: Relevance >= 7 OR (Relevance >= 5 AND Interest >= 8)
-                    if not (relevance_score >= 7 or (relevance_score >= 5 and interest_score >= 8)):
-                        print(f"Skipping job {job_title} (Relevance: {relevance_score}, Interest: {interest_score}) - doesn't meet threshold.")
-                        continue
-
-                    # Check if it's a Casual/Vacation position
-                    is_casual = "Casual/Vacation" in driver.page_source
-                    
-                    # Apply Quick Apply filter only for non-Casual positions and non-perfect matches
-                    if not is_casual and relevance_score < 9 and interest_score < 9 and not is_quick_apply_job(driver):
-                        print(f"Skipping job {job_id} as it's not a Quick Apply job and scores aren't high enough")
-                        continue
-
-                    # Push Notification
-                    notification_title = f"⭐ Job Match: {job_title} (R:{relevance_score}/I:{interest_score})"
-                    notification_body = (
-                        f"Reason: {key_match_reason}\n"
-                        f"Link: {job_url}\n\n"
-                        f"Cover Snippet:\n{cover_letter}"
-                    )
-                    if pb:
-                        pb.push_note(notification_title, notification_body)
-                    else:
-                         print("Pushbullet not configured, skipping notification.")
-                    
-                    page_jobs.append({
-                        'link': job_url,
-                        'description': job_description,
-                        'title': job_title,
-                        'job_id': job_id,
-                        'relevance_score': relevance_score,
-                        'interest_score': interest_score,
-                        'key_match_reason': key_match_reason,
-                        'cover_letter': cover_letter
-                    })
-                    print(f"✅ Successfully processed job: {job_title} (R:{relevance_score}, I:{interest_score})")
-                
                 jobs.extend(page_jobs)
-                save_checkpoint(jobs, page_number, city_url)
+                if journal:
+                    journal.record_page(city_url, page_number)
                 page_number += 1
                 break
             except Exception as e:
@@ -483,42 +637,243 @@ def get_job_listings(driver, resume_from_checkpoint=False, cv_content="", city_u
 
     return jobs
 
-def main(resume_from_checkpoint=False, cv_file_path=CV_FILE_PATH):
+def create_seek_driver(profile_name="seek-scraper"):
+    """Headless lean Chrome for Seek; returns (driver, bandwidth report)"""
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
+    apply_profile(chrome_options, profile_name)
+    return create_lean_driver(
+        lambda opts: webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts),
+        chrome_options, 'scrape'
+    )
+
+def load_worker_checkpoints(worker_count):
+    """Union of the jobs, pages and exhausted cities finished by every worker's journal"""
+    return merge_states(load_state(WORKER_CHECKPOINT_PATTERN.format(worker_id)) for worker_id in range(worker_count))
+
+def clear_worker_checkpoints(worker_count):
+    for worker_id in range(worker_count):
+        remove_journal(WORKER_CHECKPOINT_PATTERN.format(worker_id))
+
+def seek_worker(worker_id, worker_count, work_queue, outstanding, result_queue, stop_event, cv_content, finished):
+    """Worker process: own headless browser, pulls (city_url, page, empty_streak) units from work_queue.
+
+    The next page of a city is queued as soon as a listing is read, so idle workers can
+    pick it up while this one is still opening detail pages. Scored jobs go straight to
+    the shared job store; finished jobs and units go to a per-worker journal. finished is
+    the merged state of every worker's journal from earlier runs.
+    """
+    global RATE_LIMITER
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent coordinates shutdown
+    # Each process gets an equal share of the LLM budgets so the pool as a whole stays within them
+    RATE_LIMITER = RateLimiter(
+        tokens_per_minute=TOKENS_PER_MINUTE / worker_count,
+        tokens_per_hour=TOKENS_PER_HOUR / worker_count,
+        requests_per_minute=REQUESTS_PER_MINUTE / worker_count,
+        requests_per_hour=REQUESTS_PER_HOUR / worker_count
+    )
+    journal = CheckpointJournal(WORKER_CHECKPOINT_PATTERN.format(worker_id))
+    journal.merge(finished)
+
+    def enqueue(unit):
+        with outstanding.get_lock():
+            outstanding.value += 1
+        work_queue.put(unit)
+
+    driver = None
+    try:
+        driver, _ = create_seek_driver(f"seek-worker-{worker_id}")
+        ensure_signed_in(driver, SEEK_SESSION, sign_in)
+        store = get_job_store()
+        prefilter = RelevancePrefilter(cv_content)
+        http_session = create_http_session(driver) if SEEK_HTTP_DETAILS else None
+        job_filter = JobFilter()
+
+        while not stop_event.is_set():
+            try:
+                unit = work_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            if unit is None:
+                break
+            city_url, page_number, empty_streak = unit
+            try:
+                if journal.is_page_done(city_url, page_number):
+                    enqueue((city_url, page_number + 1, 0))  # Finished in an earlier run
+                    continue
+
+                next_queued = []
+                def queue_next_page(job_ids):
+                    if job_ids and not next_queued:
+                        enqueue((city_url, page_number + 1, 0))
+                        next_queued.append(True)
+
+                print(f"[worker {worker_id}] Scraping page {page_number} for {city_url}")
+                failed = False
+                for attempt in range(MAX_RETRIES):
+                    try:
+                        job_ids, page_jobs = scrape_listing_page(
+                            driver, city_url, page_number, cv_content, prefilter, store,
+                            on_listing=queue_next_page, should_stop=stop_event.is_set,
+                            http_session=http_session, job_filter=job_filter, journal=journal
+                        )
+                        break
+                    except Exception as e:
+                        print(f"[worker {worker_id}] Error on page {page_number}, attempt {attempt + 1}: {e}")
+                        if attempt == MAX_RETRIES - 1:
+                            job_ids, page_jobs = [], []
+                            failed = True
+                        else:
+                            time.sleep(RETRY_DELAY)
+
+                if stop_event.is_set():
+                    break  # Page left unfinished; it is not checkpointed
+                if failed:
+                    # Not an empty page, so the streak is left alone. The page is not checkpointed,
+                    # so --resume retries it; if its listing was never read the city stops here,
+                    # since there is no telling whether a next page exists
+                    print(f"[worker {worker_id}] Giving up on page {page_number} for {city_url}")
+                elif job_ids is None:
+                    print(f"[worker {worker_id}] No more results for {city_url}")
+                    journal.record_exhausted(city_url)
+                elif not job_ids and not next_queued:
+                    if empty_streak + 1 < 3:
+                        enqueue((city_url, page_number + 1, empty_streak + 1))
+                else:
+                    queue_next_page(job_ids)
+                    save_analyzed_jobs(page_jobs)
+                    journal.record_page(city_url, page_number)
+                    result_queue.put((worker_id, city_url, page_number, len(page_jobs)))
+            finally:
+                with outstanding.get_lock():
+                    outstanding.value -= 1
+        print(f"[worker {worker_id}] {prefilter.report()}")
+        print(f"[worker {worker_id}] {job_filter.report()}")
+    except Exception as e:
+        print(f"[worker {worker_id}] stopped with error: {e}")
+    finally:
+        SCORING_POOL.shutdown(wait=True)
+        journal.close()
+        if driver:
+            driver.quit()
+
+def run_worker_pool(cv_content, worker_count=SEEK_WORKERS, resume_from_checkpoint=False):
+    """Spread CITY_URLS pages over worker_count browser processes; returns the number of jobs found.
+
+    Ctrl+C asks workers to stop after their current job and keeps their checkpoints,
+    so a later run with resume_from_checkpoint=True skips the pages and jobs already done.
+    """
+    ctx = multiprocessing.get_context("spawn")  # Fresh interpreter per worker: no shared SQLite handles
+    work_queue = ctx.Queue()
+    result_queue = ctx.Queue()
+    stop_event = ctx.Event()
+    outstanding = ctx.Value('i', 0)
+
+    if resume_from_checkpoint:
+        finished = load_worker_checkpoints(worker_count)
+        print(f"Resuming worker pool: {len(finished['jobs'])} jobs and "
+              f"{sum(len(pages) for pages in finished['pages'].values())} pages done, "
+              f"{len(finished['exhausted'])} cities exhausted")
+    else:
+        clear_worker_checkpoints(worker_count)
+        finished = merge_states([])
+
+    for city_url in CITY_URLS:
+        if city_url not in finished['exhausted']:
+            outstanding.value += 1
+            work_queue.put((city_url, 1, 0))
+
+    workers = [
+        ctx.Process(
+            target=seek_worker, name=f"seek-worker-{worker_id}",
+            args=(worker_id, worker_count, work_queue, outstanding, result_queue, stop_event, cv_content, finished)
+        )
+        for worker_id in range(worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"Started {worker_count} Seek workers for {len(CITY_URLS)} cities")
+
+    jobs_found = 0
     try:
-        driver.get("https://www.seek.com.au/")
-        print(f"Initial page title: {driver.title}")
-        print(f"Initial URL: {driver.current_url}")
-        time.sleep(10)  # Increased wait time
+        while outstanding.value > 0 and any(worker.is_alive() for worker in workers):
+            try:
+                worker_id, city_url, page_number, found = result_queue.get(timeout=1)
+                jobs_found += found
+                print(f"[worker {worker_id}] page {page_number} of {city_url}: {found} jobs")
+            except queue.Empty:
+                pass
+    except KeyboardInterrupt:
+        print("Stopping workers after their current job (Ctrl+C again to force)...")
+        stop_event.set()
+    finally:
+        for _ in workers:
+            work_queue.put(None)
+        for worker in workers:
+            worker.join(WORKER_SHUTDOWN_TIMEOUT)
+            if worker.is_alive():
+                print(f"{worker.name} did not stop in {WORKER_SHUTDOWN_TIMEOUT}s, terminating")
+                worker.terminate()
+        while True:
+            try:
+                jobs_found += result_queue.get_nowait()[3]
+            except queue.Empty:
+                break
+    return jobs_found
 
-        sign_in(driver)  # Sign in before starting the scrape
+def main(resume_from_checkpoint=False, cv_file_path=CV_FILE_PATH, workers=SEEK_WORKERS):
+    if workers > 1:
+        cv_content = load_cv_text(cv_file_path)
+        jobs_found = run_worker_pool(cv_content, workers, resume_from_checkpoint)
+        print(f"Total jobs found across all cities: {jobs_found}")
+        SCORING_POOL.shutdown(wait=False)
+        return
+
+    driver, bandwidth = create_seek_driver()
+    journal = None
+    
+    try:
+        # Probes the saved session on the home page; sign_in runs from there only if it is invalid
+        ensure_signed_in(driver, SEEK_SESSION, sign_in)
 
         # Load CV content
         cv_content = load_cv_text(cv_file_path)
         
         all_job_listings = []
+        journal = CheckpointJournal(CHECKPOINT_JOURNAL, resume=resume_from_checkpoint)
+        if resume_from_checkpoint:
+            print(f"Resuming: {journal.count()} jobs finished before the restart, {journal.count('matched')} matched")
+        prefilter = RelevancePrefilter(cv_content)
+        log_prefilter_precision(prefilter, get_job_store(), JOB_SOURCE)
+        job_filter = JobFilter()
         
         for city_url in CITY_URLS:
             print(f"Starting scrape for {city_url}")
-            job_listings = get_job_listings(driver, resume_from_checkpoint=resume_from_checkpoint, cv_content=cv_content, city_url=city_url)
+            job_listings = get_job_listings(driver, cv_content=cv_content, city_url=city_url, prefilter=prefilter, job_filter=job_filter, journal=journal)
             all_job_listings.extend(job_listings)
-            save_analyzed_jobs(all_job_listings)  # Save after each city
+            save_analyzed_jobs(job_listings)  # Save after each city
             
         print(f"Total jobs found across all cities: {len(all_job_listings)}")
+        if resume_from_checkpoint:
+            print(f"Matched including earlier runs: {journal.count('matched')}")
+        print(f"💾 LLM cache: {get_llm_cache().stats()}")
+        print(prefilter.report())
+        print(job_filter.report())
+        print(bandwidth.report(driver))
 
 
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        SCORING_POOL.shutdown(wait=False)
+        if journal:
+            journal.close()
         driver.quit()
 
 if __name__ == "__main__":
-    main(resume_from_checkpoint=False, cv_file_path=CV_FILE_PATH)  # Resume if checkpoint exists
+    # --resume skips the jobs and pages recorded in the checkpoint journal by an earlier run
+    main(resume_from_checkpoint="--resume" in sys.argv[1:], cv_file_path=CV_FILE_PATH)
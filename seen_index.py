@@ -0,0 +1,122 @@
+"""
+Memory-mapped Bloom filter of seen job ids, kept next to the job store.
+
+Most "already processed?" checks are for jobs that were never seen, so a
+negative answer from the filter skips the SQLite lookup entirely; a positive
+answer is confirmed against the store, which stays the exact source of truth.
+Opening the index maps the file instead of reading records, so start-up time
+does not grow with the job history, and adds set slots in place.
+
+Each slot is a whole byte that is only ever written with 1, so several
+processes (scrapers, Seek workers, the application filler) can add to the same
+file at once without a read-modify-write race losing another process's add.
+The file is never replaced once published: a second process that builds one at
+the same time discards its copy and maps the first.
+"""
+import os
+import mmap
+import math
+import struct
+import hashlib
+
+# Lookups only; the index is kept up to date either way so it never misses ids
+SEEN_INDEX_ENABLED = os.getenv("SEEN_INDEX", "1").lower() not in ("0", "false", "no")
+# In keys; the job store adds two per job
+SEEN_INDEX_CAPACITY = int(os.getenv("SEEN_INDEX_CAPACITY", "200000"))
+SEEN_INDEX_FP_RATE = float(os.getenv("SEEN_INDEX_FP_RATE", "0.01"))
+
+MAGIC = b"SEENIDX1"
+# magic, slot count, hash count, capacity, approximate number of adds
+HEADER = struct.Struct("<8sQQQQ")
+ADDED_OFFSET = HEADER.size - 8
+
+def index_size(capacity, fp_rate):
+    """(slots, hashes) for a Bloom filter holding capacity keys at about fp_rate false positives"""
+    slots = max(64, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+    hashes = max(1, int(round(slots / capacity * math.log(2))))
+    return slots, hashes
+
+def _slots(key, slot_count, hash_count):
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1, h2 = struct.unpack("<QQ", digest)
+    h2 |= 1  # Odd step, so the probes do not collapse onto one slot
+    return [(h1 + i * h2) % slot_count for i in range(hash_count)]
+
+def _create(path, capacity, fp_rate):
+    slot_count, hash_count = index_size(capacity, fp_rate)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, slot_count, hash_count, capacity, 0))
+        f.truncate(HEADER.size + slot_count)  # Sparse zero-filled slots
+
+class SeenIndex:
+    """Persistent Bloom filter file; might_contain() never gives a false negative for added keys"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.slot_count, self.hash_count, self.capacity, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) != HEADER.size + self.slot_count:
+            self.close()
+            raise ValueError(f"{path} is not a seen-id index")
+
+    @property
+    def added(self):
+        return struct.unpack_from("<Q", self._map, ADDED_OFFSET)[0]
+
+    @property
+    def is_overfull(self):
+        """True once more keys were added than the index was sized for (false positives climb)"""
+        return self.added > self.capacity
+
+    def add(self, key):
+        for slot in _slots(key, self.slot_count, self.hash_count):
+            self._map[HEADER.size + slot] = 1
+        # Approximate under concurrent writers; only used to report an overfull index
+        struct.pack_into("<Q", self._map, ADDED_OFFSET, self.added + 1)
+
+    def might_contain(self, key):
+        # Probes inline so a never-seen key usually stops at the first empty slot
+        h1, h2 = struct.unpack("<QQ", hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest())
+        h2 |= 1
+        slots, offset, slot_count = self._map, HEADER.size, self.slot_count
+        for i in range(self.hash_count):
+            if not slots[offset + (h1 + i * h2) % slot_count]:
+                return False
+        return True
+
+    def close(self):
+        try:
+            self._map.close()
+        except (AttributeError, ValueError):
+            pass
+        self._file.close()
+
+def open_seen_index(path, existing_keys, existing_count, fp_rate=SEEN_INDEX_FP_RATE):
+    """Map the index at path, building it first from existing_keys() if it does not exist yet.
+
+    existing_count is the number of keys existing_keys() yields; a new index gets room for twice that.
+    """
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        _create(tmp_path, max(SEEN_INDEX_CAPACITY, 2 * existing_count), fp_rate)
+        building = SeenIndex(tmp_path)
+        try:
+            for key in existing_keys():
+                building.add(key)
+        finally:
+            building.close()
+        try:
+            os.link(tmp_path, path)  # Publishes only if no other process got there first
+        except FileExistsError:
+            pass
+        except OSError:
+            os.replace(tmp_path, path)  # No hard links on this filesystem
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    index = SeenIndex(path)
+    if index.is_overfull:
+        print(f"⚠️ {os.path.basename(path)} holds more ids than it was sized for; lookups still work but hit "
+              f"SQLite more often. Delete it while no scraper is running to rebuild it larger.")
+    return index
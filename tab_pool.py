@@ -0,0 +1,127 @@
+"""
+Multi-tab detail fetching inside one logged-in browser session.
+
+TabPool opens K extra tabs next to the listing tab, starts navigations with a
+non-blocking `location.href = ...` assignment and harvests whichever tab has
+finished loading first, so K detail pages load in parallel while sharing the
+single login. Navigations are paced by a RateLimiter so K tabs never mean K
+times the request rate LinkedIn sees.
+"""
+import os
+import time
+from collections import deque
+from llm_scoring import RateLimiter
+
+# Serial (one navigation at a time) unless a larger pool is asked for, e.g. TAB_POOL_SIZE=3
+TAB_POOL_SIZE = int(os.getenv("TAB_POOL_SIZE", "1"))
+TAB_POOL_MAX_TABS = 4  # Politeness cap, whatever TAB_POOL_SIZE says
+TAB_NAVIGATIONS_PER_MINUTE = int(os.getenv("TAB_NAVIGATIONS_PER_MINUTE", "20"))
+TAB_LOAD_TIMEOUT = 20
+TAB_POLL_INTERVAL = 0.2
+
+# One round trip per tab poll: has the new document loaded and rendered the detail pane?
+# The tab's URL once its document is parsed and a ready selector has text, else null
+TAB_READY_JS = """
+const selectors = arguments[0];
+if (document.readyState === 'loading') return null;
+const loaded = selectors.some(sel => { const el = document.querySelector(sel); return el && el.textContent.trim().length > 0; });
+return loaded ? location.href : null;
+"""
+
+def url_has_marker(url, marker):
+    """True if marker occurs in url as a whole value: followed by the end of the URL or a
+    separator, so currentJobId=123 does not match currentJobId=1234"""
+    start = url.find(marker)
+    while start >= 0:
+        end = start + len(marker)
+        if end == len(url) or url[end] in "&#?/;":
+            return True
+        start = url.find(marker, start + 1)
+    return False
+
+class TabPool:
+    """K worker tabs in the driver's window set; the tab that created the pool stays the home tab"""
+
+    def __init__(self, driver, size=TAB_POOL_SIZE, limiter=None, on_new_tab=None):
+        self.driver = driver
+        self.size = max(1, min(size, TAB_POOL_MAX_TABS))
+        self.limiter = limiter or RateLimiter(requests_per_minute=TAB_NAVIGATIONS_PER_MINUTE)
+        self.home = driver.current_window_handle
+        self.tabs = []
+        self.fetched = 0
+        self.timeouts = 0
+        for _ in range(self.size):
+            driver.switch_to.new_window('tab')
+            if on_new_tab:
+                on_new_tab(driver)
+            self.tabs.append(driver.current_window_handle)
+        driver.switch_to.window(self.home)
+        print(f"🗂️ Tab pool ready with {self.size} tabs ({TAB_NAVIGATIONS_PER_MINUTE} navigations/min)")
+
+    def _start(self, handle, key, url):
+        self.limiter.acquire(0)
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script("location.href = arguments[0];", url)  # Returns without waiting for the load
+        return {'key': key, 'url': url, 'started': time.time()}
+
+    def fetch(self, jobs, extract, ready_selectors, ready_marker=str):
+        """Yield (key, extract(driver) or None) for every (key, url) in jobs, in completion order.
+
+        ready_marker(key) is what the loaded URL must contain as a whole value (defaults to the
+        key itself); see url_has_marker.
+        """
+        pending = deque(jobs)
+        busy = {}
+        try:
+            while pending or busy:
+                for handle in self.tabs:
+                    if handle not in busy and pending:
+                        busy[handle] = self._start(handle, *pending.popleft())
+
+                progressed = False
+                for handle, job in list(busy.items()):
+                    self.driver.switch_to.window(handle)
+                    loaded_url = self.driver.execute_script(TAB_READY_JS, ready_selectors)
+                    ready = bool(loaded_url) and url_has_marker(loaded_url, ready_marker(job['key']))
+                    timed_out = time.time() - job['started'] > TAB_LOAD_TIMEOUT
+                    if not ready and not timed_out:
+                        continue
+                    del busy[handle]
+                    progressed = True
+                    if timed_out and not ready:
+                        self.timeouts += 1
+                        print(f"⚠️ Tab load timed out for {job['key']}")
+                        yield job['key'], None
+                        continue
+                    try:
+                        data = extract(self.driver)
+                    except Exception as e:
+                        print(f"❌ Error extracting {job['key']} in tab: {str(e)}")
+                        data = None
+                    self.fetched += 1
+                    yield job['key'], data
+                if not progressed:
+                    time.sleep(TAB_POLL_INTERVAL)
+        finally:
+            self.driver.switch_to.window(self.home)
+
+    def run_in_tab(self, fn):
+        """Run fn() in a worker tab so navigations it makes leave the home tab where it was"""
+        self.driver.switch_to.window(self.tabs[0])
+        try:
+            return fn()
+        finally:
+            self.driver.switch_to.window(self.home)
+
+    def close(self):
+        for handle in self.tabs:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        self.tabs = []
+        self.driver.switch_to.window(self.home)
+
+    def report(self):
+        return f"🗂️ Tab pool: {self.fetched} details fetched over {self.size} tabs, {self.timeouts} timeouts"
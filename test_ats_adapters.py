@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for detecting the ATS from one probe and the per-platform adapters
+"""
+from ats_adapters import ADAPTERS, LOCATE_CONTROLS_JS, get_adapter
+from ats_fingerprint import ATS_DOM_MARKERS, ATS_PROBE_JS, GENERIC_ATS, ats_from_probe, detect_ats
+
+
+def probe(url="https://careers.acme.com/jobs/1/apply", markers=None, sources=()):
+    return {"url": url, "markers": markers or {}, "sources": list(sources)}
+
+
+class FakeDriver:
+    def __init__(self, result=None, error=None, current_url="https://careers.acme.com/apply"):
+        self.result = result
+        self.error = error
+        self.current_url = current_url
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_ats_from_probe_checks_url_then_dom_then_scripts():
+    assert ats_from_probe(probe(url="https://jobs.lever.co/acme/1")) == "lever"
+    assert ats_from_probe(probe(markers={"greenhouse": ["#grnhse_app"], "lever": []})) == "greenhouse"
+    embedded = probe(sources=["https://cdn.acme.com/app.js", "https://boards.greenhouse.io/embed/job_board/js?for=acme"])
+    assert ats_from_probe(embedded) == "greenhouse"
+    assert ats_from_probe(probe(sources=["https://cdn.acme.com/app.js"])) == GENERIC_ATS
+    assert ats_from_probe(None) == GENERIC_ATS
+
+
+def test_dom_markers_pick_the_platform_with_most_matches():
+    markers = {"lever": ["div.posting-page"], "workday": ["[data-automation-id='jobPostingPage']",
+                                                           "[data-automation-id='applyFlowPage']"]}
+    assert ats_from_probe(probe(markers=markers)) == "workday"
+
+
+def test_detect_ats_is_one_probe_and_falls_back_to_url():
+    driver = FakeDriver(result=probe(markers={"successfactors": ["#fbclc_fName"]}))
+    assert detect_ats(driver) == "successfactors"
+    assert driver.calls == [(ATS_PROBE_JS, (ATS_DOM_MARKERS,))]
+
+    broken = FakeDriver(error=RuntimeError("no such window"), current_url="https://acme.smartrecruiters.com/x")
+    assert detect_ats(broken) == "smartrecruiters"
+
+
+def test_every_detected_platform_has_an_adapter():
+    assert set(ADAPTERS) == set(ATS_DOM_MARKERS)
+    assert get_adapter(GENERIC_ATS) is None
+    assert get_adapter("workday").name == "workday"
+
+
+def test_adapter_locates_all_controls_in_one_call_and_builds_fill_steps():
+    adapter = get_adapter("greenhouse")
+    driver = FakeDriver(result={"field:first_name": "el-first", "field:email": "el-email", "field:phone": None,
+                                "submit": "el-submit", "upload": "el-resume", "apply": None})
+    controls = adapter.locate_controls(driver)
+    [(script, (groups,))] = driver.calls
+    assert script == LOCATE_CONTROLS_JS
+    # Greenhouse is a single page: no next step is looked for
+    assert "next" not in groups and groups["field:first_name"] == ["input#first_name"]
+    assert controls == {"field:first_name": "el-first", "field:email": "el-email",
+                        "submit": "el-submit", "upload": "el-resume"}
+
+    field_mappings = {"first_name": {"keywords": [], "value": "Jessie Lee"}, "email": {"keywords": [], "value": ""}}
+    assert adapter.fill_steps(controls, field_mappings) == [
+        {"type": "first_name", "action": "text", "value": "Jessie Lee", "element": "el-first",
+         "label": "greenhouse first_name"}
+    ]
+    assert adapter.navigation(controls) == ("submit", "el-submit")
+
+
+def test_navigation_prefers_the_next_step():
+    adapter = get_adapter("workday")
+    assert adapter.navigation({"next": "el-next", "submit": "el-submit"}) == ("next", "el-next")
+    assert adapter.navigation({}) == (None, None)
+
+
+def test_failed_lookup_finds_nothing():
+    assert get_adapter("lever").locate_controls(FakeDriver(error=RuntimeError("stale"))) == {}
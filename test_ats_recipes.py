@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for per-site ATS recipes and URL fingerprinting
+"""
+import json
+
+import ats_recipes
+from ats_fingerprint import GENERIC_ATS, ats_from_url, site_domain
+from ats_recipes import RecipeStore, recipe_key
+
+NEXT = {"by": "css selector", "selector": "button[data-automation-id=\"bottom-navigation-next-button\"]"}
+CONTINUE = {"by": "xpath", "selector": "//button[normalize-space()='Continue']"}
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_store(tmp_path, clock=None):
+    return RecipeStore(str(tmp_path / "ats_recipes.json"), clock or FakeClock())
+
+
+def test_site_domain_and_ats_from_url():
+    assert site_domain("https://www.Example.com:8443/careers/apply?id=1") == "example.com"
+    assert site_domain("") == ""
+    assert ats_from_url("https://acme.wd3.myworkdayjobs.com/en-US/External/job/123") == "workday"
+    assert ats_from_url("https://boards.greenhouse.io/acme/jobs/42") == "greenhouse"
+    assert ats_from_url("https://jobs.lever.co/acme/abc") == "lever"
+    assert ats_from_url("https://careers.acme.com/apply") == GENERIC_ATS
+
+
+def test_recipe_for_url_keys_by_domain_and_ats(tmp_path):
+    store = make_store(tmp_path)
+    recipe = store.recipe_for_url("https://www.acme.wd3.myworkdayjobs.com/job/1")
+    assert recipe.key == recipe_key("acme.wd3.myworkdayjobs.com", "workday")
+    assert store.recipe_for_url("https://careers.acme.com/x", ats="greenhouse").key == "greenhouse:careers.acme.com"
+
+
+def test_successes_are_counted_and_a_new_locator_replaces_the_step(tmp_path):
+    recipe = make_store(tmp_path).recipe("acme.com", GENERIC_ATS)
+    recipe.record_success("next_1", NEXT)
+    recipe.record_success("next_1", NEXT)
+    assert recipe.locator("next_1") == NEXT
+    assert recipe.data["steps"]["next_1"]["successes"] == 2
+
+    recipe.record_success("next_1", CONTINUE)
+    assert recipe.locator("next_1") == CONTINUE
+    assert recipe.data["steps"]["next_1"]["successes"] == 1
+
+
+def test_step_is_dropped_after_repeated_failures(tmp_path):
+    recipe = make_store(tmp_path).recipe("acme.com", GENERIC_ATS)
+    recipe.record_success("cookies", NEXT)
+    recipe.record_failure("cookies")
+    assert recipe.locator("cookies") == NEXT
+    recipe.record_failure("cookies")
+    assert recipe.locator("cookies") is None
+    assert "cookies" not in recipe.data["steps"]
+    # A failure for a step that was never recorded is ignored
+    recipe.record_failure("apply_1")
+    assert recipe.step_count() == 0
+
+
+def test_success_resets_failures(tmp_path):
+    recipe = make_store(tmp_path).recipe("acme.com", GENERIC_ATS)
+    recipe.record_success("next_1", NEXT)
+    recipe.record_failure("next_1")
+    recipe.record_success("next_1", NEXT)
+    recipe.record_failure("next_1")
+    assert recipe.locator("next_1") == NEXT
+
+
+def test_step_goes_stale_after_ttl(tmp_path):
+    clock = FakeClock()
+    recipe = make_store(tmp_path, clock).recipe("acme.com", GENERIC_ATS)
+    recipe.record_success("next_1", NEXT)
+    clock.now += (ats_recipes.RECIPE_TTL_DAYS - 1) * 86400
+    assert recipe.locator("next_1") == NEXT
+    clock.now += 2 * 86400
+    assert recipe.locator("next_1") is None
+
+
+def test_field_types_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(ats_recipes, "RECIPE_MAX_FIELDS", 3)
+    recipe = make_store(tmp_path).recipe("acme.com", GENERIC_ATS)
+    recipe.record_fields({"First name": "first_name", "Surname": "last_name"})
+    recipe.record_fields({"Email": "email", "Phone": "phone"})
+    assert recipe.field_type("Email") == "email"
+    assert recipe.field_type("First name") is None
+    assert len(recipe.data["fields"]) == 3
+
+
+def test_save_round_trip_only_when_dirty(tmp_path):
+    store = make_store(tmp_path)
+    path = tmp_path / "ats_recipes.json"
+    store.recipe("acme.com", GENERIC_ATS)
+    store.save()
+    assert not path.exists()
+
+    store.recipe("acme.com", GENERIC_ATS).record_success("apply_1", CONTINUE)
+    store.save()
+    assert json.loads(path.read_text())["generic:acme.com"]["steps"]["apply_1"]["selector"] == CONTINUE["selector"]
+    assert not (tmp_path / "ats_recipes.json.tmp").exists()
+
+    reloaded = make_store(tmp_path).recipe("acme.com", GENERIC_ATS)
+    assert reloaded.locator("apply_1") == CONTINUE
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    (tmp_path / "ats_recipes.json").write_text("{not json")
+    assert make_store(tmp_path).recipes == {}
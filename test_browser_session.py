@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for browser session persistence and the warm-start sign-in check
+"""
+import json
+import os
+import stat
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import browser_session
+from browser_session import (PROBE_JS, SessionSpec, apply_profile, ensure_signed_in, load_session_state,
+                             save_session, session_file)
+
+SPEC = SessionSpec(
+    name="example",
+    origin="https://www.example.com/",
+    probe_url="https://www.example.com/feed/",
+    signed_out_markers=("/login",),
+    signed_out_selectors=["input#username"],
+    auth_cookie="auth"
+)
+
+
+class FakeOptions:
+    def __init__(self):
+        self.arguments = []
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+
+class FakeDriver:
+    """Signed in while it holds the auth cookie; the probe page redirects to /login otherwise"""
+
+    def __init__(self, cookies=None):
+        self.cookies = list(cookies or [])
+        self.local_storage = {"theme": "dark"}
+        self.current_url = "about:blank"
+
+    def get(self, url):
+        if url == SPEC.probe_url and not self.get_cookie("auth"):
+            url = "https://www.example.com/login"
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def get_cookie(self, name):
+        return next((cookie for cookie in self.cookies if cookie['name'] == name), None)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if script == "return document.readyState":
+            return "complete"
+        if script == PROBE_JS:
+            return {"url": self.current_url, "signedOutElement": False}
+        if "localStorage.setItem" in script:
+            self.local_storage.update(args[0])
+            return None
+        return dict(self.local_storage)
+
+
+@pytest.fixture
+def session_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_session, "BROWSER_SESSION_DIR", str(tmp_path))
+    return tmp_path
+
+
+def auth_cookie():
+    return {"name": "auth", "value": "token", "domain": ".example.com", "path": "/", "secure": True}
+
+
+def test_apply_profile_uses_a_per_script_user_data_dir(session_dir, monkeypatch):
+    monkeypatch.setattr(browser_session, "USE_CHROME_PROFILE", True)
+    options = FakeOptions()
+    profile_dir = apply_profile(options, "seek-worker-1")
+    assert profile_dir == os.path.join(str(session_dir), "seek-worker-1-profile")
+    assert os.path.isdir(profile_dir)
+    assert options.arguments == [f"--user-data-dir={profile_dir}"]
+
+    monkeypatch.setattr(browser_session, "USE_CHROME_PROFILE", False)
+    options = FakeOptions()
+    assert apply_profile(options, "seek-worker-1") is None
+    assert options.arguments == []
+
+
+def test_save_session_writes_an_owner_only_file_atomically(session_dir):
+    driver = FakeDriver([dict(auth_cookie(), expiry=4102444800.0, sameSite="Lax", extra="dropped")])
+    assert save_session(driver, SPEC)
+
+    path = session_file(SPEC)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(session_dir) == [os.path.basename(path)]  # No temporary file left behind
+    state = load_session_state(SPEC)
+    assert state['cookies'] == [dict(auth_cookie(), expiry=4102444800, sameSite="Lax")]
+    assert state['local_storage'] == {"theme": "dark"}
+
+
+def test_failed_save_keeps_the_previous_session(session_dir):
+    assert save_session(FakeDriver([auth_cookie()]), SPEC)
+    with open(session_file(SPEC), encoding="utf-8") as f:
+        before = f.read()
+
+    class BrokenDriver(FakeDriver):
+        def execute_script(self, script, *args):
+            return {"not serializable": object()}
+
+    assert not save_session(BrokenDriver([auth_cookie()]), SPEC)
+    with open(session_file(SPEC), encoding="utf-8") as f:
+        assert f.read() == before
+    assert os.listdir(session_dir) == [os.path.basename(session_file(SPEC))]
+
+
+def test_ensure_signed_in_reuses_the_profile_session(session_dir):
+    def sign_in(driver):
+        raise AssertionError("sign_in must not run for a valid session")
+
+    assert ensure_signed_in(FakeDriver([auth_cookie()]), SPEC, sign_in) == 'profile'
+    assert load_session_state(SPEC) is not None
+
+
+def test_ensure_signed_in_restores_saved_cookies(session_dir):
+    assert save_session(FakeDriver([auth_cookie()]), SPEC)
+
+    def sign_in(driver):
+        raise AssertionError("sign_in must not run when saved cookies work")
+
+    driver = FakeDriver()
+    assert ensure_signed_in(driver, SPEC, sign_in) == 'cookies'
+    assert driver.get_cookie("auth")
+
+
+def test_ensure_signed_in_runs_sign_in_and_saves_the_session(session_dir):
+    calls = []
+
+    def sign_in(driver):
+        calls.append(driver)
+        driver.add_cookie(auth_cookie())
+
+    driver = FakeDriver()
+    assert ensure_signed_in(driver, SPEC, sign_in) == 'sign_in'
+    assert calls == [driver]
+    with open(session_file(SPEC), encoding="utf-8") as f:
+        assert [cookie['name'] for cookie in json.load(f)['cookies']] == ["auth"]
+
+
+def test_ensure_signed_in_raises_without_saving_when_sign_in_fails(session_dir):
+    def sign_in(driver):
+        driver.add_cookie({"name": "tracking", "value": "1"})  # Stuck on a checkpoint: no auth cookie
+
+    with pytest.raises(Exception, match="did not produce a valid session"):
+        ensure_signed_in(FakeDriver(), SPEC, sign_in)
+    assert not os.path.exists(session_file(SPEC))
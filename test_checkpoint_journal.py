@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only checkpoint journal
+"""
+import os
+
+from checkpoint_journal import CheckpointJournal, journal_paths, load_state, merge_states
+
+CITY = "https://www.seek.com.au/data-jobs/in-All-Sydney-NSW"
+
+
+def test_resume_replays_finished_jobs_and_pages(tmp_path):
+    base = str(tmp_path / "seek_checkpoint")
+    journal = CheckpointJournal(base, resume=False)
+    journal.record_job("1", "matched", analysis={"relevance_score": 8})
+    journal.record_job("2", "filtered")
+    journal.record_page(CITY, 1)
+    journal.record_page(CITY, 2)
+    journal.close()
+
+    resumed = CheckpointJournal(base)
+    assert resumed.is_done("1") and resumed.is_done(2)
+    assert not resumed.is_done("3")
+    assert resumed.next_page(CITY) == 3
+    assert resumed.next_page("other-city") == 1
+    assert resumed.count("matched") == 1
+    resumed.close()
+
+    fresh = CheckpointJournal(base, resume=False)
+    assert fresh.count() == 0
+    fresh.close()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    base = str(tmp_path / "seek_checkpoint")
+    journal = CheckpointJournal(base, resume=False)
+    journal.record_job("1", "analyzed")
+    journal.close()
+    with open(journal_paths(base)[0], "a", encoding="utf-8") as f:
+        f.write('{"op": "job", "job_id": "2", "sta')
+
+    state = load_state(base)
+    assert list(state["jobs"]) == ["1"]
+
+
+def test_snapshot_compacts_the_journal(tmp_path):
+    base = str(tmp_path / "seek_checkpoint")
+    journal_path, snapshot_path = journal_paths(base)
+    journal = CheckpointJournal(base, resume=False, snapshot_every=3)
+    for job_id in range(7):
+        journal.record_job(job_id, "analyzed")
+    journal.record_exhausted(CITY)
+    journal.close()
+
+    assert os.path.exists(snapshot_path)
+    with open(journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2  # Only the entries since the last snapshot
+
+    resumed = CheckpointJournal(base)
+    assert resumed.count() == 7
+    assert resumed.is_exhausted(CITY)
+    resumed.close()
+
+
+def test_worker_states_merge(tmp_path):
+    first = CheckpointJournal(str(tmp_path / "worker_0"), resume=False)
+    first.record_page(CITY, 1)
+    first.record_job("1", "matched")
+    first.close()
+    second = CheckpointJournal(str(tmp_path / "worker_1"), resume=False)
+    second.record_page(CITY, 2)
+    second.merge(load_state(str(tmp_path / "worker_0")))
+    assert second.is_page_done(CITY, 1) and second.is_done("1")
+    second.close()
+
+    merged = merge_states([load_state(str(tmp_path / f"worker_{n}")) for n in range(2)])
+    assert merged["pages"][CITY] == {1, 2}
+
+
+def test_jobs_with_records_stay_pending_until_settled(tmp_path):
+    base = str(tmp_path / "linkedin_run_top-applicant")
+    journal = CheckpointJournal(base, resume=False, snapshot_every=2)
+    journal.record_job("1", "queued", job={"job_id": "1", "title": "Analyst"})
+    journal.record_job("2", "queued", job={"job_id": "2", "title": "Engineer"})
+    journal.record_job("2", "scored", job={"job_id": "2", "title": "Engineer", "analysis": {"total_score": 7}})
+    journal.record_job("3", "queued", job={"job_id": "3", "title": "Scientist"})
+    journal.record_job("3", "saved")
+    journal.close()
+
+    resumed = CheckpointJournal(base)
+    pending = {job_id: (status, job) for job_id, status, job in resumed.pending()}
+    assert set(pending) == {"1", "2"}
+    assert pending["1"][0] == "queued"
+    assert pending["2"] == ("scored", {"job_id": "2", "title": "Engineer", "analysis": {"total_score": 7}})
+    assert resumed.is_done("3")
+    resumed.close()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for resolving cookie-consent banners with one probe per site
+"""
+from consent_resolver import RESOLVE_CONSENT_JS, ConsentResolver, consent_actions, consent_locator
+
+
+def probe_result(platform=None, clicked=False, selector=None, text="", tag="button", frame=None, shadow=False):
+    return {"platform": platform, "action": "accept" if clicked else None, "selector": selector, "text": text,
+            "tag": tag, "shadow": shadow, "clicked": clicked, "frame": frame}
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def frame(self, frame):
+        self.driver.in_frame = frame
+
+    def default_content(self):
+        self.driver.in_frame = None
+
+
+class FakeDriver:
+    def __init__(self, results, current_url="https://www.acme.com/careers/apply"):
+        self.results = list(results)
+        self.current_url = current_url
+        self.in_frame = None
+        self.probes = []
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, *args):
+        assert script == RESOLVE_CONSENT_JS
+        self.probes.append(self.in_frame)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_resolver(wait_seconds=0):
+    clock = FakeClock()
+    return ConsentResolver(wait_seconds=wait_seconds, clock=clock, sleep=clock.sleep)
+
+
+def test_known_platform_is_clicked_and_remembered_per_domain():
+    resolver = make_resolver()
+    driver = FakeDriver([probe_result("onetrust", True, "#onetrust-accept-btn-handler", "Accept All Cookies")])
+    result = resolver.resolve(driver)
+    assert result["clicked"] and result["platform"] == "onetrust"
+    assert "frame" not in result
+
+    driver.current_url = "https://acme.com/careers/apply?page=2"
+    again = resolver.resolve(driver)
+    assert again["remembered"] and again["clicked"]
+    assert len(driver.probes) == 1
+    assert resolver.remembers("https://acme.com/other")
+    assert not resolver.remembers("https://jobs.lever.co/acme")
+
+
+def test_first_visit_waits_for_a_banner_that_loads_late():
+    resolver = make_resolver(wait_seconds=2)
+    driver = FakeDriver([probe_result(), probe_result(), probe_result("didomi", True, "#didomi-notice-agree-button")])
+    assert resolver.resolve(driver)["clicked"]
+    assert len(driver.probes) == 3
+
+
+def test_empty_results_are_not_remembered():
+    resolver = make_resolver(wait_seconds=1)
+    driver = FakeDriver([probe_result()] * 3 + [probe_result("generic", True, "#cookie-accept")])
+    assert not resolver.resolve(driver)["clicked"]
+    assert len(driver.probes) == 3
+    assert not resolver.remembers(driver.current_url)
+    # Later visits probe again, once and without waiting
+    assert resolver.resolve(driver)["clicked"]
+    assert len(driver.probes) == 4
+
+
+def test_consent_iframe_gets_one_pass_from_inside():
+    resolver = make_resolver()
+    driver = FakeDriver([probe_result(frame="consent-frame"), probe_result("generic", True, "button[id*='accept']")])
+    result = resolver.resolve(driver)
+    assert driver.probes == [None, "consent-frame"]
+    assert driver.in_frame is None
+    assert result["in_frame"] and consent_locator(result) is None
+
+
+def test_failed_probe_is_not_remembered():
+    resolver = make_resolver()
+    driver = FakeDriver([RuntimeError("javascript error"), probe_result()])
+    assert resolver.resolve(driver) is None
+    assert not resolver.remembers(driver.current_url)
+    assert resolver.resolve(driver) is not None
+
+
+def test_consent_locator_and_action_order():
+    assert consent_locator(probe_result("didomi", True, "#didomi-notice-agree-button")) == {
+        "by": "css selector", "selector": "#didomi-notice-agree-button"}
+    assert consent_locator(probe_result("generic", True, None, "Aceptar todo")) == {
+        "by": "xpath", "selector": "//button[normalize-space()='Aceptar todo']"}
+    assert consent_locator(probe_result("usercentrics", True, "button#accept", shadow=True)) is None
+    assert consent_locator(probe_result()) is None
+
+    assert consent_actions("accept") == ["accept", "close", "reject"]
+    assert consent_actions("reject") == ["reject", "close", "accept"]
+    assert consent_actions("bogus")[0] == "accept"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for applying a whole fill plan in one injected script
+"""
+import fill_plan
+from fill_plan import APPLY_FILL_PLAN_JS, apply_fill_plan, fill_plan_summary, has_fill_errors
+
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        assert script == APPLY_FILL_PLAN_JS
+        self.calls.append(args)
+        return self.results
+
+
+PLAN = [
+    {"element": "first-name", "action": "text", "value": "Jessie Lee", "label": "First name", "type": "first_name"},
+    {"element": "experience", "action": "text", "value": 5, "label": "Years", "type": "experience"},
+    {"element": "relocate-yes", "action": "check", "value": "Yes", "label": "Relocate?", "type": "radio"},
+]
+
+
+def test_whole_plan_is_one_round_trip():
+    results = [
+        {"ok": True, "problem": "", "value": "Jessie Lee", "valid": True, "error": ""},
+        {"ok": True, "problem": "", "value": "5", "valid": False, "error": "Enter a number between 1 and 3"},
+        {"ok": False, "problem": "element is gone", "value": "", "valid": True, "error": ""},
+    ]
+    driver = FakeDriver(results)
+    assert apply_fill_plan(driver, PLAN, settle_ms=0) == results
+    [(steps, elements, settle_ms, _)] = driver.calls
+    # Values are sent as strings; elements travel as their own argument
+    assert steps == [{"action": "text", "value": "Jessie Lee"}, {"action": "text", "value": "5"},
+                     {"action": "check", "value": "Yes"}]
+    assert elements == ["first-name", "experience", "relocate-yes"]
+    assert [has_fill_errors(result) for result in results] == [False, True, False]
+    assert fill_plan_summary(PLAN, results) == "2/3 steps applied in one batch, 1 with validation errors"
+
+
+def test_unusable_results_send_every_step_to_the_fallback():
+    for bad in (None, [], [{"ok": True}]):
+        results = apply_fill_plan(FakeDriver(bad), PLAN)
+        assert [result["ok"] for result in results] == [False, False, False]
+
+    class BrokenDriver:
+        def execute_async_script(self, script, *args):
+            raise RuntimeError("script timeout")
+
+    assert not any(result["ok"] for result in apply_fill_plan(BrokenDriver(), PLAN))
+
+
+def test_disabled_plan_skips_the_browser(monkeypatch):
+    monkeypatch.setattr(fill_plan, "FILL_PLAN_ENABLED", False)
+    driver = FakeDriver([])
+    results = apply_fill_plan(driver, PLAN)
+    assert driver.calls == [] and not any(result["ok"] for result in results)
+    assert apply_fill_plan(driver, []) == []
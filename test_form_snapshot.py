@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for classifying form fields from a one-pass DOM snapshot
+"""
+import json
+
+from form_snapshot import (
+    FORM_SNAPSHOT_JS, FormSnapshot, collect_form_fields, field_context, radio_label_text, radio_question_text,
+    take_form_snapshot
+)
+
+
+def make_field(**overrides):
+    """A snapshot field with the defaults FORM_SNAPSHOT_JS gives an empty element"""
+    field = {
+        "handle": "1", "tag": "input", "type": "text", "role": "", "id": "", "name": "", "placeholder": "",
+        "value": "", "data_value": "", "class": "", "for": "", "data_question": "", "automation_id": "",
+        "visible": True, "enabled": True, "required": False, "checked": False, "aria_invalid": False,
+        "text": "", "label_for": "", "label_for_visible": False, "label_question": "", "ancestor_label": "",
+        "legend": "", "group_name": "", "parent_text": "", "preceding_text": "", "following_text": "",
+        "options": [], "custom_radio": False, "workday": False, "preceding": None
+    }
+    field.update(overrides)
+    return field
+
+
+class FakeDriver:
+    def __init__(self, fields):
+        self.fields = fields
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        assert script == FORM_SNAPSHOT_JS
+        return [json.dumps({"url": "https://jobs.example.com/apply", "title": "Apply", "fields": self.fields}),
+                [f"element-{field['handle']}" for field in self.fields]]
+
+
+def test_field_context_matches_get_field_context():
+    field = make_field(id="email", name="user_email", placeholder="you@example.com", label_for="Email",
+                       parent_text="x" * 250, preceding_text="Contact")
+    assert field_context(field) == "email user_email you@example.com Email Contact"
+
+
+def test_radio_labels_and_questions():
+    radio = make_field(type="radio", name="q1", value="yes", label_for="Yes, I do",
+                       preceding={"questions": ["Do you need visa sponsorship? *"], "question_marks": [],
+                                  "question_like": [], "custom_question": []})
+    assert radio_label_text(radio) == "Yes, I do"
+    # Labels of three characters or fewer are skipped, as in get_radio_label_text
+    assert radio_label_text(dict(radio, label_for="Yes")) == "yes"
+    assert radio_question_text(radio) == "Do you need visa sponsorship?"
+
+    bare = make_field(type="radio", name="question_30515463002", value="2")
+    assert radio_question_text(bare) == "Please indicate your English proficiency level"
+    assert radio_label_text(bare) == "2"
+
+
+def test_collect_form_fields_in_one_round_trip():
+    preceding = {"questions": ["Are you willing to relocate?"], "question_marks": [], "question_like": [],
+                 "custom_question": ["Preferred shift?"]}
+    fields = [
+        make_field(handle="1", id="first_name", label_for="First name"),
+        make_field(handle="2", tag="textarea", type="", name="cover", visible=False),
+        make_field(handle="3", type="radio", name="relocate", label_for="Yes please", preceding=preceding),
+        make_field(handle="4", type="radio", name="relocate", label_for="No thanks", visible=False, preceding=preceding),
+        make_field(handle="5", tag="select", type="", id="country", label_for="Country",
+                   options=[{"text": "", "value": ""}, {"text": "Spain", "value": "es"}, {"text": "France", "value": "fr"}]),
+        make_field(handle="6", type="checkbox", name="privacy_policy", checked=True),
+        make_field(handle="7", tag="div", type="", role="radio", text="Morning", custom_radio=True, custom_order=1,
+                   preceding=preceding),
+        make_field(handle="8", tag="div", type="", role="radio", text="Evening", custom_radio=True, custom_order=2,
+                   preceding=preceding),
+        make_field(handle="9", tag="div", type="", automation_id="searchBox", workday=True, label_for="School"),
+        make_field(handle="10", type="hidden", name="token"),
+    ]
+    driver = FakeDriver(fields)
+    snapshot = take_form_snapshot(driver)
+    collected = collect_form_fields(snapshot)
+    assert driver.calls == 1
+
+    assert [(f["element"], f["visible"]) for f in collected["text_fields"]] == [("element-1", True), ("element-2", False)]
+    assert collected["text_fields"][0]["context"] == "first_name First name"
+
+    [relocate] = collected["radio_questions"]
+    assert relocate["question"] == "Are you willing to relocate?"
+    assert relocate["options"] == ["Yes please", "No thanks"]
+    assert relocate["elements"]["No thanks"] == "element-4"
+    assert relocate["visible"] == {"Yes please": True, "No thanks": False}
+
+    [shift] = collected["custom_radio_questions"]
+    assert shift["options"] == ["Morning", "Evening"]
+
+    [country] = collected["dropdowns"]
+    assert country["options"] == ["Spain", "France"] and country["element"] == "element-5"
+
+    [privacy] = collected["checkboxes"]
+    assert privacy["checked"] and privacy["name"] == "privacy_policy"
+
+    assert [f["element"] for f in collected["workday_fields"]] == ["element-9"]
+
+
+def test_custom_radios_tied_to_real_radios_are_skipped():
+    snapshot = FormSnapshot({"fields": [
+        make_field(handle="1", type="radio", name="question_1"),
+        make_field(handle="2", tag="label", type="", **{"for": "question_1_a"}, text="A", custom_radio=True, custom_order=1),
+    ]}, ["radio", "label"])
+    assert snapshot.custom_radio_groups() == {}
+
+
+def test_failed_snapshot_returns_none():
+    class BrokenDriver:
+        def execute_script(self, script, *args):
+            raise RuntimeError("javascript error")
+
+    assert take_form_snapshot(BrokenDriver()) is None
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for structured relevance analysis parsing, validation and batch scoring
+"""
+import json
+
+import pytest
+
+from job_analysis import (
+    AnalysisValidationError, BatchScoringStats, ContextLimitError, JobAnalysis,
+    analyze_in_batches, parse_batch_analyses, parse_structured_analysis
+)
+
+REPLY = {
+    "meaningfulness_score": 7,
+    "meaningfulness_justification": ["build ML platform from scratch", "mentorship programme"],
+    "skills_match": 8,
+    "role_alignment": 9,
+    "remote_work": 6,
+    "innovation": 7.5,
+    "compensation_proxy": 5,
+    "final_score": 8,
+    "salary_estimation": "45000-55000 EUR",
+    "should_apply": True,
+    "recommendation": "Strong match on stack and growth.",
+    "key_points": ["Python/SQL", "Hybrid Barcelona"]
+}
+
+
+def test_structured_reply_maps_to_legacy_dict():
+    result = parse_structured_analysis(json.dumps(REPLY)).to_dict()
+    assert result['should_apply'] is True
+    assert result['total_score'] == 8
+    assert result['meaningfulness_score'] == 7
+    assert result['scores']['innovation'] == 7.5
+    assert result['scores']['compensation_proxy'] == 5
+    assert result['meaningfulness_justification'] == "build ML platform from scratch\nmentorship programme"
+    assert result['salary_estimation'] == "45000-55000 EUR"
+    assert result['key_points'] == ["Python/SQL", "Hybrid Barcelona"]
+
+
+def test_fenced_json_and_lenient_values():
+    reply = dict(REPLY, should_apply="YES", final_score="9/10", skills_match=14)
+    analysis = parse_structured_analysis("Here you go:\n```json\n" + json.dumps(reply) + "\n```")
+    assert analysis.should_apply is True
+    assert analysis.final_score == 9
+    assert analysis.skills_match == 10  # Clamped to the 0-10 scale
+
+
+def test_invalid_replies_raise():
+    with pytest.raises(AnalysisValidationError):
+        parse_structured_analysis("**Final Score:** 8/10\n**Should Apply:** YES")
+    with pytest.raises(AnalysisValidationError):
+        parse_structured_analysis(json.dumps({k: v for k, v in REPLY.items() if k != 'final_score'}))
+    with pytest.raises(AnalysisValidationError):
+        parse_structured_analysis(json.dumps(dict(REPLY, should_apply="maybe")))
+
+
+def test_rank_key_orders_batch():
+    good = JobAnalysis.from_dict(REPLY)
+    better = JobAnalysis.from_dict(dict(REPLY, final_score=9))
+    rejected = JobAnalysis.from_dict(dict(REPLY, final_score=10, should_apply=False))
+    ranked = sorted([rejected, good, better], key=lambda a: a.rank_key, reverse=True)
+    assert ranked == [better, good, rejected]
+
+
+def batch_reply(refs, **overrides):
+    return json.dumps([dict(REPLY, job_ref=ref, **overrides) for ref in refs])
+
+
+def test_parse_batch_skips_invalid_and_unknown_entries():
+    entries = [dict(REPLY, job_ref=1), dict(REPLY, job_ref=2, should_apply="maybe"), dict(REPLY, job_ref=9)]
+    analyses = parse_batch_analyses(json.dumps(entries), [1, 2, 3])
+    assert set(analyses) == {1}
+
+
+def test_batch_scores_all_jobs_in_one_request():
+    jobs = [{"title": f"Job {i}"} for i in range(5)]
+    calls, singles = [], []
+    stats = BatchScoringStats()
+    results = analyze_in_batches(
+        jobs, lambda batch: calls.append(len(batch)) or batch_reply(range(1, len(batch) + 1)),
+        lambda job: singles.append(job) or {"single": True}, stats
+    )
+    assert calls == [5]
+    assert not singles
+    assert all(result['structured'] for result in results)
+    assert stats.requests == 1 and stats.batched_jobs == 5
+
+
+def test_missing_entries_fall_back_to_single_job_scoring():
+    jobs = [{"title": f"Job {i}"} for i in range(3)]
+    singles = []
+    results = analyze_in_batches(
+        jobs, lambda batch: batch_reply([1, 3]),
+        lambda job: singles.append(job["title"]) or {"single": True}
+    )
+    assert singles == ["Job 1"]
+    assert results[1] == {"single": True}
+    assert results[0]['structured'] and results[2]['structured']
+
+
+def test_context_limit_splits_batch_adaptively():
+    jobs = [{"title": f"Job {i}"} for i in range(8)]
+    calls = []
+
+    def request(batch):
+        calls.append(len(batch))
+        if len(batch) > 3:
+            raise ContextLimitError("too many tokens")
+        return batch_reply(range(1, len(batch) + 1))
+
+    stats = BatchScoringStats()
+    results = analyze_in_batches(jobs, request, lambda job: {"single": True}, stats)
+    assert len(results) == 8 and all(result['structured'] for result in results)
+    assert calls == [8, 4, 2, 2, 4, 2, 2]
+    assert stats.splits == 3
+
+
+def test_unparseable_batch_reply_scores_jobs_individually():
+    jobs = [{"title": "A"}, {"title": "B"}]
+    results = analyze_in_batches(jobs, lambda batch: "not json", lambda job: {"single": job["title"]})
+    assert results == [{"single": "A"}, {"single": "B"}]
+
+
+def test_rate_limited_batch_is_retried_not_split_into_singles():
+    jobs = [{"title": f"Job {i}"} for i in range(4)]
+    calls, singles, sleeps = [], [], []
+
+    def request(batch):
+        calls.append(len(batch))
+        if len(calls) < 3:
+            raise Exception("429 Resource has been exhausted (e.g. check quota).")
+        return batch_reply(range(1, len(batch) + 1))
+
+    results = analyze_in_batches(jobs, request, lambda job: singles.append(job) or {"single": True},
+                                 sleep=sleeps.append)
+    assert calls == [4, 4, 4] and len(sleeps) == 2
+    assert not singles and all(result['structured'] for result in results)
+
+
+def test_persistent_quota_error_does_not_fan_out():
+    jobs = [{"title": "A"}, {"title": "B"}]
+    singles = []
+
+    def request(batch):
+        raise Exception("429 quota exceeded")
+
+    results = analyze_in_batches(jobs, request, lambda job: singles.append(job) or {"single": True},
+                                 on_error=lambda job, error: {"error": job["title"]}, sleep=lambda s: None)
+    assert results == [{"error": "A"}, {"error": "B"}]
+    assert not singles
+    with pytest.raises(Exception):
+        analyze_in_batches(jobs, request, lambda job: {"single": True}, sleep=lambda s: None)
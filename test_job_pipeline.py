@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged producer/consumer pipeline
+"""
+import time
+import threading
+
+from job_pipeline import Stage, JobPipeline
+
+
+def test_items_flow_through_all_stages():
+    pipeline = JobPipeline([
+        Stage("double", lambda x: x * 2, workers=3),
+        Stage("drop_odd_tens", lambda x: None if x % 20 == 10 else x, workers=1),
+    ])
+    for i in range(10):
+        pipeline.put(i)
+    results = pipeline.close()
+    assert sorted(results) == [0, 2, 4, 6, 8, 12, 14, 16, 18]
+    assert pipeline.stages[1].dropped == 1
+
+
+def test_stage_errors_are_counted_not_fatal():
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x
+
+    pipeline = JobPipeline([Stage("check", fail_on_three, workers=2)])
+    for i in range(5):
+        pipeline.put(i)
+    assert sorted(pipeline.close()) == [0, 1, 2, 4]
+    assert pipeline.stages[0].errors == 1
+
+
+def test_bounded_queue_applies_backpressure():
+    release = threading.Event()
+    pipeline = JobPipeline([Stage("slow", lambda x: release.wait() and x, workers=1, queue_size=1)])
+    pipeline.put(1)  # Picked up by the worker
+    time.sleep(0.05)
+    pipeline.put(2)  # Fills the queue
+
+    blocked = threading.Thread(target=pipeline.put, args=(3,))
+    blocked.start()
+    blocked.join(timeout=0.1)
+    assert blocked.is_alive()  # Producer waits for the slow stage
+
+    release.set()
+    blocked.join(timeout=1)
+    assert sorted(pipeline.close()) == [1, 2, 3]
+
+
+def test_wall_time_tracks_slowest_stage():
+    pipeline = JobPipeline([
+        Stage("fast", lambda x: x, workers=1),
+        Stage("slow", lambda x: time.sleep(0.05) or x, workers=4),
+    ])
+    started = time.time()
+    for i in range(8):
+        pipeline.put(i)
+    pipeline.close()
+    # 8 x 50ms of work spread over 4 workers, not 400ms in sequence
+    assert time.time() - started < 0.3
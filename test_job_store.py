@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite job store
+"""
+import json
+
+from job_store import JobStore
+
+
+def test_upsert_is_keyed_by_source_and_job_id(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.upsert_job("linkedin", {"job_id": "1", "title": "Data Scientist"}, status="analyzed")
+    store.upsert_job("linkedin", {"job_id": "1", "title": "Senior Data Scientist"}, status="to_apply")
+    store.upsert_job("seek", {"job_id": "1", "title": "Data Analyst"})
+
+    assert store.count_jobs() == 2
+    assert store.get_job("linkedin", "1")["title"] == "Senior Data Scientist"
+    assert store.get_status("linkedin", "1") == "to_apply"
+    # A later upsert without a status keeps the previous one
+    store.upsert_job("linkedin", {"job_id": "1", "title": "Senior Data Scientist"})
+    assert store.get_status("linkedin", "1") == "to_apply"
+
+
+def test_job_id_view_membership(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.upsert_job("seek", {"job_id": "42"})
+
+    assert "42" in store.job_ids()
+    assert "42" in store.job_ids("seek")
+    assert "42" not in store.job_ids("linkedin")
+    assert "43" not in store.job_ids()
+    assert len(store.job_ids()) == 1
+
+
+def test_analysis_table_and_status_updates(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.save_analysis("linkedin", "7", {"should_apply": True, "total_score": 8.5})
+    assert store.get_analysis("linkedin", "7")["total_score"] == 8.5
+
+    # set_status creates a minimal row for jobs that were never scraped
+    store.set_status("linkedin", "7", "applied")
+    assert store.get_status("linkedin", "7") == "applied"
+
+
+def test_failed_analysis_is_scored_again_next_run(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    store = JobStore(db_path)
+    job = {"job_id": "9", "title": "ML Engineer"}
+    assert not store.record_analyzed_job("linkedin", job, {"error": True, "total_score": 0}, "analyzed")
+    assert "9" not in store.job_ids()
+    store.close()
+
+    # Next run: the job is still unseen, so it is scored and stored this time
+    store = JobStore(db_path)
+    assert not store.has_job("9", "linkedin")
+    assert store.record_analyzed_job("linkedin", job, {"should_apply": True, "total_score": 8}, "to_apply")
+    assert store.has_job("9", "linkedin")
+    assert store.get_status("linkedin", "9") == "to_apply"
+    assert store.get_analysis("linkedin", "9")["total_score"] == 8
+
+
+def test_legacy_json_import_runs_once(tmp_path):
+    jobs = [
+        {"job_id": "100", "title": "A", "link": "https://www.linkedin.com/jobs/view/100",
+         "analysis": {"should_apply": True, "total_score": 8}},
+        {"job_id": "200", "title": "B", "link": "https://www.seek.com.au/job/200"},
+        {"title": "no id"},
+    ]
+    (tmp_path / "external_jobs.json").write_text(json.dumps(jobs))
+    (tmp_path / "scraped_jobs.json").write_text("")
+
+    store = JobStore(str(tmp_path / "jobs.db"))
+    assert store.import_legacy_json(base_dir=str(tmp_path)) == 2
+    assert store.get_status("linkedin", "100") == "to_apply"
+    assert store.has_job("200", "seek")
+    assert store.get_analysis("linkedin", "100")["should_apply"] is True
+
+    # Second call is a no-op
+    assert store.import_legacy_json(base_dir=str(tmp_path)) == 0
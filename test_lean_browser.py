@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the lean browser block lists and profiles
+"""
+import importlib
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import lean_browser
+from lean_browser import (FONT_PATTERNS, IMAGE_PATTERNS, MEDIA_PATTERNS, TRACKER_PATTERNS,
+                          apply_lean_options, blocked_patterns, create_lean_driver)
+
+
+class FakeOptions:
+    def __init__(self):
+        self.arguments = []
+        self.capabilities = {}
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+    def set_capability(self, name, value):
+        self.capabilities[name] = value
+
+
+class FakeDriver:
+    def __init__(self):
+        self.cdp_calls = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params))
+
+
+@pytest.fixture
+def reload_lean_browser(monkeypatch):
+    """Re-read the LEAN_* environment variables, restoring the defaults afterwards"""
+    def reload(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(lean_browser)
+    yield reload
+    monkeypatch.undo()
+    importlib.reload(lean_browser)
+
+
+def test_env_overrides_deny_and_allow(reload_lean_browser):
+    module = reload_lean_browser(LEAN_DENY=" *cdn.example.com* ,,*.gif*", LEAN_ALLOW=".svg, hotjar")
+    assert module.LEAN_DENY == ["*cdn.example.com*", "*.gif*"]
+    assert module.LEAN_ALLOW == [".svg", "hotjar"]
+
+    patterns = module.blocked_patterns('scrape')
+    assert "*cdn.example.com*" in patterns
+    assert patterns.count("*.gif*") == 1  # Already a default pattern, not added twice
+    assert "*.svg*" not in patterns
+    assert "*hotjar.com*" not in patterns
+    assert "*.png*" in patterns
+
+
+def test_env_defaults_leave_profiles_unchanged(reload_lean_browser):
+    module = reload_lean_browser(LEAN_DENY="", LEAN_ALLOW="")
+    assert module.blocked_patterns('scrape') == module.LEAN_PROFILES['scrape']['patterns']
+    assert module.blocked_patterns('apply') == module.LEAN_PROFILES['apply']['patterns']
+
+
+def test_scrape_profile_blocks_images_fonts_media_and_trackers():
+    patterns = blocked_patterns('scrape', deny=[], allow=[])
+    for pattern in IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS:
+        assert pattern in patterns
+
+
+def test_apply_profile_keeps_images_and_scripts():
+    patterns = blocked_patterns('apply', deny=[], allow=[])
+    assert not set(IMAGE_PATTERNS + FONT_PATTERNS) & set(patterns)
+    # Only third-party trackers are cut; the form's own scripts are never matched
+    assert not any(".js" in pattern for pattern in patterns)
+    assert set(patterns) == set(MEDIA_PATTERNS + TRACKER_PATTERNS)
+
+
+def test_only_the_scrape_profile_turns_images_off(monkeypatch):
+    monkeypatch.setattr(lean_browser, "LEAN_BROWSER", True)
+    scrape_options = apply_lean_options(FakeOptions(), 'scrape')
+    apply_options = apply_lean_options(FakeOptions(), 'apply')
+
+    assert "--blink-settings=imagesEnabled=false" in scrape_options.arguments
+    assert apply_options.arguments == []
+    # Both keep the performance log the bandwidth report reads
+    assert apply_options.capabilities == {"goog:loggingPrefs": {"performance": "ALL"}}
+
+
+def test_create_lean_driver_installs_the_profile_block_list(monkeypatch):
+    monkeypatch.setattr(lean_browser, "LEAN_BROWSER", True)
+    built = []
+
+    def create_driver(options):
+        built.append(options)
+        return FakeDriver()
+
+    options = FakeOptions()
+    driver, report = create_lean_driver(create_driver, options, profile='apply')
+    assert built == [options]
+    assert report.enabled
+    assert driver.cdp_calls == [("Network.enable", {}),
+                                ("Network.setBlockedURLs", {"urls": blocked_patterns('apply')})]
+
+
+def test_disabled_lean_browser_blocks_nothing(monkeypatch):
+    monkeypatch.setattr(lean_browser, "LEAN_BROWSER", False)
+    driver, report = create_lean_driver(lambda options: FakeDriver(), FakeOptions(), profile='scrape')
+    assert driver.cdp_calls == []
+    assert not report.enabled
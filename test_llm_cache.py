@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent LLM response cache
+"""
+import time
+
+from llm_cache import LLMResponseCache, make_cache_key
+
+JOB = {"title": "Data Scientist", "company": "Acme", "description": "Python, SQL, MLOps"}
+
+
+def test_key_changes_with_model_prompt_cv_and_job():
+    base = make_cache_key("gemini-2.5-pro", "v1", "cv", JOB)
+    assert base == make_cache_key("gemini-2.5-pro", "v1", "cv", dict(JOB))
+    assert base != make_cache_key("gemini-2.5-flash", "v1", "cv", JOB)
+    assert base != make_cache_key("gemini-2.5-pro", "v2", "cv", JOB)
+    assert base != make_cache_key("gemini-2.5-pro", "v1", "new cv", JOB)
+    assert base != make_cache_key("gemini-2.5-pro", "v1", "cv", dict(JOB, description="Excel"))
+
+
+def test_hits_misses_and_persistence(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = LLMResponseCache(db_path)
+    assert cache.get("k") is None
+    cache.set("k", {"should_apply": True, "total_score": 8})
+    assert cache.get("k") == {"should_apply": True, "total_score": 8}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+    # Survives a restart
+    assert LLMResponseCache(db_path).get("k")["total_score"] == 8
+
+
+def test_ttl_expiry(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.db"), ttl_seconds=0.05)
+    cache.set("k", "value")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries_and_bytes(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now least recently used
+    time.sleep(0.01)
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    small = LLMResponseCache(str(tmp_path / "small.db"), max_bytes=20)
+    small.set("x", "0123456789")
+    time.sleep(0.01)
+    small.set("y", "0123456789")
+    assert len(small) == 1
+    assert small.get("y") == "0123456789"
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-bucket rate limiter and 429 backoff
+"""
+from llm_scoring import RateLimiter, ScoringPool, call_with_backoff, is_rate_limit_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_limiter_enforces_request_budget():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=2, clock=clock, sleep=clock.sleep)
+    limiter.acquire(0)
+    limiter.acquire(0)
+    assert clock.now == 0
+    limiter.acquire(0)  # Third request must wait for a refill (one every 30s)
+    assert 29.9 <= clock.now <= 30.1
+
+
+def test_limiter_enforces_token_budget_and_caps_oversized_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+    limiter.acquire(4000)
+    limiter.acquire(4000)  # 2000 left, needs 2000 more at 100 tokens/s
+    assert 19.9 <= clock.now <= 20.1
+    limiter.acquire(10000)  # Larger than the bucket: waits for a full bucket instead of forever
+    assert clock.now < 100
+
+
+def test_backoff_retries_only_rate_limit_errors():
+    calls = []
+    sleeps = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise Exception("429 Resource has been exhausted (e.g. check quota).")
+        return "ok"
+
+    assert call_with_backoff(flaky, sleep=sleeps.append) == "ok"
+    assert len(calls) == 3 and len(sleeps) == 2
+
+    def broken():
+        raise ValueError("bad prompt")
+
+    try:
+        call_with_backoff(broken, sleep=sleeps.append)
+        assert False, "non-429 errors must propagate"
+    except ValueError:
+        pass
+    assert not is_rate_limit_error(ValueError("bad prompt"))
+
+
+def test_scoring_pool_runs_concurrently():
+    with ScoringPool(max_workers=3) as pool:
+        futures = [pool.submit(lambda x: x * 2, i) for i in range(5)]
+        assert [f.result() for f in futures] == [0, 2, 4, 6, 8]
+    assert pool.submitted == 5
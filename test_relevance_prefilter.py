@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the local TF-IDF relevance prefilter
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+from relevance_prefilter import RelevancePrefilter
+
+CV = """Data Scientist with 4+ years of experience in Python, SQL, machine learning,
+XGBoost, random forests, MLflow, geospatial data, ETL pipelines and cloud platforms (AWS, GCP)."""
+
+DATA_JOB = {"title": "Senior Data Scientist", "description": "Build machine learning models in Python and SQL, deploy with MLflow on AWS."}
+SALES_JOB = {"title": "Account Executive", "description": "Own the full sales cycle, hit quota, prospect new clients."}
+OFF_TOPIC = {"title": "Chef de Partie", "description": "Prepare dishes in a busy kitchen, manage food stock and hygiene."}
+
+
+def test_batch_similarity_ranks_data_roles_above_unrelated_roles():
+    prefilter = RelevancePrefilter(CV)
+    sims = prefilter.similarities([DATA_JOB, SALES_JOB, OFF_TOPIC])
+    assert sims.shape == (3,)
+    assert sims[0] > sims[1] and sims[0] > sims[2]
+
+
+def test_filter_batch_prunes_by_rules_and_threshold():
+    prefilter = RelevancePrefilter(CV, threshold=0.05)
+    kept, pruned = prefilter.filter_batch([dict(DATA_JOB), dict(SALES_JOB), dict(OFF_TOPIC)])
+    assert [job["title"] for job in kept] == ["Senior Data Scientist"]
+    assert {job["title"] for job in pruned} == {"Account Executive", "Chef de Partie"}
+    assert prefilter.pruned == 2 and prefilter.scored == 3
+    assert pruned[0]["prefilter_reason"]
+
+
+def test_sales_titles_with_data_terms_are_kept():
+    prefilter = RelevancePrefilter(CV)
+    kept, _ = prefilter.filter_batch([{"title": "Sales Data Analyst", "description": "SQL dashboards for the sales team"}])
+    assert len(kept) == 1
+
+
+def test_evaluate_against_history_reports_precision():
+    prefilter = RelevancePrefilter(CV)
+    history = [(DATA_JOB, True), (SALES_JOB, False), (OFF_TOPIC, False)]
+    result = prefilter.evaluate_against_history(history)
+    assert result == {"evaluated": 3, "would_prune": 2, "precision": 1.0, "lost_recommended": 0}
+    # Evaluation runs on a copy and leaves the live counters alone
+    assert prefilter.scored == 0
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the Seek hard filters at listing and detail level
+"""
+import datetime
+
+from seek_filters import (
+    CITIZENSHIP_PATTERN, DATE_PATTERN, SKIP_PHRASE_PATTERN, JobFilter, is_date_within_six_months, scan_page
+)
+
+TODAY = datetime.date(2025, 6, 1)
+
+
+def test_date_window_keeps_original_quirks():
+    assert is_date_within_six_months("14th of July", TODAY) is True
+    assert is_date_within_six_months("3 March", TODAY) is False
+    # Abbreviations other than May give no month and count as outside the window
+    assert is_date_within_six_months("14 Jul", TODAY) is False
+    assert is_date_within_six_months("2 May", TODAY) is False
+    # Impossible dates no longer raise
+    assert is_date_within_six_months("31 June", TODAY) is True
+
+
+def test_detail_rules_match_inline_checks():
+    job_filter = JobFilter(today=TODAY)
+    assert job_filter.check_detail("Analyst", "Must be an Australian  Citizen").name == "citizenship"
+    assert job_filter.check_detail("Analyst 12-month contract", "Python").name == "contract_phrase"
+    # Phrases are case-sensitive, as the substring checks were
+    assert job_filter.check_detail("Analyst", "12 MONTH contract") is None
+    assert job_filter.check_detail("Analyst", "Starting 3 March").name == "contract_date"
+    assert job_filter.hits[('detail', 'contract_date')] == 1
+
+
+def test_listing_rejects_only_on_title_by_default():
+    job_filter = JobFilter(today=TODAY, teaser_rules=False)
+    assert job_filter.check_listing({'title': "Data Engineer - 12 Month Contract"}).name == "contract_phrase"
+    assert job_filter.check_listing({'title': "Data Engineer", 'teaser': "Australian citizen, 24 month"}) is None
+    assert job_filter.checked['listing'] == 2
+
+
+def test_teaser_rules_are_opt_in():
+    job_filter = JobFilter(today=TODAY, teaser_rules=True)
+    assert job_filter.check_listing({'title': "Data Engineer", 'teaser': "Australian citizen only"}).name == "citizenship"
+    assert "listing  citizenship      rejected: 1" in job_filter.report()
+
+
+def test_combined_scan_finds_what_each_pattern_finds():
+    texts = [
+        "Start 1st of June, 124 month typo, AUSTRALIAN   citizens only, 12 MONTH, 9 months ",
+        "9-month contract from 3 Sep; 12 Month extension; 31 June start",
+        "",
+        "no matches at all",
+    ]
+    for text, found in zip(texts, scan_page(texts)):
+        assert found.get('citizenship', []) == CITIZENSHIP_PATTERN.findall(text)
+        assert found.get('date', []) == DATE_PATTERN.findall(text)
+        assert found.get('phrase', []) == SKIP_PHRASE_PATTERN.findall(text)
+
+
+def test_page_check_matches_per_job_checks():
+    jobs = [("Analyst", "Must hold Australian citizenship"), ("Engineer", "24-month project"),
+            ("Developer", "Ends 14th of July"), ("Lead - 9 Month", ""), ("Tester", "Starting 3 March")]
+    per_job = [JobFilter(today=TODAY).check_detail(title, description) for title, description in jobs]
+    page = JobFilter(today=TODAY).check_page(jobs)
+    assert [rule and rule.name for rule in page] == [rule and rule.name for rule in per_job]
+    assert [rule and rule.name for rule in page] == ["citizenship", "contract_phrase", None, "contract_phrase",
+                                                    "contract_date"]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the Seek HTTP job detail parser, run against saved HTML pages
+"""
+import os
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+
+from seek_http import fetch_job_detail, parse_job_detail_html
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parses_server_rendered_job_page():
+    detail = parse_job_detail_html(load_fixture("seek_job_detail.html"))
+    assert detail["title"] == "Data Analyst"
+    assert detail["work_type"] == "Contract/Temp"
+    assert "Python and SQL" in detail["description"]
+    assert "14th of July" in detail["description"]
+    assert detail["applied"] is False
+    assert detail["is_casual"] is False
+    assert detail["quick_apply"] is True
+
+
+def test_detects_applied_marker_and_casual_jobs():
+    detail = parse_job_detail_html(load_fixture("seek_job_detail_applied.html"))
+    assert detail["applied"] is True
+    assert detail["is_casual"] is True
+    assert detail["quick_apply"] is False
+
+
+def test_js_only_page_needs_browser_fallback():
+    assert parse_job_detail_html(load_fixture("seek_job_detail_js_shell.html")) is None
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.urls = []
+
+    def get(self, url, timeout):
+        self.urls.append(url)
+        return self.response
+
+
+def test_fetch_uses_job_url_and_falls_back_on_errors():
+    session = FakeSession(FakeResponse(200, load_fixture("seek_job_detail.html")))
+    assert fetch_job_detail(session, "81234567")["title"] == "Data Analyst"
+    assert session.urls == ["https://www.seek.com.au/job/81234567"]
+    assert fetch_job_detail(FakeSession(FakeResponse(403)), "81234567") is None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the Seek embedded-state listing parser
+"""
+import os
+
+from seek_listing import LISTING_STATE_JS, fetch_listing, parse_listing_html, read_listing
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parses_structured_records_from_embedded_state():
+    records = parse_listing_html(load_fixture("seek_search_results.html"))
+    assert [record['job_id'] for record in records] == ["81234567", "81234599"]
+
+    first, second = records
+    assert first['title'] == "Data Analyst"
+    assert first['advertiser'] == "Acme Analytics"
+    assert first['location'] == "Sydney NSW"
+    assert first['listing_date'] == "2025-06-02T01:00:00Z"
+    assert first['work_type'] == "Contract/Temp"
+    assert first['salary'] == "$90 – $110 per hour"
+
+    assert second['advertiser'] == "Globex"
+    assert second['location'] == "Parramatta, Sydney NSW"
+    assert second['work_type'] == "Full time"
+    assert second['salary'] is None
+
+
+def test_pages_without_state_return_none():
+    assert parse_listing_html(load_fixture("seek_job_detail_js_shell.html")) is None
+    assert parse_listing_html("") is None
+
+
+def test_read_listing_uses_one_script_call():
+    class FakeDriver:
+        calls = []
+
+        def execute_script(self, script):
+            self.calls.append(script)
+            return [{"id": 5, "title": " BI Developer ", "workType": "Casual/Vacation"}]
+
+    driver = FakeDriver()
+    records = read_listing(driver)
+    assert driver.calls == [LISTING_STATE_JS]
+    assert records[0]['job_id'] == "5"
+    assert records[0]['title'] == "BI Developer"
+    assert records[0]['work_type'] == "Casual/Vacation"
+
+
+def test_fetch_listing_reads_the_page_over_http():
+    class FakeResponse:
+        def __init__(self, status_code, text):
+            self.status_code = status_code
+            self.text = text
+
+    class FakeSession:
+        def __init__(self, response):
+            self.response = response
+            self.urls = []
+
+        def get(self, url, timeout):
+            self.urls.append(url)
+            return self.response
+
+    url = "https://www.seek.com.au/data-jobs/in-All-Sydney-NSW?worktype=contract&page=2"
+    session = FakeSession(FakeResponse(200, load_fixture("seek_search_results.html")))
+    records = fetch_listing(session, url)
+    assert session.urls == [url]
+    assert [record['job_id'] for record in records] == ["81234567", "81234599"]
+
+    # Blocked or client-rendered pages leave the listing to the browser
+    assert fetch_listing(FakeSession(FakeResponse(403, "")), url) is None
+    assert fetch_listing(FakeSession(FakeResponse(200, load_fixture("seek_job_detail_js_shell.html"))), url) is None
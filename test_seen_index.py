@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped seen-id index and its use by the job store
+"""
+from job_store import JobStore
+from seen_index import SeenIndex, index_size, open_seen_index
+
+
+def test_added_keys_are_always_found(tmp_path):
+    path = str(tmp_path / "ids.seen")
+    index = open_seen_index(path, lambda: iter(()), 0)
+    for job_id in range(1000):
+        index.add(f"linkedin/{job_id}")
+    assert all(index.might_contain(f"linkedin/{job_id}") for job_id in range(1000))
+    false_positives = sum(index.might_contain(f"seek/{job_id}") for job_id in range(10000))
+    assert false_positives < 200
+    index.close()
+
+    # Reopening maps the same slots; nothing is rebuilt
+    reopened = SeenIndex(path)
+    assert reopened.might_contain("linkedin/999")
+    assert reopened.added == 1000
+    reopened.close()
+
+
+def test_index_is_built_from_existing_keys_once(tmp_path):
+    path = str(tmp_path / "ids.seen")
+    index = open_seen_index(path, lambda: iter(["seek/1", "*/1"]), 1)
+    assert index.might_contain("seek/1")
+    index.close()
+
+    calls = []
+    reopened = open_seen_index(path, lambda: calls.append(True) or iter(()), 1)
+    assert calls == [] and reopened.might_contain("*/1")
+    reopened.close()
+
+
+def test_sizing_follows_capacity_and_rate():
+    slots, hashes = index_size(100000, 0.01)
+    assert 900000 < slots < 1000000
+    assert hashes == 7
+
+
+def test_store_skips_queries_for_unseen_ids(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    store = JobStore(db_path)
+    store.upsert_job("seek", {"job_id": "42"})
+    assert not store.might_have_job("43")
+    assert store.might_have_job("42") and store.might_have_job("42", "seek")
+    assert store.has_job("42", "seek") and not store.has_job("42", "linkedin")
+    assert store.get_status("linkedin", "43") is None
+    store.close()
+
+    # A store opened on an existing database without an index builds it from the rows
+    (tmp_path / "jobs.db.seen").unlink()
+    rebuilt = JobStore(db_path)
+    assert rebuilt.might_have_job("42", "seek")
+    assert rebuilt.has_job("42")
+    rebuilt.close()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel multi-tab detail fetching
+"""
+import tab_pool
+from tab_pool import TabPool, TAB_READY_JS, url_has_marker
+from llm_scoring import RateLimiter
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self.driver.handles)}"
+        self.driver.handles.append(handle)
+        self.driver.current_window_handle = handle
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Tabs 'load' a URL after a number of readiness polls given by load_polls[url]"""
+
+    def __init__(self, load_polls):
+        self.handles = ["home"]
+        self.current_window_handle = "home"
+        self.switch_to = FakeSwitchTo(self)
+        self.load_polls = load_polls
+        self.tab_url = {}
+        self.polls = {}
+        self.closed = []
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        if script == TAB_READY_JS:
+            self.polls[handle] += 1
+            url = self.tab_url[handle]
+            return url if self.polls[handle] >= self.load_polls[url] else None
+        self.tab_url[handle] = args[0]
+        self.polls[handle] = 0
+
+    def close(self):
+        self.closed.append(self.current_window_handle)
+
+
+def make_pool(driver, size, monkeypatch):
+    monkeypatch.setattr(tab_pool, "TAB_POLL_INTERVAL", 0)
+    return TabPool(driver, size, limiter=RateLimiter(requests_per_minute=10_000, sleep=lambda s: None))
+
+
+def test_fetches_every_job_in_completion_order(monkeypatch):
+    urls = {f"https://example.com/?currentJobId={i}": polls for i, polls in enumerate([5, 1, 3, 1])}
+    driver = FakeDriver(urls)
+    pool = make_pool(driver, 2, monkeypatch)
+    jobs = [(str(i), url) for i, url in enumerate(urls)]
+    results = list(pool.fetch(jobs, lambda d: d.tab_url[d.current_window_handle], ["#detail"]))
+
+    assert sorted(key for key, _ in results) == ["0", "1", "2", "3"]
+    assert results[0][0] == "1"  # Fastest tab is harvested first
+    assert all(url.endswith(key) for key, url in results)
+    assert driver.current_window_handle == "home"
+    assert pool.fetched == 4
+
+
+def test_pool_size_is_capped_and_tabs_close(monkeypatch):
+    driver = FakeDriver({})
+    pool = make_pool(driver, 50, monkeypatch)
+    assert pool.size == tab_pool.TAB_POOL_MAX_TABS
+    pool.close()
+    assert len(driver.closed) == tab_pool.TAB_POOL_MAX_TABS
+    assert driver.current_window_handle == "home"
+
+
+def test_run_in_tab_returns_to_home(monkeypatch):
+    driver = FakeDriver({})
+    pool = make_pool(driver, 2, monkeypatch)
+    seen = pool.run_in_tab(lambda: driver.current_window_handle)
+    assert seen != "home"
+    assert driver.current_window_handle == "home"
+
+
+def test_ready_marker_matches_whole_values_only():
+    assert url_has_marker("https://www.linkedin.com/jobs/search/?currentJobId=123", "currentJobId=123")
+    assert url_has_marker("https://www.linkedin.com/jobs/search/?currentJobId=123&start=25", "currentJobId=123")
+    assert not url_has_marker("https://www.linkedin.com/jobs/search/?currentJobId=1234", "currentJobId=123")
+    assert url_has_marker("https://x.com/?a=12345&currentJobId=123", "currentJobId=123")
+    assert not url_has_marker("https://example.com/?currentJobId=77", "currentJobId=7")